@@ -1,6 +1,10 @@
-from verify.models import CheckOut
+from django.utils.functional import SimpleLazyObject
+
+from verify.counters import active_check_count
 
 
 def check_count(requqest):
-    check_count = CheckOut.objects.all().filter(status=False).count()
-    return {'check_count': check_count}
+    # Счетчик мог быть прочитан раньше, при проверке ETag страницы
+    if hasattr(requqest, 'check_count'):
+        return {'check_count': requqest.check_count}
+    return {'check_count': SimpleLazyObject(active_check_count)}
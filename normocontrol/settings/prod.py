@@ -1,3 +1,6 @@
+import os
+import tempfile
+
 import dj_database_url
 
 from decouple import config
@@ -12,6 +15,34 @@ DATABASES = {
     )
 }
 
+# Кэш страниц должен быть общим для всех процессов сервера: версии данных
+# (verify.caching) меняются в одном процессе, а читаются во всех
+CACHES = {
+    'default': {
+        'BACKEND': config(
+            'CACHE_BACKEND',
+            default='django.core.cache.backends.filebased.FileBasedCache',
+        ),
+        'LOCATION': config(
+            'CACHE_LOCATION',
+            default=os.path.join(tempfile.gettempdir(), 'normocontrol-cache'),
+        ),
+    }
+}
+
+# Файлы работ передает веб-сервер после проверки прав в Django:
+# 'nginx' (X-Accel-Redirect на PROTECTED_MEDIA_URL) или 'sendfile'
+PROTECTED_MEDIA_SERVER = config('PROTECTED_MEDIA_SERVER', default='')
+PROTECTED_MEDIA_URL = config(
+    'PROTECTED_MEDIA_URL', default='/protected-media/'
+)
+
+# Сжатые файлы архивных работ; по умолчанию - cold/ в MEDIA_ROOT
+COLD_ARCHIVE_ROOT = config('COLD_ARCHIVE_ROOT', default='')
+COLD_ARCHIVE_RETENTION_YEARS = config(
+    'COLD_ARCHIVE_RETENTION_YEARS', default=5, cast=int
+)
+
 # Password validation
 # https://docs.djangoproject.com/en/3.1/ref/settings/#auth-password-validators
 
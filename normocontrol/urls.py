@@ -19,14 +19,6 @@ from django.conf.urls.static import static
 from django.contrib import admin
 from django.urls import include, path
 
-
-
-
-from django.conf import settings
-from django.conf.urls.static import static
-
-
-
 handler400 = "verify.views.bad_request"  # noqa
 handler403 = "verify.views.permission_denied"  # noqa
 handler404 = "verify.views.page_not_found"  # noqa
@@ -39,8 +31,10 @@ urlpatterns = [
     path('', include("verify.urls", namespace="verify")),
 ]
 
-urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
-
+# Файлы работ отдаются только через verify:check_download с проверкой
+# прав; в рабочем окружении /media/ раздает веб-сервер, и каталоги работ
+# и их копий (blobs/, diplomas/, cold/, previews/, reading/) должны быть
+# закрыты в его настройках
 if settings.DEBUG:
     urlpatterns += static(settings.MEDIA_URL,
                           document_root=settings.MEDIA_ROOT)
@@ -0,0 +1,20 @@
+# Generated by Django 2.2 on 2026-10-18 10:00
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('verify', '0007_denormalized_counters'),
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='customuser',
+            name='active_check',
+            field=models.ForeignKey(blank=True, editable=False, help_text='Заполняется автоматически', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='verify.CheckOut', verbose_name='Активная заявка'),
+        ),
+    ]
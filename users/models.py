@@ -44,6 +44,16 @@ class CustomUser(AbstractUser):
         help_text='Открывает пользователю функционал проверки работ',
         null=True,
     )
+    active_check = models.ForeignKey(
+        'verify.CheckOut',
+        verbose_name='Активная заявка',
+        help_text='Заполняется автоматически',
+        on_delete=models.SET_NULL,
+        related_name='+',
+        null=True,
+        blank=True,
+        editable=False,
+    )
 
     def __str__(self):
         return self.username
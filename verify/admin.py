@@ -1,6 +1,8 @@
 from django.contrib import admin
 
-from .models import CheckOut, Remark
+from .models import (
+    CheckOut, Job, OutgoingEmail, Remark, RemarkType, UploadSession,
+)
 
 
 class CheckAdmin(admin.ModelAdmin):
@@ -11,11 +13,44 @@ class CheckAdmin(admin.ModelAdmin):
 
 
 class RemarkAdmin(admin.ModelAdmin):
-    list_display = ('pk', 'text', 'check_date',)
+    list_display = ('pk', 'remark_type', 'text', 'check_date',)
+    list_select_related = ('remark_type',)
+    search_fields = ('text', 'remark_type__text',)
+    list_filter = ('remark_type__category', 'remark_type',)
+    empty_value_display = "-пусто-"
+
+
+class RemarkTypeAdmin(admin.ModelAdmin):
+    list_display = ('code', 'category', 'text', 'help_page', 'is_active',)
     search_fields = ('text',)
-    list_filter = ('text',)
+    list_filter = ('category', 'is_active',)
+    empty_value_display = "-пусто-"
+
+
+class JobAdmin(admin.ModelAdmin):
+    list_display = ('pk', 'name', 'status', 'attempts', 'run_after',)
+    search_fields = ('name',)
+    list_filter = ('status', 'name',)
+    empty_value_display = "-пусто-"
+
+
+class OutgoingEmailAdmin(admin.ModelAdmin):
+    list_display = ('pk', 'recipient', 'subject', 'status', 'created',)
+    search_fields = ('recipient', 'subject',)
+    list_filter = ('status',)
+    empty_value_display = "-пусто-"
+
+
+class UploadSessionAdmin(admin.ModelAdmin):
+    list_display = ('pk', 'student', 'file_name', 'received', 'size',
+                    'updated',)
+    search_fields = ('file_name',)
     empty_value_display = "-пусто-"
 
 
 admin.site.register(CheckOut, CheckAdmin)
 admin.site.register(Remark, RemarkAdmin)
+admin.site.register(RemarkType, RemarkTypeAdmin)
+admin.site.register(Job, JobAdmin)
+admin.site.register(OutgoingEmail, OutgoingEmailAdmin)
+admin.site.register(UploadSession, UploadSessionAdmin)
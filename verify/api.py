@@ -0,0 +1,82 @@
+# Представление записей в JSON API. Для каждого вида записей задан
+# словарь «поле -> функция», из которого берутся запрошенные параметром
+# ?fields= поля. Функции обращаются только к данным, загруженным
+# представлениями через select_related и аннотации, поэтому выдача
+# страницы не порождает дополнительных запросов
+
+
+def isoformat(moment):
+    return moment.isoformat() if moment is not None else None
+
+
+def group_title(student):
+    return student.group.title if student.group else None
+
+
+def check_status(archived):
+    if archived is None:
+        return None
+    return 'archived' if archived else 'active'
+
+
+CHECK_FIELDS = {
+    'id': lambda check: check.id,
+    'student': lambda check: check.student.username,
+    'group': lambda check: group_title(check.student),
+    'date': lambda check: isoformat(check.check_date),
+    'status': lambda check: check_status(check.status),
+    'submission_number': lambda check: check.submission_number,
+    'remark_count': lambda check: check.remark_count,
+    'info': lambda check: check.info,
+    'preview_pages': lambda check: check.preview_pages,
+}
+
+REMARK_FIELDS = {
+    'id': lambda remark: remark.id,
+    'check_id': lambda remark: remark.check_out_id,
+    'remark_type': lambda remark: remark.remark_type_id,
+    'text': lambda remark: remark.message,
+    'section': lambda remark: remark.section,
+    'page_number': lambda remark: remark.page_number,
+    'paragraph': lambda remark: remark.paragraph,
+    'date': lambda remark: isoformat(remark.check_date),
+}
+
+
+def last_check(student):
+    """Последняя заявка студента из аннотаций with_last_check."""
+    if student.last_check_id is None:
+        return None
+    return {
+        'id': student.last_check_id,
+        'status': check_status(student.last_check_status),
+        'date': isoformat(student.last_check_date),
+        'remark_count': student.last_check_remarks,
+    }
+
+
+STUDENT_FIELDS = {
+    'id': lambda student: student.id,
+    'username': lambda student: student.username,
+    'first_name': lambda student: student.first_name,
+    'last_name': lambda student: student.last_name,
+    'email': lambda student: student.email,
+    'group': group_title,
+    'last_check': last_check,
+}
+
+GROUP_FIELDS = {
+    'id': lambda group: group.id,
+    'title': lambda group: group.title,
+    'slug': lambda group: group.slug,
+    'student_count': lambda group: group.student_count,
+    'active_checks': lambda group: group.active_checks,
+    'archived_checks': lambda group: group.archived_checks,
+    'outstanding_remarks': lambda group: group.outstanding_remarks,
+    'oldest_waiting': lambda group: isoformat(group.oldest_waiting),
+}
+
+
+def serialize(item, field_map, names):
+    """Словарь из полей names записи item."""
+    return {name: field_map[name](item) for name in names}
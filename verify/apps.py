@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class VerifyConfig(AppConfig):
     name = 'verify'
+
+    def ready(self):
+        from . import signals, tasks  # noqa
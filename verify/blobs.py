@@ -0,0 +1,67 @@
+import os
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+
+from . import jobs
+from .models import CheckOut, Job
+from .storage import BLOB_GRACE_PERIOD, BLOB_TMP_DIR, blob_storage
+
+
+def release_blobs(names):
+    """Удаляет файлы, на которые больше не ссылается ни одна заявка.
+
+    Число ссылок на блоб определяется запросом к заявкам, поэтому
+    отдельный счетчик не может разойтись с данными. Для свежего блоба
+    без ссылок планируется уборка после окончания его защиты.
+    """
+    fresh = False
+    for name in set(filter(None, names)):
+        referenced = CheckOut.objects.filter(
+            Q(docx_file=name) | Q(pdf_file=name)
+        )
+        if referenced.exists():
+            continue
+        if blob_storage.is_fresh(name):
+            fresh = True
+            continue
+        blob_storage.delete(name)
+    if fresh:
+        grace = getattr(settings, 'BLOB_GRACE_PERIOD', BLOB_GRACE_PERIOD)
+        schedule_collection(timezone.now() + timedelta(seconds=grace))
+
+
+def schedule_collection(run_after):
+    """Планирует уборку блобов, если она еще не запланирована.
+
+    Уже запланированной задачи достаточно: блоб, защита которого к ее
+    выполнению не истекла, снова запланирует уборку.
+    """
+    planned = Job.objects.filter(name='collect_blobs', status=Job.PENDING)
+    if not planned.exists():
+        jobs.enqueue('collect_blobs', run_after=run_after)
+
+
+def collect_blobs():
+    """Удаляет блобы без ссылок и брошенные временные файлы загрузок.
+
+    Возвращает число удаленных файлов.
+    """
+    referenced = set()
+    for names in CheckOut.objects.values_list('docx_file', 'pdf_file'):
+        referenced.update(names)
+    orphans = [
+        name for name in blob_storage.blob_names()
+        if name not in referenced
+    ]
+    release_blobs(orphans)
+    removed = sum(not blob_storage.exists(name) for name in orphans)
+    if blob_storage.exists(BLOB_TMP_DIR):
+        for name in blob_storage.listdir(BLOB_TMP_DIR)[1]:
+            name = os.path.join(BLOB_TMP_DIR, name)
+            if not blob_storage.is_fresh(name):
+                blob_storage.delete(name)
+                removed += 1
+    return removed
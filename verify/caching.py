@@ -0,0 +1,68 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+# Время жизни страниц и фрагментов в кэше, секунд. Устаревшие записи
+# не читаются и без этого: версии данных входят в ключ
+VIEW_CACHE_TIMEOUT = 24 * 3600
+VERSION_KEY = 'verify:version:{}'
+VIEW_KEY = 'verify:view:{}:{}:{}'
+# Страница в кэше вместе с заголовками ответа; аргумент - VIEW_KEY
+PAGE_KEY = 'verify:page:{}'
+
+GROUPS = 'groups'
+STUDENTS = 'students'
+CHECKS = 'checks'
+REMARKS = 'remarks'
+REMARK_TYPES = 'remark_types'
+# Данные списков групп и студентов: заявки и замечания к ним входят в
+# показатели групп и студентов и в счетчик в шапке страницы
+ROSTER_DATA = (GROUPS, STUDENTS, CHECKS, REMARKS)
+
+
+def view_cache_timeout():
+    return getattr(settings, 'VIEW_CACHE_TIMEOUT', VIEW_CACHE_TIMEOUT)
+
+
+def get_versions(*names):
+    """Текущие версии данных в виде строки для ключей кэша.
+
+    Отсутствующая версия заводится по текущему времени в миллисекундах:
+    после вытеснения из кэша она не совпадет с прежними значениями.
+    """
+    keys = [VERSION_KEY.format(name) for name in names]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            cache.add(key, int(time.time() * 1000), None)
+            versions[key] = cache.get(key)
+    return '.'.join(str(versions[key]) for key in keys)
+
+
+def bump_now(names):
+    for name in names:
+        key = VERSION_KEY.format(name)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.add(key, int(time.time() * 1000), None)
+
+
+def bump_versions(*names):
+    """Меняет версии данных, делая устаревшими зависящие от них записи.
+
+    Версия меняется сразу и еще раз после фиксации транзакции: иначе
+    параллельный запрос мог бы до фиксации сохранить в кэш старые данные
+    под новой версией.
+    """
+    bump_now(names)
+    transaction.on_commit(lambda: bump_now(names))
+
+
+def view_key(request, versions):
+    """Ключ страницы: адрес с параметрами, пользователь и версии данных."""
+    path = hashlib.md5(request.get_full_path().encode()).hexdigest()
+    return VIEW_KEY.format(path, request.user.pk, versions)
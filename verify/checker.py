@@ -0,0 +1,139 @@
+import logging
+import re
+
+from django.conf import settings
+
+from . import constants as cts
+from .docx import DocxError, iter_body, qn, section_properties
+from .models import Remark, remark_content
+
+logger = logging.getLogger(__name__)
+
+# Один миллиметр в twip (1/20 пункта) - единицах разметки WordprocessingML
+TWIPS_PER_MM = 56.7
+# Размеры могут быть заданы и с единицей измерения, например "2.54cm"
+MEASURE = re.compile(r'^(?P<value>-?\d+(\.\d+)?)(?P<unit>mm|cm|in|pt|pc|pi)?$')
+MM_PER_UNIT = {
+    'mm': 1,
+    'cm': 10,
+    'in': 25.4,
+    'pt': 25.4 / 72,
+    'pc': 25.4 / 6,
+    'pi': 25.4 / 6,
+}
+
+# Допустимые значения параметров страницы в миллиметрах: (минимум, максимум)
+LAYOUT_RULES = {
+    'width': (209, 211),
+    'height': (296, 298),
+    'left': (25, 30),
+    'right': (10, 15),
+    'top': (15, 20),
+    'bottom': (15, 25),
+    'header': (5, 15),
+    'footer': (5, 15),
+}
+
+PAGE_SIZE_FIELDS = ('width', 'height')
+MARGIN_FIELDS = ('left', 'right', 'top', 'bottom', 'header', 'footer')
+
+LAYOUT_SECTION = 'Параметры страницы (раздел документа {})'
+
+
+def get_layout_rules():
+    rules = dict(LAYOUT_RULES)
+    rules.update(getattr(settings, 'DOCX_LAYOUT_RULES', {}))
+    return rules
+
+
+def to_mm(value):
+    """Переводит размер из разметки в миллиметры.
+
+    Число без единицы измерения задано в twip. Неразборчивое значение
+    вызывает DocxError.
+    """
+    match = MEASURE.match(value.strip())
+    if match is None:
+        raise DocxError(f'Неверный размер в параметрах страницы: {value!r}')
+    number = abs(float(match.group('value')))
+    unit = match.group('unit')
+    if unit is None:
+        return number / TWIPS_PER_MM
+    return number * MM_PER_UNIT[unit]
+
+
+def read_section(sect_pr):
+    """Извлекает размеры листа и полей раздела в миллиметрах."""
+    layout = {}
+    page_size = sect_pr.find(qn('pgSz'))
+    if page_size is not None:
+        layout['width'] = page_size.get(qn('w'))
+        layout['height'] = page_size.get(qn('h'))
+        layout['orient'] = page_size.get(qn('orient'), 'portrait')
+    margins = sect_pr.find(qn('pgMar'))
+    if margins is not None:
+        for field in MARGIN_FIELDS:
+            layout[field] = margins.get(qn(field))
+    for field in PAGE_SIZE_FIELDS + MARGIN_FIELDS:
+        if layout.get(field) is not None:
+            layout[field] = to_mm(layout[field])
+    return layout
+
+
+def section_errors(layout, rules):
+    """Возвращает тексты замечаний для одного раздела документа."""
+    errors = []
+    page_ok = layout.get('orient', 'portrait') == 'portrait'
+    for field in PAGE_SIZE_FIELDS:
+        value = layout.get(field)
+        low, high = rules[field]
+        if value is not None and not low <= value <= high:
+            page_ok = False
+    if not page_ok:
+        errors.append(cts.ERROR_MAIN_9)
+    for field in MARGIN_FIELDS:
+        value = layout.get(field)
+        low, high = rules[field]
+        if value is not None and not low <= value <= high:
+            errors.append(cts.ERROR_FRAME_1)
+            break
+    return errors
+
+
+def find_layout_errors(fileobj):
+    """Проверяет параметры страниц документа за один проход.
+
+    Возвращает список пар (номер раздела, текст замечания).
+    """
+    rules = get_layout_rules()
+    errors = []
+    number = 0
+    for item in iter_body(fileobj):
+        sect_pr = section_properties(item)
+        if sect_pr is None:
+            continue
+        number += 1
+        layout = read_section(sect_pr)
+        errors.extend((number, text) for text in section_errors(layout, rules))
+    return errors
+
+
+def check_layout(check):
+    """Создает замечания к заявке по результатам проверки файла docx."""
+    if not check.docx_file:
+        return []
+    try:
+        with check.docx_file.open('rb') as docx:
+            errors = find_layout_errors(docx)
+    except DocxError as exc:
+        logger.warning('Не удалось проверить %s: %s', check, exc)
+        return []
+    remarks = [
+        Remark(
+            section=LAYOUT_SECTION.format(number),
+            check_out=check,
+            **remark_content(text),
+        )
+        for number, text in errors
+    ]
+    return Remark.objects.bulk_create(remarks, ignore_conflicts=True)
@@ -0,0 +1,149 @@
+import os
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files.uploadedfile import UploadedFile
+from django.http import UnreadablePostError
+from django.utils import timezone
+
+from . import jobs
+from .models import Job, UploadSession
+from .storage import BLOB_TMP_DIR, blob_storage
+
+UPLOAD_SESSION_DIR = os.path.join(BLOB_TMP_DIR, 'uploads')
+# Незавершенная загрузка удаляется, если части не приходили сутки
+UPLOAD_SESSION_TTL = 24 * 60 * 60
+# Сколько незавершенных загрузок может быть у студента одновременно:
+# файлы DOCX и PDF и по запасной попытке на каждый
+MAX_UPLOAD_SESSIONS = 4
+CHUNK_READ_SIZE = 64 * 1024
+
+ERROR_HASH = 'Содержимое файла не совпадает с заявленным SHA-256'
+ERROR_INCOMPLETE = 'Файл загружен не полностью'
+
+
+class OffsetMismatch(Exception):
+    """Часть файла пришла не с того места, где остановилась загрузка."""
+    def __init__(self, received):
+        super().__init__(received)
+        self.received = received
+
+
+def part_path(session):
+    """Путь к временному файлу загрузки на диске."""
+    return blob_storage.path(
+        os.path.join(UPLOAD_SESSION_DIR, f'{session.pk}.part')
+    )
+
+
+def append_chunk(session, offset, stream, length):
+    """Дописывает часть файла, начинающуюся с байта offset.
+
+    Часть принимается, только если offset совпадает с числом уже
+    полученных байт. Недописанный хвост от оборванного запроса
+    отбрасывается. Если соединение рвется посреди части, сохраняется
+    то, что успело прийти, и клиент продолжает с этого места.
+    Возвращает новое число полученных байт.
+    """
+    if offset != session.received:
+        raise OffsetMismatch(session.received)
+    path = part_path(session)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    written = 0
+    with open(path, 'ab') as part:
+        part.truncate(offset)
+        while written < length:
+            try:
+                chunk = stream.read(min(CHUNK_READ_SIZE, length - written))
+            except (UnreadablePostError, OSError):
+                break
+            if not chunk:
+                break
+            part.write(chunk)
+            written += len(chunk)
+    # Сравнение с прежним значением защищает от параллельной записи
+    # той же части из двух запросов
+    updated = UploadSession.objects.filter(
+        pk=session.pk, received=offset
+    ).update(received=offset + written, updated=timezone.now())
+    if not updated:
+        session.refresh_from_db(fields=['received'])
+        raise OffsetMismatch(session.received)
+    session.received = offset + written
+    return session.received
+
+
+class SessionFile(UploadedFile):
+    """Полностью загруженный файл, переданный в форму заявки.
+
+    Как и TemporaryUploadedFile, отдает путь к файлу на диске, поэтому
+    хранилище блобов переносит его без копирования.
+    """
+    def __init__(self, session):
+        self.path = part_path(session)
+        super().__init__(
+            open(self.path, 'rb'), session.file_name, size=session.received
+        )
+
+    def temporary_file_path(self):
+        return self.path
+
+
+def delete_session(session):
+    """Удаляет загрузку вместе с временным файлом."""
+    try:
+        os.unlink(part_path(session))
+    except FileNotFoundError:
+        pass
+    session.delete()
+
+
+def session_ttl():
+    return timedelta(
+        seconds=getattr(settings, 'UPLOAD_SESSION_TTL', UPLOAD_SESSION_TTL)
+    )
+
+
+def make_room(student):
+    """Удаляет самые давние загрузки студента сверх MAX_UPLOAD_SESSIONS.
+
+    Вызывается перед началом новой загрузки, поэтому освобождает место
+    для нее. Брошенные загрузки не копятся, а клиент, начавший файл
+    заново, не получает отказа.
+    """
+    limit = getattr(settings, 'MAX_UPLOAD_SESSIONS', MAX_UPLOAD_SESSIONS)
+    oldest = student.upload_sessions.order_by('-updated')[limit - 1:]
+    for session in oldest:
+        delete_session(session)
+
+
+def schedule_collection(run_after):
+    """Планирует удаление брошенных загрузок, если оно еще не запланировано."""
+    planned = Job.objects.filter(
+        name='collect_uploads',
+        status=Job.PENDING,
+        run_after__lte=run_after,
+    )
+    if not planned.exists():
+        jobs.enqueue('collect_uploads', run_after=run_after)
+
+
+def collect_sessions():
+    """Удаляет брошенные загрузки и возвращает их число.
+
+    Если остались незавершенные загрузки, следующая уборка планируется
+    на момент, когда истечет срок самой давней из них.
+    """
+    stale = UploadSession.objects.filter(
+        updated__lt=timezone.now() - session_ttl()
+    )
+    removed = 0
+    for session in stale.iterator():
+        delete_session(session)
+        removed += 1
+    oldest = UploadSession.objects.order_by('updated').values_list(
+        'updated', flat=True
+    ).first()
+    if oldest is not None:
+        schedule_collection(oldest + session_ttl())
+    return removed
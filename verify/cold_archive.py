@@ -0,0 +1,191 @@
+import datetime
+import hashlib
+import json
+import logging
+import lzma
+import os
+import re
+import shutil
+
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+from django.utils import timezone
+
+from .blobs import release_blobs
+from .models import CheckOut
+from .storage import blob_storage
+
+logger = logging.getLogger(__name__)
+
+# Каталог холодного архива; по умолчанию - cold/ в MEDIA_ROOT
+COLD_ARCHIVE_DIR = 'cold'
+MANIFEST_NAME = 'manifest.json'
+# Месяц начала учебного года
+ACADEMIC_YEAR_START_MONTH = 9
+# Сколько лет после окончания учебного года хранятся работы. Отдельным
+# годам можно задать свой срок в COLD_ARCHIVE_RETENTION, например
+# {'2023-2024': 10}; None означает бессрочное хранение
+COLD_ARCHIVE_RETENTION_YEARS = 5
+YEAR_NAME = re.compile(r'^\d{4}-\d{4}$')
+XZ_PRESET = 6
+CHUNK_SIZE = 64 * 1024
+# Файлы заявки в архиве: вид -> поле заявки
+FILE_FIELDS = {'pdf': 'pdf_file', 'docx': 'docx_file'}
+
+
+def cold_storage():
+    location = getattr(settings, 'COLD_ARCHIVE_ROOT', None) or os.path.join(
+        settings.MEDIA_ROOT, COLD_ARCHIVE_DIR
+    )
+    return FileSystemStorage(location=location)
+
+
+def academic_year(moment):
+    """Учебный год даты в виде '2024-2025'."""
+    start_month = getattr(
+        settings, 'ACADEMIC_YEAR_START_MONTH', ACADEMIC_YEAR_START_MONTH
+    )
+    day = timezone.localtime(moment).date()
+    start = day.year if day.month >= start_month else day.year - 1
+    return f'{start}-{start + 1}'
+
+
+def retention_years(year):
+    """Срок хранения работ учебного года year в годах или None."""
+    overrides = getattr(settings, 'COLD_ARCHIVE_RETENTION', {})
+    if year in overrides:
+        return overrides[year]
+    return getattr(
+        settings, 'COLD_ARCHIVE_RETENTION_YEARS', COLD_ARCHIVE_RETENTION_YEARS
+    )
+
+
+def is_expired(year, today):
+    """Проверяет, истек ли срок хранения работ учебного года year."""
+    years = retention_years(year)
+    if years is None:
+        return False
+    start_month = getattr(
+        settings, 'ACADEMIC_YEAR_START_MONTH', ACADEMIC_YEAR_START_MONTH
+    )
+    end_year = int(year.split('-')[1])
+    return today >= datetime.date(end_year + years, start_month, 1)
+
+
+def compress(field_file, path):
+    """Сжимает файл в xz по частям, возвращает SHA-256 и размер исходника."""
+    digest = hashlib.sha256()
+    size = 0
+    tmp_path = f'{path}.tmp'
+    with field_file.open('rb') as source, \
+            lzma.open(tmp_path, 'wb', preset=XZ_PRESET) as target:
+        for chunk in iter(lambda: source.read(CHUNK_SIZE), b''):
+            digest.update(chunk)
+            size += len(chunk)
+            target.write(chunk)
+    os.replace(tmp_path, path)
+    return digest.hexdigest(), size
+
+
+def freeze(check):
+    """Сжимает файлы заявки в холодный архив и возвращает имя описи.
+
+    Файлы лежат в <учебный год>/<id заявки>/. Опись записывается
+    последней, поэтому ее наличие означает, что архив заявки полон.
+    """
+    storage = cold_storage()
+    directory = os.path.join(academic_year(check.check_date), str(check.id))
+    os.makedirs(storage.path(directory), exist_ok=True)
+    files = {}
+    for kind, field in FILE_FIELDS.items():
+        field_file = getattr(check, field)
+        if not field_file:
+            continue
+        stored = f'{kind}.xz'
+        sha256, size = compress(
+            field_file, storage.path(os.path.join(directory, stored))
+        )
+        files[kind] = {
+            'name': field_file.name,
+            'extension': os.path.splitext(field_file.name)[1],
+            'sha256': sha256,
+            'size': size,
+            'stored': stored,
+        }
+    manifest = {
+        'check_id': check.id,
+        'student': check.student.username,
+        'submission_number': check.submission_number,
+        'check_date': check.check_date.isoformat(),
+        'archived_at': timezone.now().isoformat(),
+        'files': files,
+    }
+    name = os.path.join(directory, MANIFEST_NAME)
+    tmp_path = storage.path(f'{name}.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as target:
+        json.dump(manifest, target, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, storage.path(name))
+    return name
+
+
+def read_manifest(name):
+    with cold_storage().open(name) as source:
+        return json.loads(source.read().decode('utf-8'))
+
+
+def thaw(name):
+    """Распаковывает файлы из архива в хранилище блобов.
+
+    Возвращает словарь «поле заявки -> имя блоба». Хеш распакованного
+    файла сверяется с описью, поврежденный файл удаляется.
+    """
+    storage = cold_storage()
+    directory = os.path.dirname(name)
+    restored = {}
+    for kind, entry in read_manifest(name)['files'].items():
+        path = storage.path(os.path.join(directory, entry['stored']))
+        with lzma.open(path, 'rb') as source:
+            blob = blob_storage.save(
+                f'{kind}{entry["extension"]}', File(source)
+            )
+        if entry['sha256'] not in blob:
+            logger.error('Файл %s из архива %s поврежден', kind, name)
+            release_blobs([blob])
+            continue
+        restored[FILE_FIELDS[kind]] = blob
+    return restored
+
+
+def discard(name):
+    """Удаляет архив заявки по имени описи."""
+    if name:
+        shutil.rmtree(
+            cold_storage().path(os.path.dirname(name)), ignore_errors=True
+        )
+
+
+def expired_years(today=None):
+    """Учебные годы архива, срок хранения которых истек."""
+    storage = cold_storage()
+    if not storage.exists(''):
+        return []
+    today = today or timezone.localdate()
+    return [
+        year for year in sorted(storage.listdir('')[0])
+        if YEAR_NAME.match(year) and is_expired(year, today)
+    ]
+
+
+def purge(today=None):
+    """Удаляет работы учебных лет с истекшим сроком хранения.
+
+    Возвращает список удаленных учебных лет.
+    """
+    years = expired_years(today)
+    for year in years:
+        CheckOut.objects.filter(
+            cold_manifest__startswith=f'{year}/'
+        ).update(cold_manifest='')
+        shutil.rmtree(cold_storage().path(year), ignore_errors=True)
+    return years
@@ -7,6 +7,7 @@ ERROR_MAIN_5 = 'Неверно указан номер или дата прик
 ERROR_MAIN_6 = 'Неверно указаны исходные данные пояснительной записки.'
 ERROR_MAIN_7 = 'Неверно указано число листов в штампе структурного элемента.'
 ERROR_MAIN_8 = 'Закладка не определена.'
+ERROR_MAIN_9 = 'Размер или ориентация листа заданы неверно.'
 
 # Оформление текста
 ERROR_TEXT_1 = 'Некорректное форматирование текста.'
@@ -47,3 +48,23 @@ ERROR_FRAME_2 = 'Неверно указано число листов в осн
 # Ссылки
 ERROR_LINK_1 = 'Отсутствуют ссылки на использованные источники.'
 ERROR_LINK_2 = 'Ссылки на источники оформлены неверно.'
+
+# Категории каталога стандартных замечаний: (код, название, префикс
+# констант). Код замечания - код категории * 100 + номер константы,
+# например ERROR_TABLE_3 -> 503. Коды хранятся в БД и не меняются.
+REMARK_CATEGORIES = (
+    (1, 'Общие ошибки', 'ERROR_MAIN'),
+    (2, 'Текст', 'ERROR_TEXT'),
+    (3, 'Заголовки', 'ERROR_HEAD'),
+    (4, 'Списки', 'ERROR_LIST'),
+    (5, 'Таблицы', 'ERROR_TABLE'),
+    (6, 'Рисунки', 'ERROR_IMAGE'),
+    (7, 'Формулы', 'ERROR_FORMULA'),
+    (8, 'Рамки', 'ERROR_FRAME'),
+    (9, 'Ссылки', 'ERROR_LINK'),
+)
+
+# Сообщения форм
+REMARK_DUPLICATE_ERROR = 'Такое замечание к этой работе уже существует.'
+
+ACTIVE_CHECK_EXISTS_ERROR = 'У вас уже есть заявка на проверке.'
@@ -0,0 +1,9 @@
+from .models import CheckOut, Counter
+
+
+def active_check_count():
+    """Число заявок, ожидающих проверки."""
+    return Counter.get_value(
+        Counter.ACTIVE_CHECKS,
+        CheckOut.objects.filter(status=False),
+    )
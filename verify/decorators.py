@@ -1,19 +1,36 @@
+import hashlib
 from functools import wraps
 
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.core.exceptions import PermissionDenied
+from django.http import HttpResponse
 from django.shortcuts import get_object_or_404
+from django.utils.cache import (
+    get_conditional_response, patch_cache_control, quote_etag,
+)
+from django.views.decorators.csrf import csrf_exempt, csrf_protect
+
+from .caching import PAGE_KEY, get_versions, view_cache_timeout, view_key
+from .uploads import ValidatingUploadHandler
 
 User = get_user_model()
 
 
 def user_check(func):
-    """Декоратор. Проверяет доступность страницы для текущего пользователя."""
+    """Декоратор. Проверяет доступность страницы для текущего пользователя.
+
+    Владелец страницы передается в представление через request.target_user.
+    Текущий пользователь уже загружен, поэтому при совпадении имен запрос
+    к БД не нужен; иначе пользователь ищется только для выбора между
+    ответами 404 и 403.
+    """
     @wraps(func)
     def wrap(request, *args, **kwargs):
-        user = get_object_or_404(User, username=kwargs['username'])
-        if request.user != user:
+        if request.user.username != kwargs['username']:
+            get_object_or_404(User, username=kwargs['username'])
             raise PermissionDenied
+        request.target_user = request.user
         return func(request, *args, **kwargs)
     return wrap
 
@@ -26,3 +43,96 @@ def user_access(func):
             raise PermissionDenied
         return func(request, *args, **kwargs)
     return wrap
+
+
+def validating_uploads(func):
+    """Декоратор. Принимает файлы через ValidatingUploadHandler.
+
+    Обработчики загрузки можно заменить только до чтения тела запроса,
+    а CsrfViewMiddleware читает его раньше представления. Поэтому
+    проверка CSRF переносится внутрь декоратора, после замены.
+    """
+    protected = csrf_protect(func)
+
+    @wraps(func)
+    @csrf_exempt
+    def wrap(request, *args, **kwargs):
+        request.upload_handlers = [ValidatingUploadHandler(request)]
+        return protected(request, *args, **kwargs)
+    return wrap
+
+
+def cache_versioned(*names):
+    """Декоратор. Кэширует страницу до изменения данных names.
+
+    Ключ включает адрес, пользователя и версии данных (см. caching),
+    поэтому повторный просмотр не обращается к БД, кроме загрузки сессии
+    и пользователя. Кэшируются только успешные ответы на GET без cookie;
+    заголовки, выставленные представлением (Cache-Control, Vary и
+    другие), сохраняются вместе со страницей.
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrap(request, *args, **kwargs):
+            if request.method != 'GET':
+                return func(request, *args, **kwargs)
+            key = PAGE_KEY.format(view_key(request, get_versions(*names)))
+            cached = cache.get(key)
+            if cached is not None:
+                content, headers = cached
+                response = HttpResponse(content)
+                for header, value in headers:
+                    response[header] = value
+                return response
+            response = func(request, *args, **kwargs)
+            if (response.status_code == 200 and not response.streaming
+                    and not response.cookies):
+                cache.set(
+                    key, (response.content, tuple(response.items())),
+                    view_cache_timeout(),
+                )
+            return response
+        return wrap
+    return decorator
+
+
+def conditional(state):
+    """Декоратор. Отвечает 304, пока не изменилось состояние страницы.
+
+    state(request, *args, **kwargs) возвращает строку, которая меняется
+    вместе с данными страницы. ETag строится по ней, адресу,
+    пользователю и токену CSRF и проверяется до вызова представления,
+    поэтому повторный запрос с If-None-Match стоит только вычисления
+    state. Токен входит в ETag, потому что он есть в формах страницы и
+    меняется при входе: форма из устаревшей копии получила бы ответ 403.
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrap(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return func(request, *args, **kwargs)
+            key = view_key(request, '{}:{}'.format(
+                state(request, *args, **kwargs),
+                request.META.get('CSRF_COOKIE', ''),
+            ))
+            etag = quote_etag(hashlib.md5(key.encode()).hexdigest())
+            response = get_conditional_response(request, etag=etag)
+            if response is None:
+                response = func(request, *args, **kwargs)
+                if response.status_code == 200:
+                    response['ETag'] = etag
+            patch_cache_control(response, private=True, no_cache=True)
+            return response
+        return wrap
+    return decorator
+
+
+def etag_versioned(*names):
+    """Декоратор. Отвечает 304, пока не изменились данные names.
+
+    Состоянием служат версии данных (см. caching): они читаются из кэша,
+    и ответ 304 обходится загрузкой сессии и пользователя.
+    """
+    return conditional(
+        lambda request, *args, **kwargs: get_versions(*names)
+    )
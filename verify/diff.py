@@ -0,0 +1,260 @@
+import hashlib
+import json
+import os
+from xml.etree import ElementTree
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+
+from .docx import iter_body, qn
+from .reading import docx_digest
+
+PARAGRAPHS_DIR = 'paragraphs'
+DIFFS_DIR = 'diffs'
+# Меняется вместе с форматом сохраненных абзацев и результатов сравнения
+DIFF_VERSION = 1
+# Если документы различаются сильнее, остаток сравнения считается
+# замененным целиком: время сравнения ограничено O(N * MAX_EDIT_DISTANCE)
+MAX_EDIT_DISTANCE = 1000
+# Сколько неизмененных абзацев показывать вокруг каждого изменения
+CONTEXT_PARAGRAPHS = 1
+
+
+def paragraphs_path(digest):
+    """Путь к абзацам документа в хранилище."""
+    return os.path.join(
+        PARAGRAPHS_DIR, digest[:2], f'{digest}.v{DIFF_VERSION}.json'
+    )
+
+
+def diff_path(old_digest, new_digest):
+    """Путь к результату сравнения двух документов в хранилище."""
+    return os.path.join(
+        DIFFS_DIR, new_digest[:2], new_digest,
+        f'{old_digest}.v{DIFF_VERSION}.json',
+    )
+
+
+def format_fingerprint(paragraph):
+    """Отпечаток оформления абзаца: свойства абзаца и всех его фрагментов.
+
+    Свойства раздела не учитываются: они проверяются отдельно.
+    """
+    digest = hashlib.sha1()
+    properties = paragraph.find(qn('pPr'))
+    if properties is not None:
+        for child in properties:
+            if child.tag != qn('sectPr'):
+                digest.update(ElementTree.tostring(child))
+    for run_properties in paragraph.iter(qn('rPr')):
+        digest.update(ElementTree.tostring(run_properties))
+    return digest.hexdigest()
+
+
+def paragraph_text(paragraph):
+    parts = []
+    for elem in paragraph.iter():
+        if elem.tag == qn('t'):
+            parts.append(elem.text or '')
+        elif elem.tag == qn('tab'):
+            parts.append('\t')
+    return ''.join(parts)
+
+
+def extract_paragraphs(fileobj):
+    """Извлекает абзацы документа, включая абзацы таблиц.
+
+    Каждый абзац - пара [ключ, текст], где ключ - хеш текста вместе с
+    отпечатком оформления: абзацы равны, только если совпадают и текст,
+    и оформление.
+    """
+    paragraphs = []
+    for item in iter_body(fileobj):
+        if item.tag == qn('p'):
+            found = [item]
+        elif item.tag == qn('tbl'):
+            found = item.iter(qn('p'))
+        else:
+            continue
+        for paragraph in found:
+            text = paragraph_text(paragraph)
+            key = hashlib.sha1(
+                f'{text}\x1f{format_fingerprint(paragraph)}'.encode()
+            ).hexdigest()[:16]
+            paragraphs.append([key, text])
+    return paragraphs
+
+
+def get_paragraphs(check):
+    """Возвращает абзацы DOCX заявки, извлекая их при первом обращении.
+
+    Абзацы хранятся по хешу DOCX и переживают удаление файлов архивной
+    заявки, поэтому с ней можно сравнить следующую попытку.
+    """
+    if not check.docx_sha256 and not check.docx_file:
+        return None
+    digest = docx_digest(check)
+    path = paragraphs_path(digest)
+    if default_storage.exists(path):
+        with default_storage.open(path, 'rb') as stored:
+            return json.load(stored)
+    if not check.docx_file:
+        return None
+    with check.docx_file.open('rb') as docx:
+        paragraphs = extract_paragraphs(docx)
+    if not default_storage.exists(path):
+        default_storage.save(
+            path, ContentFile(json.dumps(paragraphs, ensure_ascii=False))
+        )
+    return paragraphs
+
+
+def myers(a, b, max_distance=MAX_EDIT_DISTANCE):
+    """Кратчайший список правок между последовательностями a и b.
+
+    Алгоритм Майерса, время O((N + M) * D), где D - число правок.
+    Возвращает список ('equal' | 'delete' | 'insert', индекс в a,
+    индекс в b) или None, если правок больше max_distance.
+    """
+    n, m = len(a), len(b)
+    v = {1: 0}
+    trace = []
+    for d in range(min(n + m, max_distance) + 1):
+        trace.append(v.copy())
+        for k in range(-d, d + 1, 2):
+            if k == -d or (k != d and v[k - 1] < v[k + 1]):
+                x = v[k + 1]
+            else:
+                x = v[k - 1] + 1
+            y = x - k
+            while x < n and y < m and a[x] == b[y]:
+                x += 1
+                y += 1
+            v[k] = x
+            if x >= n and y >= m:
+                return backtrack(trace, n, m)
+    return None
+
+
+def backtrack(trace, x, y):
+    edits = []
+    for d in range(len(trace) - 1, -1, -1):
+        v = trace[d]
+        k = x - y
+        if k == -d or (k != d and v[k - 1] < v[k + 1]):
+            prev_k = k + 1
+        else:
+            prev_k = k - 1
+        prev_x = v[prev_k]
+        prev_y = prev_x - prev_k
+        while x > prev_x and y > prev_y:
+            x -= 1
+            y -= 1
+            edits.append(('equal', x, y))
+        if d > 0:
+            if x == prev_x:
+                edits.append(('insert', x, prev_y))
+            else:
+                edits.append(('delete', prev_x, y))
+        x, y = prev_x, prev_y
+    edits.reverse()
+    return edits
+
+
+def diff_keys(old, new):
+    """Сравнивает списки ключей абзацев.
+
+    Общие начало и конец отбрасываются до запуска алгоритма Майерса,
+    поэтому правка нескольких страниц сравнивается за время,
+    пропорциональное объему изменений.
+    """
+    start = 0
+    while start < len(old) and start < len(new) and \
+            old[start] == new[start]:
+        start += 1
+    end = 0
+    while end < len(old) - start and end < len(new) - start and \
+            old[-1 - end] == new[-1 - end]:
+        end += 1
+    old_middle = old[start:len(old) - end]
+    new_middle = new[start:len(new) - end]
+    edits = myers(old_middle, new_middle)
+    if edits is None:
+        edits = [('delete', i, 0) for i in range(len(old_middle))]
+        edits += [('insert', len(old_middle), j)
+                  for j in range(len(new_middle))]
+    result = [('equal', i, i) for i in range(start)]
+    result += [(op, i + start, j + start) for op, i, j in edits]
+    result += [
+        ('equal', len(old) - end + i, len(new) - end + i)
+        for i in range(end)
+    ]
+    return result
+
+
+def make_hunks(old, new, edits, context=CONTEXT_PARAGRAPHS):
+    """Группирует правки в блоки изменений с окружающими абзацами.
+
+    Номера абзацев в блоках начинаются с единицы. Абзац, у которого
+    изменилось только оформление, помечается format_only.
+    """
+    changed = [i for i, (op, _, _) in enumerate(edits) if op != 'equal']
+    hunks = []
+    for position in changed:
+        first = max(position - context, 0)
+        if hunks and first <= hunks[-1][1] + 1:
+            hunks[-1][1] = min(position + context, len(edits) - 1)
+        else:
+            hunks.append([first, min(position + context, len(edits) - 1)])
+    result = []
+    for first, last in hunks:
+        lines = []
+        for op, i, j in edits[first:last + 1]:
+            if op == 'delete':
+                lines.append({'op': op, 'number': i + 1, 'text': old[i][1]})
+            else:
+                lines.append({'op': op, 'number': j + 1, 'text': new[j][1]})
+        deleted = {line['text'] for line in lines if line['op'] == 'delete'}
+        inserted = {line['text'] for line in lines if line['op'] == 'insert'}
+        for line in lines:
+            line['format_only'] = line['op'] != 'equal' and (
+                line['text'] in (inserted if line['op'] == 'delete'
+                                 else deleted)
+            )
+        result.append(lines)
+    return result
+
+
+def previous_check(check):
+    """Предыдущая попытка сдачи работы того же студента."""
+    return check.student.checkout_student.filter(
+        submission_number__lt=check.submission_number
+    ).order_by('-submission_number').first()
+
+
+def get_changes(check):
+    """Возвращает изменения DOCX заявки относительно предыдущей попытки.
+
+    Результат - словарь с предыдущей заявкой и блоками изменений или
+    None, если сравнивать не с чем. Сравнение каждой пары документов
+    выполняется один раз и сохраняется в хранилище.
+    """
+    previous = previous_check(check)
+    if previous is None:
+        return None
+    new = get_paragraphs(check)
+    old = get_paragraphs(previous)
+    if new is None or old is None:
+        return None
+    path = diff_path(previous.docx_sha256, check.docx_sha256)
+    if default_storage.exists(path):
+        with default_storage.open(path, 'rb') as stored:
+            hunks = json.load(stored)
+    else:
+        edits = diff_keys([key for key, _ in old], [key for key, _ in new])
+        hunks = make_hunks(old, new, edits)
+        if not default_storage.exists(path):
+            default_storage.save(
+                path, ContentFile(json.dumps(hunks, ensure_ascii=False))
+            )
+    return {'previous': previous, 'hunks': hunks}
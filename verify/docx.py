@@ -0,0 +1,57 @@
+import zipfile
+
+from xml.etree import ElementTree
+
+W_NS = 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'
+DOCUMENT_PART = 'word/document.xml'
+
+
+class DocxError(Exception):
+    """Файл не является корректным документом DOCX."""
+
+
+def qn(tag):
+    """Возвращает полное имя тега в пространстве имен WordprocessingML."""
+    return f'{{{W_NS}}}{tag}'
+
+
+def iter_body(fileobj):
+    """Потоково перебирает элементы верхнего уровня тела документа.
+
+    Каждый элемент (абзац, таблица, свойства раздела) отдается после
+    полного разбора и сразу удаляется из дерева, поэтому расход памяти
+    не зависит от объема документа.
+    """
+    try:
+        with zipfile.ZipFile(fileobj) as archive:
+            with archive.open(DOCUMENT_PART) as document:
+                depth = 0
+                body = None
+                events = ElementTree.iterparse(
+                    document, events=('start', 'end')
+                )
+                for event, elem in events:
+                    if event == 'start':
+                        depth += 1
+                        if depth == 2 and elem.tag == qn('body'):
+                            body = elem
+                        continue
+                    depth -= 1
+                    if depth == 2 and body is not None:
+                        yield elem
+                        body.clear()
+    except (zipfile.BadZipFile, KeyError, ElementTree.ParseError) as exc:
+        raise DocxError(str(exc)) from exc
+
+
+def section_properties(body_item):
+    """Возвращает свойства раздела, завершающегося на элементе тела.
+
+    Свойства раздела хранятся либо в самом теле документа (последний
+    раздел), либо в свойствах последнего абзаца раздела.
+    """
+    if body_item.tag == qn('sectPr'):
+        return body_item
+    if body_item.tag == qn('p'):
+        return body_item.find(f"{qn('pPr')}/{qn('sectPr')}")
+    return None
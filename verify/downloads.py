@@ -0,0 +1,133 @@
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.http import HttpResponse, StreamingHttpResponse
+from django.utils.cache import (
+    get_conditional_response, patch_cache_control, quote_etag,
+)
+from django.utils.http import parse_etags
+
+# Как отдаются файлы работ: '' - самим Django, 'nginx' - через
+# X-Accel-Redirect, 'sendfile' - через X-Sendfile (Apache, lighttpd)
+PROTECTED_MEDIA_SERVER = ''
+# Внутренний адрес nginx, отображенный на MEDIA_ROOT:
+# location /protected-media/ { internal; alias <MEDIA_ROOT>/; }
+PROTECTED_MEDIA_URL = '/protected-media/'
+CHUNK_SIZE = 64 * 1024
+RANGE = re.compile(r'^bytes=(?P<start>\d*)-(?P<end>\d*)$')
+
+
+class RangeNotSatisfiable(Exception):
+    pass
+
+
+def media_server():
+    return getattr(settings, 'PROTECTED_MEDIA_SERVER', PROTECTED_MEDIA_SERVER)
+
+
+def parse_range(header, size):
+    """Возвращает границы [start, end] из заголовка Range.
+
+    Поддерживается один диапазон: для отсутствующего, неразборчивого или
+    составного заголовка возвращается None, и файл отдается целиком.
+    Диапазон за пределами файла вызывает RangeNotSatisfiable.
+    """
+    match = RANGE.match(header.replace(' ', ''))
+    if match is None:
+        return None
+    start, end = match.group('start'), match.group('end')
+    if not start:
+        if not end:
+            return None
+        # Суффикс: последние end байт
+        length = int(end)
+        if not length or not size:
+            raise RangeNotSatisfiable
+        return max(size - length, 0), size - 1
+    start = int(start)
+    end = min(int(end), size - 1) if end else size - 1
+    if start > end:
+        if start >= size:
+            raise RangeNotSatisfiable
+        return None
+    return start, end
+
+
+def read_range(fileobj, start, end):
+    """Читает из файла байты [start, end] частями и закрывает его."""
+    try:
+        fileobj.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = fileobj.read(min(CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+    finally:
+        fileobj.close()
+
+
+def stream_file(request, field_file, etag):
+    """Ответ с содержимым файла, учитывающий заголовки Range и If-Range.
+
+    Программы просмотра PDF запрашивают документ частями и могут
+    показать первые страницы, не дожидаясь всего файла.
+    """
+    size = field_file.size
+    byte_range = None
+    if_range = request.META.get('HTTP_IF_RANGE')
+    if not if_range or etag in parse_etags(if_range):
+        try:
+            byte_range = parse_range(request.META.get('HTTP_RANGE', ''), size)
+        except RangeNotSatisfiable:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{size}'
+            return response
+    start, end = byte_range or (0, size - 1)
+    response = StreamingHttpResponse(
+        read_range(field_file.open('rb'), start, end),
+        status=206 if byte_range else 200,
+    )
+    response['Content-Length'] = end - start + 1 if size else 0
+    if byte_range:
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+    return response
+
+
+def serve_file(request, field_file, filename, content_type, digest='',
+               inline=False):
+    """Отдает файл работы после проверки прав доступа.
+
+    Если перед сервером стоит nginx или Apache (PROTECTED_MEDIA_SERVER),
+    передачу байтов, в том числе по частям, выполняет он: представление
+    только разрешает ее заголовком. Иначе файл читается самим Django.
+    Хеш содержимого digest служит ETag: блоб с тем же хешем не меняется.
+    С inline=True файл открывается в браузере, иначе скачивается.
+    """
+    etag = quote_etag(digest) if digest else None
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        server = media_server()
+        if server == 'nginx':
+            prefix = getattr(
+                settings, 'PROTECTED_MEDIA_URL', PROTECTED_MEDIA_URL
+            )
+            response = HttpResponse()
+            response['X-Accel-Redirect'] = quote(prefix + field_file.name)
+        elif server == 'sendfile':
+            response = HttpResponse()
+            response['X-Sendfile'] = field_file.path
+        else:
+            response = stream_file(request, field_file, etag)
+        response['Content-Type'] = content_type
+        response['Accept-Ranges'] = 'bytes'
+        disposition = 'inline' if inline else 'attachment'
+        response['Content-Disposition'] = (
+            f'{disposition}; filename="{filename}"'
+        )
+    if etag:
+        response['ETag'] = etag
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
@@ -2,8 +2,11 @@ from django import forms
 
 from users.models import Group
 
-from . import constants as cts
-from .models import CheckOut, Remark
+from .models import CheckOut, Remark, RemarkType, UploadSession
+from .pagination import read_id_cursor
+from .uploads import (
+    ERROR_TOO_LARGE, inspect_upload, max_upload_size, upload_kind,
+)
 
 
 class RemarkNavForm(forms.Form):
@@ -42,54 +45,60 @@ class RemarkEditForm(forms.ModelForm):
     """Форма редактирования замечания."""
     class Meta:
         model = Remark
-        fields = ('section', 'page_number', 'paragraph', 'text',)
+        fields = ('section', 'page_number', 'paragraph', 'remark_type',
+                  'text',)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        remark_types = RemarkType.objects.filter(is_active=True)
+        if self.instance.remark_type_id is not None:
+            # Снятое с показа замечание остается доступным для своей записи
+            remark_types |= RemarkType.objects.filter(
+                pk=self.instance.remark_type_id
+            )
+        self.fields['remark_type'].queryset = remark_types
+
+    def clean(self):
+        cleaned_data = super().clean()
+        if cleaned_data.get('remark_type') is not None:
+            # Текст стандартного замечания берется из каталога
+            cleaned_data['text'] = ''
+        elif not cleaned_data.get('text'):
+            raise forms.ValidationError(
+                'Выберите замечание из каталога или введите его текст'
+            )
+        return cleaned_data
 
 
 class RemarkStandartErrorForm(forms.Form):
-    """Форма выбора замечания."""
-    # [ERROR_MAIN]
-    err_main_1 = forms.BooleanField(label=cts.ERROR_MAIN_1, required=False)
-    err_main_2 = forms.BooleanField(label=cts.ERROR_MAIN_2, required=False)
-    err_main_3 = forms.BooleanField(label=cts.ERROR_MAIN_3, required=False)
-    err_main_4 = forms.BooleanField(label=cts.ERROR_MAIN_4, required=False)
-    err_main_5 = forms.BooleanField(label=cts.ERROR_MAIN_5, required=False)
-    err_main_6 = forms.BooleanField(label=cts.ERROR_MAIN_6, required=False)
-    err_main_7 = forms.BooleanField(label=cts.ERROR_MAIN_7, required=False)
-    err_main_8 = forms.BooleanField(label=cts.ERROR_MAIN_8, required=False)
-    # [ERROR_TEXT]
-    err_text_1 = forms.BooleanField(label=cts.ERROR_TEXT_1, required=False)
-    err_text_2 = forms.BooleanField(label=cts.ERROR_TEXT_2, required=False)
-    err_text_3 = forms.BooleanField(label=cts.ERROR_TEXT_3, required=False)
-    err_text_4 = forms.BooleanField(label=cts.ERROR_TEXT_4, required=False)
-    # [ERROR_HEADERS]
-    err_header_1 = forms.BooleanField(label=cts.ERROR_HEAD_1, required=False)
-    err_header_2 = forms.BooleanField(label=cts.ERROR_HEAD_2, required=False)
-    err_header_3 = forms.BooleanField(label=cts.ERROR_HEAD_3, required=False)
-    # [ERROR_LIST]
-    err_list_1 = forms.BooleanField(label=cts.ERROR_LIST_1, required=False)
-    # [ERROR_TABLE]
-    err_table_1 = forms.BooleanField(label=cts.ERROR_TABLE_1, required=False)
-    err_table_2 = forms.BooleanField(label=cts.ERROR_TABLE_2, required=False)
-    err_table_3 = forms.BooleanField(label=cts.ERROR_TABLE_3, required=False)
-    err_table_4 = forms.BooleanField(label=cts.ERROR_TABLE_4, required=False)
-    # [ERROR_IMAGE]
-    err_image_1 = forms.BooleanField(label=cts.ERROR_IMAGE_1, required=False)
-    err_image_2 = forms.BooleanField(label=cts.ERROR_IMAGE_2, required=False)
-    err_image_3 = forms.BooleanField(label=cts.ERROR_IMAGE_3, required=False)
-    err_image_4 = forms.BooleanField(label=cts.ERROR_IMAGE_4, required=False)
-    # [ERROR_FORMULA]
-    err_formula_1 = forms.BooleanField(label=cts.ERROR_FORMULA_1,
-                                       required=False)
-    err_formula_2 = forms.BooleanField(label=cts.ERROR_FORMULA_2,
-                                       required=False)
-    err_formula_3 = forms.BooleanField(label=cts.ERROR_FORMULA_3,
-                                       required=False)
-    # [ERROR_FRAME]
-    err_frame_1 = forms.BooleanField(label=cts.ERROR_FRAME_1, required=False)
-    err_frame_2 = forms.BooleanField(label=cts.ERROR_FRAME_2, required=False)
-    # [ERROR_LINK]
-    err_link_1 = forms.BooleanField(label=cts.ERROR_LINK_1, required=False)
-    err_link_2 = forms.BooleanField(label=cts.ERROR_LINK_2, required=False)
+    """Форма выбора стандартных замечаний из каталога RemarkType."""
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.remark_types = list(RemarkType.objects.filter(is_active=True))
+        for remark_type in self.remark_types:
+            self.fields[self.field_name(remark_type)] = forms.BooleanField(
+                label=remark_type.text, required=False
+            )
+
+    @staticmethod
+    def field_name(remark_type):
+        return f'err_{remark_type.code}'
+
+    def categories(self):
+        """Поля формы, сгруппированные по категориям каталога."""
+        categories = {}
+        for remark_type in self.remark_types:
+            categories.setdefault(remark_type.category, []).append(
+                self[self.field_name(remark_type)]
+            )
+        return list(categories.items())
+
+    def selected_types(self):
+        """Отмеченные в форме стандартные замечания."""
+        return [
+            remark_type for remark_type in self.remark_types
+            if self.cleaned_data.get(self.field_name(remark_type))
+        ]
 
 
 class CheckForm(forms.ModelForm):
@@ -97,31 +106,158 @@ class CheckForm(forms.ModelForm):
         model = CheckOut
         fields = ('docx_file', 'pdf_file', 'info')
 
-    def clean_docx_file(self):
-        data = self.cleaned_data['docx_file']
-        file_type = data.name.split('.')[-1]
-        if file_type != 'docx':
-            raise forms.ValidationError(
-                'Файл должен иметь расширение .docx',
-            )
-        if data.size > 8000000:
+    def clean_upload(self, field, kind):
+        data = self.cleaned_data[field]
+        if upload_kind(data.name) != kind:
             raise forms.ValidationError(
-                'Файл должен иметь размер не более 8 Мб',
+                f'Файл должен иметь расширение .{kind}',
+                code='invalid extension',
             )
+        error, data.sha256 = inspect_upload(data, kind)
+        if error:
+            raise forms.ValidationError(error)
         return data
 
+    def clean_docx_file(self):
+        return self.clean_upload('docx_file', 'docx')
+
     def clean_pdf_file(self):
-        data = self.cleaned_data['pdf_file']
-        file_type = data.name.split('.')[-1]
-        if file_type != 'pdf':
-            raise forms.ValidationError("Файл должен иметь расширение .pdf",
-                                        code='invalid extension')
-        if data.size > 8000000:
+        return self.clean_upload('pdf_file', 'pdf')
+
+
+class UploadStartForm(forms.ModelForm):
+    """Форма начала докачиваемой загрузки файла работы."""
+    sha256 = forms.RegexField(regex=r'^[0-9a-f]{64}$')
+
+    class Meta:
+        model = UploadSession
+        fields = ('file_name', 'size', 'sha256')
+
+    def clean_file_name(self):
+        data = self.cleaned_data['file_name']
+        if upload_kind(data) is None:
             raise forms.ValidationError(
-                'Файл должен иметь размер не более 8 Мб',
+                'Файл должен иметь расширение .docx или .pdf',
+                code='invalid extension',
             )
         return data
 
+    def clean_size(self):
+        data = self.cleaned_data['size']
+        if data > max_upload_size():
+            raise forms.ValidationError(ERROR_TOO_LARGE)
+        return data
+
+
+class UploadFinishForm(forms.Form):
+    """Форма создания заявки из загруженных по частям файлов."""
+    docx_upload = forms.UUIDField()
+    pdf_upload = forms.UUIDField()
+
+
+class SearchForm(forms.Form):
+    """Форма полнотекстового поиска по замечаниям и текстам работ."""
+    REMARKS = 'remarks'
+    DOCUMENTS = 'documents'
+    KIND_CHOICES = (
+        (REMARKS, 'Замечания'),
+        (DOCUMENTS, 'Тексты работ'),
+    )
+    q = forms.CharField(
+        label='Искать',
+        max_length=200)
+    kind = forms.ChoiceField(
+        label='Где искать',
+        choices=KIND_CHOICES,
+        required=False)
+    year = forms.IntegerField(
+        label='Год',
+        min_value=2000,
+        max_value=2100,
+        required=False)
+    page = forms.IntegerField(
+        min_value=1,
+        required=False,
+        widget=forms.HiddenInput)
+
+    def clean_kind(self):
+        return self.cleaned_data['kind'] or self.REMARKS
+
+    def clean_page(self):
+        return self.cleaned_data['page'] or 1
+
+
+class ApiListForm(forms.Form):
+    """Параметры запроса к JSON API: поля, позиция и размер страницы."""
+    ACTIVE = 'active'
+    ARCHIVED = 'archived'
+    STATUS_CHOICES = (
+        (ACTIVE, 'На проверке'),
+        (ARCHIVED, 'В архиве'),
+    )
+    DEFAULT_LIMIT = 50
+    MAX_LIMIT = 200
+    fields = forms.CharField(
+        required=False)
+    cursor = forms.CharField(
+        required=False)
+    limit = forms.IntegerField(
+        min_value=1,
+        max_value=MAX_LIMIT,
+        required=False)
+    status = forms.ChoiceField(
+        choices=STATUS_CHOICES,
+        required=False)
+
+    def __init__(self, *args, available=(), **kwargs):
+        super().__init__(*args, **kwargs)
+        self.available = available
+
+    def clean_fields(self):
+        value = self.cleaned_data['fields']
+        if not value:
+            return list(self.available)
+        names = [name.strip() for name in value.split(',') if name.strip()]
+        unknown = [name for name in names if name not in self.available]
+        if unknown:
+            raise forms.ValidationError(
+                'Неизвестные поля: %(names)s',
+                params={'names': ', '.join(unknown)},
+            )
+        return names
+
+    def clean_cursor(self):
+        token = self.cleaned_data['cursor']
+        if not token:
+            return None
+        item_id = read_id_cursor(token)
+        if item_id is None:
+            raise forms.ValidationError('Недействительная позиция списка')
+        return item_id
+
+    def clean_limit(self):
+        return self.cleaned_data['limit'] or self.DEFAULT_LIMIT
+
+
+class StatsFilterForm(forms.Form):
+    """Форма выбора периода и группы для статистики замечаний."""
+    MONTH_FORMAT = '%Y-%m'
+    start = forms.DateField(
+        label='С месяца',
+        input_formats=[MONTH_FORMAT],
+        widget=forms.DateInput(attrs={'type': 'month'}, format=MONTH_FORMAT),
+        required=False)
+    end = forms.DateField(
+        label='По месяц',
+        input_formats=[MONTH_FORMAT],
+        widget=forms.DateInput(attrs={'type': 'month'}, format=MONTH_FORMAT),
+        required=False)
+    group = forms.ModelChoiceField(
+        label='Группа',
+        queryset=Group.objects.all(),
+        empty_label='Все группы',
+        required=False)
+
 
 class GroupForm(forms.ModelForm):
     class Meta:
@@ -0,0 +1,143 @@
+import json
+import logging
+import traceback
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+HANDLERS = {}
+
+# Время, на которое обработчик захватывает задачу, в секундах
+JOB_LEASE = 600
+# Задержка перед первым повтором упавшей задачи, в секундах
+JOB_RETRY_DELAY = 30
+JOB_MAX_RETRY_DELAY = 3600
+
+
+def task(name):
+    """Декоратор. Регистрирует функцию как обработчик задачи."""
+    def register(func):
+        HANDLERS[name] = func
+        return func
+    return register
+
+
+def enqueue(name, run_after=None, **payload):
+    """Ставит задачу в очередь.
+
+    Запись создается в текущей транзакции, поэтому задача станет видна
+    обработчикам только вместе с остальными изменениями запроса.
+    """
+    return Job.objects.create(
+        name=name,
+        payload=json.dumps(payload),
+        run_after=run_after or timezone.now(),
+    )
+
+
+def claimable(now):
+    """Задачи, которые можно захватить: ожидающие и с истекшей арендой."""
+    return Job.objects.filter(
+        Q(status=Job.PENDING, run_after__lte=now)
+        | Q(status=Job.RUNNING, locked_until__lt=now)
+    )
+
+
+def claim(worker, limit=1):
+    """Захватывает до limit задач для обработчика worker.
+
+    На PostgreSQL строки блокируются через SELECT ... FOR UPDATE SKIP
+    LOCKED, и параллельные обработчики пропускают чужие задачи. SQLite
+    не поддерживает блокировку строк, но выполняет записи по одной,
+    поэтому там задача захватывается условным UPDATE: выигрывает тот,
+    чей запрос изменил строку.
+    """
+    now = timezone.now()
+    lease = getattr(settings, 'JOB_LEASE', JOB_LEASE)
+    claim_values = {
+        'status': Job.RUNNING,
+        'locked_until': now + timedelta(seconds=lease),
+        'locked_by': worker,
+        'attempts': F('attempts') + 1,
+    }
+    candidates = claimable(now).order_by('run_after', 'id')
+    if connection.features.has_select_for_update_skip_locked:
+        with transaction.atomic():
+            ids = list(
+                candidates.select_for_update(skip_locked=True)
+                .values_list('pk', flat=True)[:limit]
+            )
+            Job.objects.filter(pk__in=ids).update(**claim_values)
+    else:
+        ids = []
+        for pk in candidates.values_list('pk', flat=True)[:limit]:
+            if claimable(now).filter(pk=pk).update(**claim_values):
+                ids.append(pk)
+    return list(Job.objects.filter(pk__in=ids))
+
+
+def execute(job_id):
+    """Выполняет задачу. Вызывается в процессе пула обработчиков."""
+    job = Job.objects.get(pk=job_id)
+    handler = HANDLERS[job.name]
+    handler(**json.loads(job.payload))
+
+
+def retry_delay(attempts):
+    delay = getattr(settings, 'JOB_RETRY_DELAY', JOB_RETRY_DELAY)
+    return min(delay * 2 ** (attempts - 1), JOB_MAX_RETRY_DELAY)
+
+
+def finish(job, error=None):
+    """Сохраняет результат выполнения задачи.
+
+    Упавшая задача возвращается в очередь с экспоненциально растущей
+    задержкой, пока не исчерпано число попыток. Если аренда истекла и
+    задачу уже захватил другой обработчик, результат не записывается.
+    """
+    if error is None:
+        job.status = Job.DONE
+    elif job.attempts >= job.max_attempts:
+        job.status = Job.FAILED
+        logger.error('Задача %s завершилась с ошибкой: %s', job, error)
+    else:
+        job.status = Job.PENDING
+        job.run_after = timezone.now() + timedelta(
+            seconds=retry_delay(job.attempts)
+        )
+    job.last_error = error or ''
+    Job.objects.filter(pk=job.pk, locked_by=job.locked_by).update(
+        status=job.status,
+        run_after=job.run_after,
+        last_error=job.last_error,
+        locked_until=None,
+        locked_by='',
+    )
+
+
+def run_job(job):
+    try:
+        execute(job.pk)
+    except Exception:
+        finish(job, traceback.format_exc())
+    else:
+        finish(job)
+
+
+def run_pending(worker='inline', limit=100):
+    """Выполняет готовые задачи в текущем процессе.
+
+    Возвращает число обработанных задач.
+    """
+    jobs = claim(worker, limit)
+    for job in jobs:
+        run_job(job)
+    return len(jobs)
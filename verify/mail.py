@@ -0,0 +1,140 @@
+import logging
+import uuid
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.mail import EmailMessage, get_connection
+from django.db.models import Min, Q
+from django.utils import timezone
+
+from . import jobs
+from .models import Job, OutgoingEmail
+
+logger = logging.getLogger(__name__)
+
+User = get_user_model()
+
+# Время, на которое отправляющий процесс захватывает письма, в секундах
+MAIL_LEASE = 300
+MAIL_MAX_ATTEMPTS = 5
+MAIL_BATCH_SIZE = 100
+
+
+def queue_mail(subject, message, recipients, from_email=None):
+    """Записывает письма в очередь отправки.
+
+    Письма сохраняются в текущей транзакции вместе с задачей доставки,
+    поэтому отправка не задерживает запрос, а откат транзакции отменяет
+    и письма.
+    """
+    emails = OutgoingEmail.objects.bulk_create(
+        OutgoingEmail(
+            subject=subject,
+            body=message,
+            from_email=from_email or settings.DEFAULT_FROM_EMAIL,
+            recipient=recipient,
+        )
+        for recipient in recipients if recipient
+    )
+    if emails:
+        schedule_delivery(timezone.now())
+    return emails
+
+
+def schedule_delivery(run_after):
+    """Планирует доставку писем, если она еще не запланирована."""
+    planned = Job.objects.filter(
+        name='deliver_outbox',
+        status=Job.PENDING,
+        run_after__lte=run_after,
+    )
+    if not planned.exists():
+        jobs.enqueue('deliver_outbox', run_after=run_after)
+
+
+def notify_new_check(student):
+    """Ставит в очередь уведомления суперпользователей о новой заявке."""
+    recipients = User.objects.filter(is_superuser=True).exclude(
+        email__isnull=True
+    ).values_list('email', flat=True)
+    return queue_mail(
+        'Hовый запрос на проверку работы!',
+        f'Hовый запрос на проверку работы от {student.username}!',
+        list(recipients),
+    )
+
+
+def deliverable(now):
+    return OutgoingEmail.objects.filter(
+        Q(status=OutgoingEmail.PENDING, next_attempt__lte=now)
+        | Q(status=OutgoingEmail.SENDING, locked_until__lt=now)
+    )
+
+
+def claim_batch(limit):
+    """Захватывает пачку писем, готовых к отправке."""
+    now = timezone.now()
+    claim = uuid.uuid4().hex
+    ids = list(deliverable(now).values_list('pk', flat=True)[:limit])
+    deliverable(now).filter(pk__in=ids).update(
+        status=OutgoingEmail.SENDING,
+        locked_until=now + timedelta(seconds=MAIL_LEASE),
+        claim=claim,
+    )
+    return list(OutgoingEmail.objects.filter(claim=claim))
+
+
+def mark_failed(email, error):
+    email.attempts += 1
+    email.last_error = error
+    if email.attempts >= MAIL_MAX_ATTEMPTS:
+        email.status = OutgoingEmail.FAILED
+        logger.error('Не удалось отправить %s: %s', email, error)
+    else:
+        email.status = OutgoingEmail.PENDING
+        email.next_attempt = timezone.now() + timedelta(
+            seconds=jobs.retry_delay(email.attempts)
+        )
+    email.save(update_fields=[
+        'attempts', 'last_error', 'status', 'next_attempt'
+    ])
+
+
+def deliver_outbox(limit=MAIL_BATCH_SIZE):
+    """Отправляет ожидающие письма через одно SMTP-соединение.
+
+    Неотправленные письма получают задержку перед следующей попыткой,
+    а для их повторной отправки ставится отложенная задача. Возвращает
+    число отправленных писем.
+    """
+    emails = claim_batch(limit)
+    sent = 0
+    if emails:
+        try:
+            with get_connection() as connection:
+                for email in emails:
+                    message = EmailMessage(
+                        email.subject, email.body, email.from_email,
+                        [email.recipient], connection=connection,
+                    )
+                    try:
+                        message.send()
+                    except Exception as exc:
+                        mark_failed(email, repr(exc))
+                        continue
+                    email.status = OutgoingEmail.SENT
+                    email.sent_at = timezone.now()
+                    email.save(update_fields=['status', 'sent_at'])
+                    sent += 1
+        except Exception as exc:
+            for email in emails:
+                if email.status == OutgoingEmail.SENDING:
+                    mark_failed(email, repr(exc))
+    retry_at = OutgoingEmail.objects.filter(
+        status=OutgoingEmail.PENDING
+    ).aggregate(retry_at=Min('next_attempt'))['retry_at']
+    if retry_at is not None:
+        schedule_delivery(retry_at)
+    return sent
@@ -0,0 +1,46 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from verify.models import (
+    CheckOut, Counter, refresh_active_checks, sync_remark_counts,
+)
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = ('Пересчитывает число замечаний и номера попыток заявок, '
+            'указатели на активные заявки и счетчик активных заявок')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=500,
+            help='Число заявок, обновляемых одним запросом',
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        with transaction.atomic():
+            sync_remark_counts(CheckOut.objects.values_list('pk', flat=True))
+            numbered = []
+            current_student = None
+            checks = CheckOut.objects.order_by(
+                'student_id', 'check_date', 'id'
+            ).only('id', 'student_id', 'submission_number')
+            for check in checks.iterator():
+                if check.student_id != current_student:
+                    current_student = check.student_id
+                    number = 0
+                number += 1
+                if check.submission_number != number:
+                    check.submission_number = number
+                    numbered.append(check)
+            CheckOut.objects.bulk_update(
+                numbered, ['submission_number'], batch_size=batch_size
+            )
+            refresh_active_checks(User.objects.values_list('pk', flat=True))
+            Counter.reset(Counter.ACTIVE_CHECKS)
+        self.stdout.write(self.style.SUCCESS(
+            f'Обновлены номера попыток у {len(numbered)} заявок'
+        ))
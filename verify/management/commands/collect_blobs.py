@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from verify.blobs import collect_blobs
+
+
+class Command(BaseCommand):
+    help = ('Удаляет блобы, на которые не ссылается ни одна заявка, '
+            'и брошенные временные файлы загрузок')
+
+    def handle(self, *args, **options):
+        removed = collect_blobs()
+        self.stdout.write(self.style.SUCCESS(
+            f'Удалено файлов: {removed}'
+        ))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from verify.chunked import collect_sessions
+
+
+class Command(BaseCommand):
+    help = ('Удаляет докачиваемые загрузки, части которых давно не '
+            'приходили, вместе с их временными файлами')
+
+    def handle(self, *args, **options):
+        removed = collect_sessions()
+        self.stdout.write(self.style.SUCCESS(
+            f'Удалено загрузок: {removed}'
+        ))
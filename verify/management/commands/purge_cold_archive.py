@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from verify import cold_archive
+
+
+class Command(BaseCommand):
+    help = ('Удаляет из холодного архива работы учебных лет, срок '
+            'хранения которых истек')
+
+    def handle(self, *args, **options):
+        years = cold_archive.purge()
+        self.stdout.write(self.style.SUCCESS(
+            f'Удалено учебных лет: {len(years)} ({", ".join(years) or "-"})'
+        ))
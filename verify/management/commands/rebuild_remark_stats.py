@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from verify import stats
+
+
+class Command(BaseCommand):
+    help = ('Пересчитывает статистику замечаний по типам, группам и '
+            'месяцам')
+
+    def handle(self, *args, **options):
+        cells = stats.rebuild()
+        self.stdout.write(self.style.SUCCESS(
+            f'Заполнено ячеек статистики: {cells}'
+        ))
@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from verify import diff, search
+from verify.docx import DocxError
+from verify.models import CheckOut, Remark
+
+
+class Command(BaseCommand):
+    help = ('Заново строит полнотекстовый индекс замечаний и текстов '
+            'работ')
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            if connection.vendor == 'sqlite':
+                with connection.cursor() as cursor:
+                    cursor.execute(f'DELETE FROM {search.REMARK_INDEX}')
+                search.index_remarks(
+                    (remark_id, type_text or text)
+                    for remark_id, text, type_text in Remark.objects.values_list(
+                        'id', 'text', 'remark_type__text'
+                    ).iterator()
+                )
+            documents = 0
+            for check in CheckOut.objects.iterator():
+                try:
+                    paragraphs = diff.get_paragraphs(check)
+                except DocxError:
+                    paragraphs = None
+                if paragraphs is None:
+                    search.unindex_document(check.pk)
+                    continue
+                search.index_document(
+                    check.pk, '\n'.join(text for _, text in paragraphs)
+                )
+                documents += 1
+        self.stdout.write(self.style.SUCCESS(
+            f'Проиндексировано документов: {documents}'
+        ))
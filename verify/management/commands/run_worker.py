@@ -0,0 +1,75 @@
+import multiprocessing
+import os
+import socket
+import time
+import traceback
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import django
+
+from django.core.management.base import BaseCommand
+
+from verify import jobs
+
+
+class Command(BaseCommand):
+    help = 'Выполняет фоновые задачи из очереди verify.Job'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--processes', type=int, default=2,
+            help='Число процессов пула (0 - выполнять задачи в текущем '
+                 'процессе)',
+        )
+        parser.add_argument(
+            '--sleep', type=float, default=2.0,
+            help='Пауза между опросами пустой очереди, в секундах',
+        )
+        parser.add_argument(
+            '--once', action='store_true',
+            help='Обработать готовые задачи и завершить работу',
+        )
+
+    def handle(self, *args, **options):
+        worker = f'{socket.gethostname()}:{os.getpid()}'
+        processes = options['processes']
+        if processes == 0:
+            return self.loop(worker, options, self.run_inline)
+        # Процессы запускаются через spawn: унаследованные при fork
+        # соединения с БД нельзя использовать в дочерних процессах.
+        with ProcessPoolExecutor(
+            max_workers=processes,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=django.setup,
+        ) as pool:
+            self.pool = pool
+            self.loop(worker, options, self.run_in_pool)
+
+    def loop(self, worker, options, run):
+        limit = max(options['processes'], 1)
+        while True:
+            claimed = jobs.claim(worker, limit)
+            if claimed:
+                run(claimed)
+            elif options['once']:
+                return
+            else:
+                time.sleep(options['sleep'])
+
+    def run_inline(self, claimed):
+        for job in claimed:
+            jobs.run_job(job)
+
+    def run_in_pool(self, claimed):
+        futures = {
+            self.pool.submit(jobs.execute, job.pk): job for job in claimed
+        }
+        for future in as_completed(futures):
+            job = futures[future]
+            error = future.exception()
+            if error is not None:
+                error = ''.join(traceback.format_exception(
+                    type(error), error, error.__traceback__
+                ))
+            jobs.finish(job, error)
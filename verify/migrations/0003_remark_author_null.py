@@ -0,0 +1,20 @@
+# Generated by Django 2.2 on 2026-10-18 09:54
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('verify', '0002_auto_20210413_1142'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='remark',
+            name='author',
+            field=models.ForeignKey(blank=True, help_text='Укажите автора замечания', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='remark', to=settings.AUTH_USER_MODEL, verbose_name='Автор замечания'),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 2.2 on 2026-10-18 09:56
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('verify', '0003_remark_author_null'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Job',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, verbose_name='Имя задачи')),
+                ('payload', models.TextField(default='{}', verbose_name='Параметры задачи (JSON)')),
+                ('status', models.CharField(choices=[('pending', 'Ожидает выполнения'), ('running', 'Выполняется'), ('done', 'Выполнена'), ('failed', 'Завершилась с ошибкой')], default='pending', max_length=10, verbose_name='Статус задачи')),
+                ('attempts', models.PositiveSmallIntegerField(default=0, verbose_name='Число попыток')),
+                ('max_attempts', models.PositiveSmallIntegerField(default=5, verbose_name='Максимальное число попыток')),
+                ('run_after', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Не выполнять раньше')),
+                ('locked_until', models.DateTimeField(blank=True, null=True, verbose_name='Задача захвачена до')),
+                ('locked_by', models.CharField(blank=True, max_length=100, verbose_name='Обработчик')),
+                ('last_error', models.TextField(blank=True, verbose_name='Последняя ошибка')),
+                ('created', models.DateTimeField(auto_now_add=True, verbose_name='Дата постановки в очередь')),
+            ],
+            options={
+                'ordering': ['run_after', 'id'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['status', 'run_after'], name='verify_job_status_idx'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 2.2 on 2026-10-18 09:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('verify', '0005_outgoingemail'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Counter',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True, verbose_name='Имя счетчика')),
+                ('value', models.IntegerField(default=0, verbose_name='Значение счетчика')),
+            ],
+        ),
+    ]
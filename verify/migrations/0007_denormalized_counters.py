@@ -0,0 +1,23 @@
+# Generated by Django 2.2 on 2026-10-18 10:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('verify', '0006_counter'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='checkout',
+            name='remark_count',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Заполняется автоматически', verbose_name='Число замечаний'),
+        ),
+        migrations.AddField(
+            model_name='checkout',
+            name='submission_number',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Заполняется автоматически', verbose_name='Номер попытки сдачи работы'),
+        ),
+    ]
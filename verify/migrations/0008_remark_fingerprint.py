@@ -0,0 +1,62 @@
+import hashlib
+
+from django.db import migrations, models
+from django.db.models.functions import Coalesce
+
+
+def fingerprint(remark):
+    parts = (
+        remark.check_out_id, remark.section, remark.page_number,
+        remark.paragraph, remark.text,
+    )
+    content = '\x1f'.join('' if part is None else str(part) for part in parts)
+    return hashlib.sha256(content.encode()).hexdigest()
+
+
+def fill_fingerprints(apps, schema_editor):
+    """Заполняет хеши замечаний и удаляет повторяющиеся замечания."""
+    Remark = apps.get_model('verify', 'Remark')
+    CheckOut = apps.get_model('verify', 'CheckOut')
+    seen = set()
+    duplicates = []
+    changed = []
+    for remark in Remark.objects.order_by('check_date', 'id').iterator():
+        remark.fingerprint = fingerprint(remark)
+        key = (remark.check_out_id, remark.fingerprint)
+        if key in seen:
+            duplicates.append(remark.pk)
+            continue
+        seen.add(key)
+        changed.append(remark)
+    Remark.objects.bulk_update(changed, ['fingerprint'], batch_size=500)
+    if duplicates:
+        Remark.objects.filter(pk__in=duplicates).delete()
+        remark_count = Remark.objects.filter(
+            check_out=models.OuterRef('pk')
+        ).order_by().values('check_out').annotate(
+            count=models.Count('pk')
+        ).values('count')
+        CheckOut.objects.update(
+            remark_count=Coalesce(models.Subquery(remark_count), 0)
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('verify', '0007_denormalized_counters'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='remark',
+            name='fingerprint',
+            field=models.CharField(default='', editable=False, max_length=64, verbose_name='Хеш содержимого замечания'),
+            preserve_default=False,
+        ),
+        migrations.RunPython(fill_fingerprints, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='remark',
+            constraint=models.UniqueConstraint(fields=('check_out', 'fingerprint'), name='verify_remark_unique_content'),
+        ),
+    ]
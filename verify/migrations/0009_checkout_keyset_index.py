@@ -0,0 +1,17 @@
+# Generated by Django 2.2 on 2026-10-18 10:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('verify', '0008_remark_fingerprint'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='checkout',
+            index=models.Index(fields=['status', 'check_date', 'id'], name='verify_check_status_date_idx'),
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 2.2 on 2026-10-18 10:06
+
+from django.db import migrations, models
+
+ACTIVE_INDEX = 'verify_check_active_idx'
+
+
+def create_active_index(apps, schema_editor):
+    """Частичный индекс очереди проверки создается только на PostgreSQL.
+
+    Django 2.2 на SQLite не может пересоздать таблицу с частичным
+    индексом, поэтому индекс не описан в модели.
+    """
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(
+        f'CREATE INDEX IF NOT EXISTS {ACTIVE_INDEX} '
+        'ON verify_checkout (check_date, id) WHERE NOT status'
+    )
+
+
+def drop_active_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(f'DROP INDEX IF EXISTS {ACTIVE_INDEX}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('verify', '0009_checkout_keyset_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='checkout',
+            index=models.Index(fields=['student', 'status', 'check_date', 'id'], name='verify_check_student_idx'),
+        ),
+        migrations.RunPython(create_active_index, drop_active_index),
+        migrations.AddIndex(
+            model_name='remark',
+            index=models.Index(fields=['check_out', 'check_date'], name='verify_remark_check_date_idx'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 2.2 on 2026-10-18 10:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('verify', '0010_composite_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='checkout',
+            name='pdf_sha256',
+            field=models.CharField(blank=True, editable=False, max_length=64, verbose_name='SHA-256 файла PDF'),
+        ),
+        migrations.AddField(
+            model_name='checkout',
+            name='preview_pages',
+            field=models.PositiveIntegerField(blank=True, editable=False, help_text='Пусто, пока превью не построено', null=True, verbose_name='Число страниц в превью PDF'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 2.2 on 2026-10-18 10:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('verify', '0012_checkout_pdf_preview'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='checkout',
+            name='docx_sha256',
+            field=models.CharField(blank=True, editable=False, max_length=64, verbose_name='SHA-256 файла DOCX'),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 2.2 on 2026-10-18 10:13
+
+from django.db import migrations, models
+import verify.models
+import verify.storage
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('verify', '0013_checkout_docx_sha256'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='checkout',
+            name='docx_file',
+            field=models.FileField(help_text='Укажите файл с расширением docx, размером не более 8 Мб', null=True, storage=verify.storage.ContentAddressedStorage(), upload_to='diplomas/%Y/%m/%d/', verbose_name='Дипломная работа (расширение docx)'),
+        ),
+        migrations.AlterField(
+            model_name='checkout',
+            name='docx_sha256',
+            field=verify.models.FileDigestField(blank=True, editable=False, max_length=64, source='docx_file', verbose_name='SHA-256 файла DOCX'),
+        ),
+        migrations.AlterField(
+            model_name='checkout',
+            name='pdf_file',
+            field=models.FileField(help_text='Укажите файл с расширением pdf, размером не более 8 Мб', null=True, storage=verify.storage.ContentAddressedStorage(), upload_to='diplomas/%Y/%m/%d/', verbose_name='Дипломная работа (расширение pdf)'),
+        ),
+        migrations.AlterField(
+            model_name='checkout',
+            name='pdf_sha256',
+            field=verify.models.FileDigestField(blank=True, editable=False, max_length=64, source='pdf_file', verbose_name='SHA-256 файла PDF'),
+        ),
+    ]
@@ -0,0 +1,68 @@
+from django.db import migrations
+
+REMARK_INDEX = 'verify_remark_fts'
+DOCUMENT_INDEX = 'verify_document_fts'
+DOCUMENT_TABLE = 'verify_document_search'
+SEARCH_CONFIG = 'russian'
+FTS5_TOKENIZER = 'unicode61 remove_diacritics 2'
+
+
+def create_indexes(apps, schema_editor):
+    """Создает полнотекстовые индексы для текущей СУБД.
+
+    В SQLite это таблицы FTS5, которые приложение обновляет вместе с
+    замечаниями и заявками. В PostgreSQL замечания индексируются
+    GIN-индексом по выражению to_tsvector, который СУБД обновляет
+    сама, а текст документов хранится в отдельной таблице tsvector.
+    """
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        schema_editor.execute(
+            f'CREATE VIRTUAL TABLE IF NOT EXISTS {REMARK_INDEX} '
+            f"USING fts5(text, tokenize='{FTS5_TOKENIZER}')"
+        )
+        schema_editor.execute(
+            f'CREATE VIRTUAL TABLE IF NOT EXISTS {DOCUMENT_INDEX} '
+            f"USING fts5(body, tokenize='{FTS5_TOKENIZER}')"
+        )
+        schema_editor.execute(
+            f'INSERT INTO {REMARK_INDEX} (rowid, text) '
+            'SELECT id, text FROM verify_remark'
+        )
+    elif vendor == 'postgresql':
+        schema_editor.execute(
+            'CREATE INDEX IF NOT EXISTS verify_remark_text_fts '
+            'ON verify_remark USING GIN '
+            f"(to_tsvector('{SEARCH_CONFIG}', text))"
+        )
+        schema_editor.execute(
+            f'CREATE TABLE IF NOT EXISTS {DOCUMENT_TABLE} ('
+            'check_id integer PRIMARY KEY REFERENCES verify_checkout (id) '
+            'ON DELETE CASCADE DEFERRABLE INITIALLY DEFERRED, '
+            'body tsvector NOT NULL)'
+        )
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS {DOCUMENT_TABLE}_body '
+            f'ON {DOCUMENT_TABLE} USING GIN (body)'
+        )
+
+
+def drop_indexes(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        schema_editor.execute(f'DROP TABLE IF EXISTS {REMARK_INDEX}')
+        schema_editor.execute(f'DROP TABLE IF EXISTS {DOCUMENT_INDEX}')
+    elif vendor == 'postgresql':
+        schema_editor.execute('DROP INDEX IF EXISTS verify_remark_text_fts')
+        schema_editor.execute(f'DROP TABLE IF EXISTS {DOCUMENT_TABLE}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('verify', '0015_upload_session'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_indexes, drop_indexes),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 2.2 on 2026-10-18 10:26
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0002_denormalized_counters'),
+        ('verify', '0016_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RemarkStat',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('error_type', models.CharField(max_length=50, verbose_name='Тип замечания')),
+                ('month', models.DateField(verbose_name='Месяц')),
+                ('count', models.IntegerField(default=0, verbose_name='Число замечаний')),
+                ('group', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='users.Group', verbose_name='Группа')),
+            ],
+            options={
+                'ordering': ['month', 'error_type'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='remarkstat',
+            index=models.Index(fields=['month', 'group'], name='verify_remarkstat_month_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='remarkstat',
+            constraint=models.UniqueConstraint(fields=('error_type', 'group', 'month'), name='verify_remarkstat_unique_cell'),
+        ),
+    ]
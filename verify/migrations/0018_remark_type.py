@@ -0,0 +1,142 @@
+import hashlib
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+# Каталог на момент миграции: (код, категория, текст, страница справки)
+REMARK_TYPES = (
+    (101, 'Общие ошибки', 'Неверно указана тема пояснительной записки.', 14),
+    (102, 'Общие ошибки', 'Неверно указан шифр пояснительной записки.', 14),
+    (103, 'Общие ошибки', 'Факультет, кафедра или профиль указаны неверно.', 1),
+    (104, 'Общие ошибки', 'Год написания пояснительной записки указан неверно.', 1),
+    (105, 'Общие ошибки', 'Неверно указан номер или дата приказа.', 45),
+    (106, 'Общие ошибки', 'Неверно указаны исходные данные пояснительной записки.', 10),
+    (107, 'Общие ошибки', 'Неверно указано число листов в штампе структурного элемента.', 14),
+    (108, 'Общие ошибки', 'Закладка не определена.', 1),
+    (201, 'Текст', 'Некорректное форматирование текста.', 10),
+    (202, 'Текст', 'Орфографическая ошибка.', 16),
+    (203, 'Текст', 'Межстрочный интервал задан неверно.', 14),
+    (204, 'Текст', 'Абзационный отступ задан неверно.', 14),
+    (301, 'Заголовки', 'Заголовок расположен неверно.', 15),
+    (302, 'Заголовки', 'В заголовке используется неверный размер шрифта.', 15),
+    (303, 'Заголовки', 'Заголовок не соответствует содержанию.', 15),
+    (401, 'Списки', 'Список оформлен неверно.', 9),
+    (501, 'Таблицы', 'Таблица расположена неверно.', 22),
+    (502, 'Таблицы', 'Название таблицы расположено неверно.', 22),
+    (503, 'Таблицы', 'Номер таблицы указан неверно.', 22),
+    (504, 'Таблицы', 'Отсутствует ссылка на таблицу по тексту.', 22),
+    (601, 'Рисунки', 'Рисунок расположен неверно.', 20),
+    (602, 'Рисунки', 'Подрисуночная надпись расположена неверно.', 20),
+    (603, 'Рисунки', 'Некорректный номер рисунка.', 20),
+    (604, 'Рисунки', 'Отсутствует ссылка на рисунок по тексту.', 20),
+    (701, 'Формулы', 'Формула расположена неверно.', 18),
+    (702, 'Формулы', 'Номер формулы расположен неверно.', 3),
+    (703, 'Формулы', 'Отсутствует ссылка на формулу по тексту.', 3),
+    (801, 'Рамки', 'Не выдержан интервал от текста до рамки.', 3),
+    (802, 'Рамки', 'Неверно указано число листов в основной рамке.', 3),
+    (901, 'Ссылки', 'Отсутствуют ссылки на использованные источники.', 3),
+    (902, 'Ссылки', 'Ссылки на источники оформлены неверно.', 3),
+)
+# Префиксы констант по кодам категорий: типы статистики до миграции
+# назывались по константам, например ERROR_LINK_2
+PREFIXES = {
+    1: 'ERROR_MAIN', 2: 'ERROR_TEXT', 3: 'ERROR_HEAD', 4: 'ERROR_LIST',
+    5: 'ERROR_TABLE', 6: 'ERROR_IMAGE', 7: 'ERROR_FORMULA', 8: 'ERROR_FRAME',
+    9: 'ERROR_LINK',
+}
+
+
+def fingerprint(remark):
+    parts = (
+        remark.check_out_id, remark.section, remark.page_number,
+        remark.paragraph, remark.text,
+    )
+    if remark.remark_type_id is not None:
+        parts += (remark.remark_type_id,)
+    content = '\x1f'.join('' if part is None else str(part) for part in parts)
+    return hashlib.sha256(content.encode()).hexdigest()
+
+
+def old_error_type(code):
+    return f'{PREFIXES[code // 100]}_{code % 100}'
+
+
+def convert_remarks(remarks, **fields):
+    changed = []
+    for remark in remarks.iterator():
+        for name, value in fields.items():
+            setattr(remark, name, value(remark))
+        remark.fingerprint = fingerprint(remark)
+        changed.append(remark)
+    remarks.model.objects.bulk_update(
+        changed, list(fields) + ['fingerprint'], batch_size=500
+    )
+
+
+def forwards(apps, schema_editor):
+    """Заполняет каталог и переводит на него стандартные замечания."""
+    RemarkType = apps.get_model('verify', 'RemarkType')
+    Remark = apps.get_model('verify', 'Remark')
+    RemarkStat = apps.get_model('verify', 'RemarkStat')
+    RemarkType.objects.bulk_create(
+        RemarkType(code=code, category=category, text=text, help_page=page)
+        for code, category, text, page in REMARK_TYPES
+    )
+    for code, _, text, _ in REMARK_TYPES:
+        convert_remarks(
+            Remark.objects.filter(text=text, remark_type__isnull=True),
+            remark_type_id=lambda remark, code=code: code,
+            text=lambda remark: '',
+        )
+        RemarkStat.objects.filter(error_type=old_error_type(code)).update(
+            error_type=str(code)
+        )
+
+
+def backwards(apps, schema_editor):
+    RemarkType = apps.get_model('verify', 'RemarkType')
+    Remark = apps.get_model('verify', 'Remark')
+    RemarkStat = apps.get_model('verify', 'RemarkStat')
+    for remark_type in RemarkType.objects.all():
+        convert_remarks(
+            Remark.objects.filter(remark_type=remark_type),
+            remark_type_id=lambda remark: None,
+            text=lambda remark, text=remark_type.text: text,
+        )
+        RemarkStat.objects.filter(error_type=str(remark_type.code)).update(
+            error_type=old_error_type(remark_type.code)
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('verify', '0017_remark_stats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RemarkType',
+            fields=[
+                ('code', models.PositiveSmallIntegerField(primary_key=True, serialize=False, verbose_name='Код замечания')),
+                ('category', models.CharField(max_length=100, verbose_name='Категория')),
+                ('text', models.CharField(max_length=300, verbose_name='Текст замечания')),
+                ('help_page', models.PositiveSmallIntegerField(blank=True, help_text='Страница методических указаний с описанием ошибки', null=True, verbose_name='Страница справки')),
+                ('is_active', models.BooleanField(default=True, verbose_name='Показывать в форме')),
+            ],
+            options={
+                'ordering': ['code'],
+            },
+        ),
+        migrations.AlterField(
+            model_name='remark',
+            name='text',
+            field=models.TextField(blank=True, help_text='Введите текст замечания, если его нет в каталоге', max_length=300, verbose_name='Текст замечания'),
+        ),
+        migrations.AddField(
+            model_name='remark',
+            name='remark_type',
+            field=models.ForeignKey(blank=True, help_text='Выберите замечание из каталога', null=True, on_delete=django.db.models.deletion.PROTECT, related_name='remarks', to='verify.RemarkType', verbose_name='Стандартное замечание'),
+        ),
+        migrations.RunPython(forwards, backwards),
+    ]
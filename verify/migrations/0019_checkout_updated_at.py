@@ -0,0 +1,22 @@
+# Generated by Django 2.2 on 2026-10-18 10:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('verify', '0018_remark_type'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='checkout',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, help_text='Обновляется и при изменении замечаний', verbose_name='Время изменения'),
+        ),
+        migrations.AddIndex(
+            model_name='checkout',
+            index=models.Index(fields=['status', 'updated_at'], name='verify_check_updated_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 2.2 on 2026-10-18 10:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('verify', '0019_checkout_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='checkout',
+            name='cold_manifest',
+            field=models.CharField(blank=True, editable=False, help_text='Заполняется при отправке заявки в архив', max_length=200, verbose_name='Опись файлов в холодном архиве'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 2.2 on 2026-10-18 10:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('verify', '0020_checkout_cold_manifest'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='remark',
+            name='insert_batch',
+            field=models.UUIDField(blank=True, editable=False, null=True, verbose_name='Пакет массовой вставки'),
+        ),
+    ]
@@ -0,0 +1,32 @@
+from django.db import migrations
+
+# Стандартное замечание о размере и ориентации листа. Прежде проверка
+# параметров страницы сообщала о них замечанием 201 о форматировании
+# текста; уже созданные замечания не меняются
+PAGE_FORMAT = (109, 'Общие ошибки', 'Размер или ориентация листа заданы неверно.')
+
+
+def forwards(apps, schema_editor):
+    RemarkType = apps.get_model('verify', 'RemarkType')
+    code, category, text = PAGE_FORMAT
+    RemarkType.objects.get_or_create(
+        code=code, defaults={'category': category, 'text': text}
+    )
+
+
+def backwards(apps, schema_editor):
+    RemarkType = apps.get_model('verify', 'RemarkType')
+    RemarkType.objects.filter(
+        code=PAGE_FORMAT[0], remarks__isnull=True
+    ).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('verify', '0021_remark_insert_batch'),
+    ]
+
+    operations = [
+        migrations.RunPython(forwards, backwards),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 2.2 on 2026-10-18 11:15
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('verify', '0022_page_format_remark_type'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='remark',
+            name='insert_batch',
+        ),
+    ]
@@ -1,8 +1,171 @@
+import hashlib
+import uuid
+
 from django.contrib.auth import get_user_model
-from django.db import models
+from django.db import IntegrityError, connection, models, transaction
+from django.db.models.functions import Coalesce
+from django.dispatch import Signal
+from django.utils import timezone
+
+from users.models import Group
+
+from . import caching, constants as cts
+from .storage import blob_digest, blob_storage
 
 User = get_user_model()
 
+# Замечания заявок check_ids добавлены массовой вставкой. bulk_create не
+# отправляет post_save, а на SQLite не возвращает первичные ключи, поэтому
+# поисковый индекс и статистика обновляются отдельной задачей (см. signals)
+remarks_inserted = Signal(providing_args=['check_ids'])
+
+
+class FileDigestField(models.CharField):
+    """SHA-256 файла из поля source.
+
+    Заполняется при сохранении модели по имени блоба: поле объявлено
+    после файловых полей, и к этому моменту файл уже записан.
+    """
+    def __init__(self, *args, source=None, **kwargs):
+        self.source = source
+        kwargs.setdefault('max_length', 64)
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        kwargs['source'] = self.source
+        return name, path, args, kwargs
+
+    def pre_save(self, model_instance, add):
+        digest = blob_digest(getattr(model_instance, self.source).name)
+        if digest:
+            setattr(model_instance, self.attname, digest)
+        return super().pre_save(model_instance, add)
+
+
+def refresh_active_checks(student_ids):
+    """Переустанавливает указатели на активные заявки студентов."""
+    latest_active = CheckOut.objects.filter(
+        student=models.OuterRef('pk'),
+        status=False,
+    ).order_by('-check_date', '-id').values('pk')[:1]
+    User.objects.filter(pk__in=student_ids).update(
+        active_check=models.Subquery(latest_active)
+    )
+
+
+def with_last_check(students):
+    """Добавляет студентам поля последней заявки.
+
+    last_check_id, last_check_status, last_check_date и
+    last_check_remarks вычисляются подзапросами в том же запросе, что и
+    список студентов; у студента без заявок они равны None.
+    """
+    last_check = CheckOut.objects.filter(
+        student=models.OuterRef('pk'),
+    ).order_by('-check_date', '-id')
+    fields = {
+        'last_check_id': 'pk',
+        'last_check_status': 'status',
+        'last_check_date': 'check_date',
+        'last_check_remarks': 'remark_count',
+    }
+    return students.annotate(**{
+        name: models.Subquery(last_check.values(field)[:1])
+        for name, field in fields.items()
+    })
+
+
+def with_group_progress(groups):
+    """Добавляет группам показатели проверки работ одним запросом.
+
+    student_count, active_checks, archived_checks, outstanding_remarks
+    (замечания к заявкам на проверке) и oldest_waiting (дата самой
+    старой заявки на проверке). Соединение доходит только до заявок,
+    а замечания берутся из денормализованного remark_count, поэтому
+    строки не размножаются и суммы не искажаются.
+    """
+    checks = 'user__checkout_student'
+    active = models.Q(**{f'{checks}__status': False})
+    archived = models.Q(**{f'{checks}__status': True})
+    return groups.annotate(
+        student_count=models.Count('user', distinct=True),
+        active_checks=models.Count(checks, filter=active),
+        archived_checks=models.Count(checks, filter=archived),
+        outstanding_remarks=Coalesce(
+            models.Sum(f'{checks}__remark_count', filter=active), 0
+        ),
+        oldest_waiting=models.Min(f'{checks}__check_date', filter=active),
+    )
+
+
+class CheckOutQuerySet(models.QuerySet):
+    """Набор заявок, поддерживающий денормализованные данные.
+
+    Массовые операции обходят сигналы моделей и auto_now, поэтому время
+    изменения, счетчик активных заявок, указатели на активные заявки
+    студентов и версия заявок в кэше (см. caching) корректируются здесь.
+    """
+    def update(self, **kwargs):
+        kwargs.setdefault('updated_at', timezone.now())
+        if 'status' not in kwargs:
+            return super().update(**kwargs)
+        with transaction.atomic(using=self.db):
+            student_ids = set(self.values_list('student_id', flat=True))
+            rows = super().update(**kwargs)
+            refresh_active_checks(student_ids)
+            Counter.reset(Counter.ACTIVE_CHECKS)
+            caching.bump_versions(caching.CHECKS)
+        return rows
+
+    def set_status(self, status):
+        """Меняет статус заявок, у которых он отличается от status.
+
+        Прежний статус проверяется в самом UPDATE, поэтому одновременные
+        запросы не изменят счетчик активных заявок дважды. Возвращает
+        число заявок, статус которых изменился.
+        """
+        with transaction.atomic(using=self.db):
+            changing = self.exclude(status=status)
+            student_ids = set(changing.values_list('student_id', flat=True))
+            rows = super(CheckOutQuerySet, changing).update(
+                status=status, updated_at=timezone.now()
+            )
+            if rows:
+                Counter.add(
+                    Counter.ACTIVE_CHECKS, -rows if status else rows
+                )
+                refresh_active_checks(student_ids)
+                caching.bump_versions(caching.CHECKS)
+        return rows
+
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = list(objs)
+        unnumbered = [obj for obj in objs if not obj.submission_number]
+        if unnumbered:
+            last_numbers = dict(
+                self.filter(
+                    student_id__in={obj.student_id for obj in unnumbered}
+                ).order_by().values('student_id').annotate(
+                    last=models.Max('submission_number')
+                ).values_list('student_id', 'last')
+            )
+            for obj in unnumbered:
+                number = last_numbers.get(obj.student_id, 0) + 1
+                last_numbers[obj.student_id] = number
+                obj.submission_number = number
+        objs = super().bulk_create(objs, *args, **kwargs)
+        active = [obj for obj in objs if obj.status is False]
+        if active:
+            if kwargs.get('ignore_conflicts'):
+                # Неизвестно, какие заявки вставлены на самом деле
+                Counter.reset(Counter.ACTIVE_CHECKS)
+            else:
+                Counter.add(Counter.ACTIVE_CHECKS, len(active))
+            refresh_active_checks({obj.student_id for obj in active})
+        caching.bump_versions(caching.CHECKS)
+        return objs
+
 
 class CheckOut(models.Model):
     student = models.ForeignKey(
@@ -35,20 +198,216 @@ class CheckOut(models.Model):
         verbose_name='Дипломная работа (расширение docx)',
         help_text='Укажите файл с расширением docx, размером не более 8 Мб',
         upload_to='diplomas/%Y/%m/%d/',
+        storage=blob_storage,
         null=True,
     )
     pdf_file = models.FileField(
         verbose_name='Дипломная работа (расширение pdf)',
         help_text='Укажите файл с расширением pdf, размером не более 8 Мб',
         upload_to='diplomas/%Y/%m/%d/',
+        storage=blob_storage,
+        null=True,
+    )
+    docx_sha256 = FileDigestField(
+        verbose_name='SHA-256 файла DOCX',
+        source='docx_file',
+        max_length=64,
+        blank=True,
+        editable=False,
+    )
+    pdf_sha256 = FileDigestField(
+        verbose_name='SHA-256 файла PDF',
+        source='pdf_file',
+        max_length=64,
+        blank=True,
+        editable=False,
+    )
+    preview_pages = models.PositiveIntegerField(
+        verbose_name='Число страниц в превью PDF',
+        help_text='Пусто, пока превью не построено',
         null=True,
+        blank=True,
+        editable=False,
+    )
+    remark_count = models.PositiveIntegerField(
+        verbose_name='Число замечаний',
+        help_text='Заполняется автоматически',
+        default=0,
+        editable=False,
+    )
+    submission_number = models.PositiveIntegerField(
+        verbose_name='Номер попытки сдачи работы',
+        help_text='Заполняется автоматически',
+        default=0,
+        editable=False,
+    )
+    cold_manifest = models.CharField(
+        verbose_name='Опись файлов в холодном архиве',
+        help_text='Заполняется при отправке заявки в архив',
+        max_length=200,
+        blank=True,
+        editable=False,
     )
+    updated_at = models.DateTimeField(
+        verbose_name='Время изменения',
+        help_text='Обновляется и при изменении замечаний',
+        auto_now=True,
+    )
+
+    objects = CheckOutQuerySet.as_manager()
 
     def __str__(self):
         return f'check_{self.id}'
 
+    def save(self, *args, **kwargs):
+        if not self._state.adding or self.submission_number:
+            return super().save(*args, **kwargs)
+        # Блокируем строку студента, чтобы параллельные заявки одного
+        # студента не получили одинаковый номер.
+        with transaction.atomic():
+            list(User.objects.select_for_update().filter(
+                pk=self.student_id
+            ).values_list('pk'))
+            last_number = CheckOut.objects.filter(
+                student_id=self.student_id
+            ).aggregate(
+                last=models.Max('submission_number')
+            )['last'] or 0
+            self.submission_number = last_number + 1
+            return super().save(*args, **kwargs)
+
     class Meta:
         ordering = ['check_date']
+        indexes = [
+            # Постраничный вывод списков заявок по позиции (check_date, id)
+            models.Index(
+                fields=['status', 'check_date', 'id'],
+                name='verify_check_status_date_idx',
+            ),
+            # Заявки студента: активная заявка, архив студента
+            models.Index(
+                fields=['student', 'status', 'check_date', 'id'],
+                name='verify_check_student_idx',
+            ),
+            # Время последнего изменения списка для ETag
+            models.Index(
+                fields=['status', 'updated_at'],
+                name='verify_check_updated_idx',
+            ),
+        ]
+
+
+def remark_fingerprint(check_out_id, section, page_number, paragraph, text,
+                       remark_type_id=None):
+    """Возвращает хеш содержимого замечания для проверки уникальности."""
+    parts = (check_out_id, section, page_number, paragraph, text)
+    if remark_type_id is not None:
+        parts += (remark_type_id,)
+    content = '\x1f'.join('' if part is None else str(part) for part in parts)
+    return hashlib.sha256(content.encode()).hexdigest()
+
+
+def standard_remarks():
+    """Стандартные замечания из constants.py.
+
+    Возвращает кортежи (код, категория, текст) в порядке кодов.
+    """
+    for category, title, prefix in cts.REMARK_CATEGORIES:
+        number = 1
+        while hasattr(cts, f'{prefix}_{number}'):
+            text = getattr(cts, f'{prefix}_{number}')
+            yield category * 100 + number, title, text
+            number += 1
+
+
+# Текст стандартного замечания -> код в каталоге RemarkType
+STANDARD_REMARK_CODES = {text: code for code, _, text in standard_remarks()}
+# Тип замечания в статистике - код из каталога, для свободного текста CUSTOM
+CUSTOM_ERROR = 'CUSTOM'
+
+
+def remark_error_type(remark_type_id):
+    """Тип замечания для статистики."""
+    if remark_type_id is None:
+        return CUSTOM_ERROR
+    return str(remark_type_id)
+
+
+def remark_content(text):
+    """Поля замечания с текстом: ссылка на каталог или свободный текст."""
+    code = STANDARD_REMARK_CODES.get(text)
+    if code is None:
+        return {'text': text}
+    return {'remark_type_id': code, 'text': ''}
+
+
+def month_of(moment):
+    """Первый день месяца, к которому относится момент времени."""
+    return timezone.localtime(moment).date().replace(day=1)
+
+
+class RemarkQuerySet(models.QuerySet):
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = list(objs)
+        for obj in objs:
+            obj.fingerprint = obj.get_fingerprint()
+        check_ids = {obj.check_out_id for obj in objs}
+        objs = super().bulk_create(objs, *args, **kwargs)
+        sync_remark_counts(check_ids)
+        caching.bump_versions(caching.REMARKS)
+        remarks_inserted.send(sender=Remark, check_ids=check_ids)
+        return objs
+
+
+def sync_remark_counts(check_ids):
+    """Пересчитывает число замечаний заявок одним запросом UPDATE."""
+    if not check_ids:
+        return
+    remark_count = Remark.objects.filter(
+        check_out=models.OuterRef('pk')
+    ).order_by().values('check_out').annotate(
+        count=models.Count('pk')
+    ).values('count')
+    CheckOut.objects.filter(pk__in=check_ids).update(
+        remark_count=Coalesce(models.Subquery(remark_count), 0)
+    )
+
+
+class RemarkType(models.Model):
+    """Стандартное замечание из каталога.
+
+    Каталог заполняется миграцией из constants.py. Код - постоянный
+    идентификатор: на него ссылаются замечания и статистика, поэтому
+    устаревшее замечание не удаляется, а снимается с показа.
+    """
+    code = models.PositiveSmallIntegerField(
+        verbose_name='Код замечания',
+        primary_key=True,
+    )
+    category = models.CharField(
+        verbose_name='Категория',
+        max_length=100,
+    )
+    text = models.CharField(
+        verbose_name='Текст замечания',
+        max_length=300,
+    )
+    help_page = models.PositiveSmallIntegerField(
+        verbose_name='Страница справки',
+        help_text='Страница методических указаний с описанием ошибки',
+        null=True,
+        blank=True,
+    )
+    is_active = models.BooleanField(
+        verbose_name='Показывать в форме',
+        default=True,
+    )
+
+    def __str__(self):
+        return self.text
+
+    class Meta:
+        ordering = ['code']
 
 
 class Remark(models.Model):
@@ -78,17 +437,29 @@ class Remark(models.Model):
         null=True,
         blank=True,
     )
+    remark_type = models.ForeignKey(
+        RemarkType,
+        verbose_name='Стандартное замечание',
+        help_text='Выберите замечание из каталога',
+        on_delete=models.PROTECT,
+        related_name='remarks',
+        null=True,
+        blank=True,
+    )
     text = models.TextField(
         verbose_name='Текст замечания',
-        help_text='Введите текст замечания',
+        help_text='Введите текст замечания, если его нет в каталоге',
         max_length=300,
+        blank=True,
     )
     author = models.ForeignKey(
         User,
         verbose_name='Автор замечания',
         help_text='Укажите автора замечания',
         on_delete=models.CASCADE,
-        related_name='remark'
+        related_name='remark',
+        null=True,
+        blank=True,
     )
     check_out = models.ForeignKey(
         CheckOut,
@@ -101,9 +472,411 @@ class Remark(models.Model):
         auto_now_add=True,
         db_index=True,
     )
+    fingerprint = models.CharField(
+        verbose_name='Хеш содержимого замечания',
+        max_length=64,
+        editable=False,
+    )
+
+    objects = RemarkQuerySet.as_manager()
 
     def __str__(self):
         return f'remark_{self.id}'
 
+    @property
+    def message(self):
+        """Текст замечания: из каталога или свободный."""
+        if self.remark_type_id is not None:
+            return self.remark_type.text
+        return self.text
+
+    def get_fingerprint(self):
+        return remark_fingerprint(
+            self.check_out_id, self.section, self.page_number,
+            self.paragraph, self.text, self.remark_type_id,
+        )
+
+    def save(self, *args, **kwargs):
+        self.fingerprint = self.get_fingerprint()
+        super().save(*args, **kwargs)
+
     class Meta:
         ordering = ['check_date']
+        indexes = [
+            models.Index(
+                fields=['check_out', 'check_date'],
+                name='verify_remark_check_date_idx',
+            ),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['check_out', 'fingerprint'],
+                name='verify_remark_unique_content',
+            ),
+        ]
+
+
+# СУБД, поддерживающие INSERT ... ON CONFLICT DO UPDATE
+UPSERT_VENDORS = ('sqlite', 'postgresql')
+UPSERT_BATCH_SIZE = 200
+
+
+class RemarkStat(models.Model):
+    """Число замечаний одного типа в группе за месяц.
+
+    Сводная таблица для статистики: обновляется вместе с замечаниями,
+    после массовой вставки - задачей sync_check_remarks, и
+    пересчитывается командой rebuild_remark_stats, поэтому отчеты не
+    обращаются к таблицам замечаний и заявок.
+    """
+    error_type = models.CharField(
+        verbose_name='Тип замечания',
+        max_length=50,
+    )
+    group = models.ForeignKey(
+        Group,
+        verbose_name='Группа',
+        on_delete=models.CASCADE,
+        related_name='+',
+        null=True,
+        blank=True,
+    )
+    month = models.DateField(
+        verbose_name='Месяц',
+    )
+    count = models.IntegerField(
+        verbose_name='Число замечаний',
+        default=0,
+    )
+
+    def __str__(self):
+        return f'{self.error_type}_{self.group_id}_{self.month:%Y-%m}'
+
+    @classmethod
+    def add(cls, changes):
+        """Атомарно изменяет ячейки статистики в текущей транзакции.
+
+        changes - пары ((тип замечания, id группы, месяц), изменение).
+        Изменения одной ячейки складываются до обращения к БД, а
+        прибавления записываются одним запросом (см. upsert).
+        """
+        tally = {}
+        for key, delta in changes:
+            tally[key] = tally.get(key, 0) + delta
+        cells = [(key, delta) for key, delta in tally.items() if delta]
+        if connection.vendor in UPSERT_VENDORS:
+            # NULL не равен NULL, поэтому ячейки без группы не попадают
+            # под ограничение уникальности и обновляются по одной
+            cls.upsert([
+                (key, delta) for key, delta in cells
+                if delta > 0 and key[1] is not None
+            ])
+            cells = [
+                (key, delta) for key, delta in cells
+                if delta < 0 or key[1] is None
+            ]
+        for (error_type, group_id, month), delta in cells:
+            cell = cls.objects.filter(
+                error_type=error_type, group_id=group_id, month=month
+            )
+            # Ячейки без замечаний не создаются: уменьшение несуществующей
+            # ячейки исправит пересчет статистики
+            if cell.update(count=models.F('count') + delta) or delta < 0:
+                continue
+            try:
+                with transaction.atomic():
+                    cls.objects.create(
+                        error_type=error_type, group_id=group_id,
+                        month=month, count=delta,
+                    )
+            except IntegrityError:
+                # Ячейку успел создать параллельный запрос
+                cell.update(count=models.F('count') + delta)
+
+    @classmethod
+    def upsert(cls, cells):
+        """Прибавляет изменения к ячейкам запросом INSERT ... ON CONFLICT.
+
+        Отсутствующие ячейки создаются, существующие увеличиваются в той
+        же инструкции, поэтому параллельные запросы не мешают друг другу.
+        """
+        quote = connection.ops.quote_name
+        table = quote(cls._meta.db_table)
+        count = quote('count')
+        for start in range(0, len(cells), UPSERT_BATCH_SIZE):
+            batch = cells[start:start + UPSERT_BATCH_SIZE]
+            params = []
+            for (error_type, group_id, month), delta in batch:
+                params += [
+                    error_type, group_id,
+                    connection.ops.adapt_datefield_value(month), delta,
+                ]
+            values = ', '.join(['(%s, %s, %s, %s)'] * len(batch))
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f'INSERT INTO {table} (error_type, group_id, month, '
+                    f'{count}) VALUES {values} '
+                    'ON CONFLICT (error_type, group_id, month) '
+                    f'DO UPDATE SET {count} = {table}.{count} + '
+                    f'EXCLUDED.{count}',
+                    params,
+                )
+
+    class Meta:
+        ordering = ['month', 'error_type']
+        indexes = [
+            models.Index(fields=['month', 'group'],
+                         name='verify_remarkstat_month_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['error_type', 'group', 'month'],
+                name='verify_remarkstat_unique_cell',
+            ),
+        ]
+
+
+class Counter(models.Model):
+    """Денормализованные счетчики, по одной строке на счетчик."""
+    ACTIVE_CHECKS = 'active_checks'
+
+    name = models.CharField(
+        verbose_name='Имя счетчика',
+        max_length=50,
+        unique=True,
+    )
+    value = models.IntegerField(
+        verbose_name='Значение счетчика',
+        default=0,
+    )
+
+    def __str__(self):
+        return self.name
+
+    @classmethod
+    def add(cls, name, delta):
+        """Атомарно изменяет счетчик в текущей транзакции.
+
+        Если строки счетчика еще нет, он будет пересчитан при чтении.
+        """
+        cls.objects.filter(name=name).update(value=models.F('value') + delta)
+
+    @classmethod
+    def reset(cls, name):
+        """Сбрасывает счетчик, чтобы он был пересчитан при чтении."""
+        cls.objects.filter(name=name).delete()
+
+    @classmethod
+    def get_value(cls, name, source):
+        """Возвращает значение счетчика.
+
+        Отсутствующий счетчик пересчитывается по набору записей source.
+        """
+        value = cls.objects.filter(name=name).values_list(
+            'value', flat=True
+        ).first()
+        if value is None:
+            counter, _ = cls.objects.get_or_create(
+                name=name,
+                defaults={'value': source.count()},
+            )
+            value = counter.value
+        return value
+
+
+class Job(models.Model):
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUS_CHOICES = (
+        (PENDING, 'Ожидает выполнения'),
+        (RUNNING, 'Выполняется'),
+        (DONE, 'Выполнена'),
+        (FAILED, 'Завершилась с ошибкой'),
+    )
+    name = models.CharField(
+        verbose_name='Имя задачи',
+        max_length=100,
+    )
+    payload = models.TextField(
+        verbose_name='Параметры задачи (JSON)',
+        default='{}',
+    )
+    status = models.CharField(
+        verbose_name='Статус задачи',
+        max_length=10,
+        choices=STATUS_CHOICES,
+        default=PENDING,
+    )
+    attempts = models.PositiveSmallIntegerField(
+        verbose_name='Число попыток',
+        default=0,
+    )
+    max_attempts = models.PositiveSmallIntegerField(
+        verbose_name='Максимальное число попыток',
+        default=5,
+    )
+    run_after = models.DateTimeField(
+        verbose_name='Не выполнять раньше',
+        default=timezone.now,
+    )
+    locked_until = models.DateTimeField(
+        verbose_name='Задача захвачена до',
+        null=True,
+        blank=True,
+    )
+    locked_by = models.CharField(
+        verbose_name='Обработчик',
+        max_length=100,
+        blank=True,
+    )
+    last_error = models.TextField(
+        verbose_name='Последняя ошибка',
+        blank=True,
+    )
+    created = models.DateTimeField(
+        verbose_name='Дата постановки в очередь',
+        auto_now_add=True,
+    )
+
+    def __str__(self):
+        return f'job_{self.id}_{self.name}'
+
+    class Meta:
+        ordering = ['run_after', 'id']
+        indexes = [
+            models.Index(fields=['status', 'run_after'],
+                         name='verify_job_status_idx'),
+        ]
+
+
+class OutgoingEmail(models.Model):
+    PENDING = 'pending'
+    SENDING = 'sending'
+    SENT = 'sent'
+    FAILED = 'failed'
+    STATUS_CHOICES = (
+        (PENDING, 'Ожидает отправки'),
+        (SENDING, 'Отправляется'),
+        (SENT, 'Отправлено'),
+        (FAILED, 'Не удалось отправить'),
+    )
+    subject = models.CharField(
+        verbose_name='Тема письма',
+        max_length=255,
+    )
+    body = models.TextField(
+        verbose_name='Текст письма',
+    )
+    from_email = models.CharField(
+        verbose_name='Отправитель',
+        max_length=255,
+    )
+    recipient = models.EmailField(
+        verbose_name='Получатель',
+    )
+    status = models.CharField(
+        verbose_name='Статус письма',
+        max_length=10,
+        choices=STATUS_CHOICES,
+        default=PENDING,
+    )
+    attempts = models.PositiveSmallIntegerField(
+        verbose_name='Число попыток отправки',
+        default=0,
+    )
+    next_attempt = models.DateTimeField(
+        verbose_name='Следующая попытка отправки',
+        default=timezone.now,
+    )
+    locked_until = models.DateTimeField(
+        verbose_name='Письмо захвачено до',
+        null=True,
+        blank=True,
+    )
+    claim = models.CharField(
+        verbose_name='Метка отправляющего процесса',
+        max_length=32,
+        blank=True,
+    )
+    last_error = models.TextField(
+        verbose_name='Последняя ошибка',
+        blank=True,
+    )
+    created = models.DateTimeField(
+        verbose_name='Дата создания',
+        auto_now_add=True,
+    )
+    sent_at = models.DateTimeField(
+        verbose_name='Дата отправки',
+        null=True,
+        blank=True,
+    )
+
+    def __str__(self):
+        return f'email_{self.id}'
+
+    class Meta:
+        ordering = ['next_attempt', 'id']
+        indexes = [
+            models.Index(fields=['status', 'next_attempt'],
+                         name='verify_email_status_idx'),
+        ]
+
+
+class UploadSession(models.Model):
+    """Докачиваемая загрузка одного файла работы.
+
+    Файл принимается частями и дописывается во временный файл в
+    хранилище блобов; received - число уже записанных байт, с которого
+    клиент продолжает загрузку после обрыва.
+    """
+    id = models.UUIDField(
+        primary_key=True,
+        default=uuid.uuid4,
+        editable=False,
+    )
+    student = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='upload_sessions',
+        verbose_name='Студент',
+    )
+    file_name = models.CharField(
+        verbose_name='Имя файла',
+        max_length=255,
+    )
+    size = models.PositiveIntegerField(
+        verbose_name='Размер файла, байт',
+    )
+    sha256 = models.CharField(
+        verbose_name='Заявленный SHA-256 файла',
+        max_length=64,
+    )
+    received = models.PositiveIntegerField(
+        verbose_name='Получено байт',
+        default=0,
+    )
+    created = models.DateTimeField(
+        verbose_name='Дата начала загрузки',
+        auto_now_add=True,
+    )
+    updated = models.DateTimeField(
+        verbose_name='Дата получения последней части',
+        auto_now=True,
+    )
+
+    def __str__(self):
+        return f'upload_{self.id}'
+
+    @property
+    def complete(self):
+        return self.received == self.size
+
+    class Meta:
+        ordering = ['created']
+        indexes = [
+            models.Index(fields=['updated'],
+                         name='verify_upload_updated_idx'),
+        ]
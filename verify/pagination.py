@@ -0,0 +1,147 @@
+from collections.abc import Sequence
+
+from django.core import signing
+from django.core.paginator import Paginator
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+
+PER_PAGE = 10
+# Число первых страниц, доступных по номеру
+NUMBERED_PAGES = 5
+CURSOR_SALT = 'verify.pagination'
+ORDERING = ('check_date', 'id')
+API_CURSOR_SALT = 'verify.api'
+
+
+def make_cursor(item, direction):
+    """Возвращает непрозрачный токен позиции в списке заявок."""
+    return signing.dumps(
+        [direction, item.check_date.isoformat(), item.id], salt=CURSOR_SALT
+    )
+
+
+def read_cursor(token):
+    """Разбирает токен позиции. Для поддельного токена возвращает None."""
+    try:
+        direction, check_date, item_id = signing.loads(
+            token, salt=CURSOR_SALT
+        )
+    except (signing.BadSignature, TypeError, ValueError):
+        return None
+    check_date = parse_datetime(check_date)
+    if direction not in ('next', 'prev') or check_date is None:
+        return None
+    return direction, check_date, item_id
+
+
+class CursorPage(Sequence):
+    """Страница списка, выбранная по позиции (check_date, id).
+
+    Повторяет часть интерфейса django.core.paginator.Page, которой
+    пользуются шаблоны, но не знает ни номера страницы, ни общего
+    числа записей.
+    """
+    paginator = None
+    number = None
+
+    def __init__(self, object_list, next_cursor=None, previous_cursor=None):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+def seek(queryset, direction, check_date, item_id, per_page):
+    """Выбирает страницу после или до позиции без OFFSET и COUNT(*)."""
+    if direction == 'next':
+        queryset = queryset.filter(
+            Q(check_date__gt=check_date)
+            | Q(check_date=check_date, id__gt=item_id)
+        ).order_by(*ORDERING)
+    else:
+        queryset = queryset.filter(
+            Q(check_date__lt=check_date)
+            | Q(check_date=check_date, id__lt=item_id)
+        ).order_by('-check_date', '-id')
+    items = list(queryset[:per_page + 1])
+    has_more = len(items) > per_page
+    items = items[:per_page]
+    if direction == 'prev':
+        items.reverse()
+    if not items:
+        return CursorPage(items)
+    more_after = has_more if direction == 'next' else True
+    more_before = has_more if direction == 'prev' else True
+    return CursorPage(
+        items,
+        next_cursor=make_cursor(items[-1], 'next') if more_after else None,
+        previous_cursor=(
+            make_cursor(items[0], 'prev') if more_before else None
+        ),
+    )
+
+
+def paginate(request, queryset, per_page=PER_PAGE):
+    """Возвращает страницу списка заявок для запроса.
+
+    Первые NUMBERED_PAGES страниц доступны по параметру ?page= через
+    обычный Paginator, но он работает с ограниченной выборкой, поэтому
+    подсчет и смещение не зависят от размера таблицы. Дальше список
+    листается по параметру ?cursor= с условием на (check_date, id), и
+    любая страница архива стоит столько же, сколько первая.
+    """
+    queryset = queryset.order_by(*ORDERING)
+    cursor = read_cursor(request.GET.get('cursor', ''))
+    if cursor is not None:
+        return seek(queryset, *cursor, per_page)
+    limit = per_page * NUMBERED_PAGES
+    head = list(queryset[:limit + 1])
+    page = Paginator(head[:limit], per_page).get_page(request.GET.get('page'))
+    page.next_cursor = None
+    page.previous_cursor = None
+    if len(head) > limit and not page.has_next():
+        page.next_cursor = make_cursor(page.object_list[-1], 'next')
+    return page
+
+
+def make_id_cursor(item_id):
+    """Токен позиции в выдаче API: id последней отданной записи."""
+    return signing.dumps(item_id, salt=API_CURSOR_SALT)
+
+
+def read_id_cursor(token):
+    """Разбирает токен позиции API. Для поддельного токена возвращает None."""
+    try:
+        item_id = signing.loads(token, salt=API_CURSOR_SALT)
+    except signing.BadSignature:
+        return None
+    return item_id if isinstance(item_id, int) else None
+
+
+def seek_after(queryset, item_id, limit):
+    """Возвращает до limit записей с id больше item_id и токен продолжения.
+
+    Порядок по первичному ключу устойчив к добавлению записей между
+    запросами: новые записи оказываются в конце выдачи.
+    """
+    if item_id is not None:
+        queryset = queryset.filter(pk__gt=item_id)
+    items = list(queryset.order_by('pk')[:limit + 1])
+    if len(items) <= limit:
+        return items, None
+    items = items[:limit]
+    return items, make_id_cursor(items[-1].pk)
@@ -0,0 +1,145 @@
+import json
+import logging
+import os
+import subprocess
+import tempfile
+
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import default_storage
+from PIL import Image
+
+from . import jobs
+from .models import CheckOut, Job
+from .storage import file_sha256
+
+logger = logging.getLogger(__name__)
+
+PREVIEW_DIR = 'previews'
+# Разрешение полноразмерных страниц, точек на дюйм
+PREVIEW_DPI = 110
+PREVIEW_THUMB_WIDTH = 200
+PDFTOPPM_BINARY = 'pdftoppm'
+PDFTOPPM_TIMEOUT = 300
+
+
+class PreviewError(Exception):
+    """Не удалось построить превью PDF."""
+
+
+def page_path(digest, page_number, thumb=False):
+    """Путь к изображению страницы в хранилище.
+
+    Изображения лежат в каталоге, названном по хешу PDF, поэтому
+    содержимое по этому пути никогда не меняется.
+    """
+    suffix = '-thumb' if thumb else ''
+    return os.path.join(
+        PREVIEW_DIR, digest[:2], digest, f'{page_number}{suffix}.png'
+    )
+
+
+def rasterize(pdf_path, output_dir):
+    """Растеризует страницы PDF утилитой pdftoppm из poppler-utils."""
+    binary = getattr(settings, 'PDFTOPPM_BINARY', PDFTOPPM_BINARY)
+    dpi = getattr(settings, 'PREVIEW_DPI', PREVIEW_DPI)
+    try:
+        subprocess.run(
+            [binary, '-png', '-r', str(dpi), pdf_path,
+             os.path.join(output_dir, 'page')],
+            check=True,
+            capture_output=True,
+            timeout=PDFTOPPM_TIMEOUT,
+        )
+    except (OSError, subprocess.SubprocessError) as exc:
+        raise PreviewError(str(exc)) from exc
+    # pdftoppm дополняет номера страниц нулями до одной ширины
+    pages = sorted(
+        name for name in os.listdir(output_dir) if name.endswith('.png')
+    )
+    return [os.path.join(output_dir, name) for name in pages]
+
+
+def store_pages(digest, images):
+    """Сохраняет полноразмерные страницы и миниатюры в хранилище."""
+    width = getattr(settings, 'PREVIEW_THUMB_WIDTH', PREVIEW_THUMB_WIDTH)
+    for page_number, image_path in enumerate(images, start=1):
+        path = page_path(digest, page_number)
+        if not default_storage.exists(path):
+            with open(image_path, 'rb') as image:
+                default_storage.save(path, File(image))
+        thumb_path = page_path(digest, page_number, thumb=True)
+        if default_storage.exists(thumb_path):
+            continue
+        with Image.open(image_path) as image:
+            image.thumbnail((width, width * 2))
+            with tempfile.TemporaryFile() as thumb:
+                image.save(thumb, 'PNG', optimize=True)
+                thumb.seek(0)
+                default_storage.save(thumb_path, File(thumb))
+
+
+def render_preview(check):
+    """Строит превью страниц PDF заявки.
+
+    Страницы растеризуются один раз для каждого содержимого PDF: если
+    такой же файл уже был загружен, используются готовые изображения.
+    Если превью построить не удалось, число страниц сохраняется равным
+    нулю, и страница заявки показывает только ссылку на файл.
+    """
+    if not check.pdf_file:
+        return
+    if not check.pdf_sha256:
+        check.pdf_sha256 = file_sha256(check.pdf_file)
+    digest = check.pdf_sha256
+    rendered = CheckOut.objects.filter(
+        pdf_sha256=digest, preview_pages__gt=0
+    ).values_list('preview_pages', flat=True).first()
+    if rendered and default_storage.exists(page_path(digest, rendered)):
+        pages = rendered
+    else:
+        try:
+            with tempfile.TemporaryDirectory() as output_dir:
+                pdf_path = os.path.join(output_dir, 'source.pdf')
+                with open(pdf_path, 'wb') as pdf, \
+                        check.pdf_file.open('rb') as source:
+                    for chunk in source.chunks():
+                        pdf.write(chunk)
+                images = rasterize(pdf_path, output_dir)
+                store_pages(digest, images)
+                pages = len(images)
+        except PreviewError as exc:
+            logger.warning('Не удалось построить превью %s: %s', check, exc)
+            pages = 0
+    CheckOut.objects.filter(pk=check.pk).update(
+        pdf_sha256=digest, preview_pages=pages
+    )
+    check.preview_pages = pages
+
+
+def schedule_preview(check):
+    """Ставит построение превью в очередь, если оно еще не запланировано."""
+    payload = json.dumps({'check_id': check.id})
+    planned = Job.objects.filter(
+        name='render_preview',
+        payload=payload,
+        status__in=[Job.PENDING, Job.RUNNING],
+    )
+    if not planned.exists():
+        jobs.enqueue('render_preview', check_id=check.id)
+
+
+def delete_preview(digest):
+    """Удаляет изображения страниц, если PDF больше нигде не используется."""
+    in_use = CheckOut.objects.filter(pdf_sha256=digest).exclude(
+        pdf_file__isnull=True
+    ).exclude(pdf_file='')
+    if not digest or in_use.exists():
+        return
+    directory = os.path.join(PREVIEW_DIR, digest[:2], digest)
+    try:
+        _, files = default_storage.listdir(directory)
+    except FileNotFoundError:
+        return
+    for name in files:
+        default_storage.delete(os.path.join(directory, name))
@@ -0,0 +1,215 @@
+import logging
+import os
+import re
+import zipfile
+from html import escape
+from html.parser import HTMLParser
+from xml.parsers.expat import ExpatError
+
+import mammoth
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+
+from .docx import DocxError
+from .models import CheckOut
+from .storage import file_sha256
+
+logger = logging.getLogger(__name__)
+
+READING_DIR = 'reading'
+# Имя очищенного HTML. Кеши со старым index.html без очистки
+# не используются и удаляются вместе с каталогом в evict
+INDEX_NAME = 'document.html'
+# Растровые изображения, которые показываются в документе. SVG может
+# содержать сценарии и не сохраняется, как и форматы, неизвестные
+# браузерам
+IMAGE_EXTENSIONS = {
+    'image/png': 'png',
+    'image/jpeg': 'jpg',
+    'image/gif': 'gif',
+    'image/bmp': 'bmp',
+}
+IMAGE_NAME = re.compile(
+    r'^img-\d+\.(%s)$' % '|'.join(IMAGE_EXTENSIONS.values())
+)
+# Разметка, которую порождает mammoth: тег -> разрешенные атрибуты
+ALLOWED_TAGS = {
+    'p': (), 'h1': (), 'h2': (), 'h3': (), 'h4': (), 'h5': (), 'h6': (),
+    'strong': (), 'em': (), 'u': (), 's': (), 'sup': (), 'sub': (),
+    'ul': (), 'ol': (), 'li': ('id',), 'br': (), 'blockquote': (),
+    'pre': (), 'code': (),
+    'table': (), 'thead': (), 'tbody': (), 'tr': (),
+    'th': ('colspan', 'rowspan'), 'td': ('colspan', 'rowspan'),
+    'a': ('href', 'id'), 'img': ('src', 'alt'),
+}
+VOID_TAGS = {'br', 'img'}
+# Теги, содержимое которых отбрасывается вместе с ними
+DROPPED_TAGS = {'script', 'style'}
+SAFE_HREF = re.compile(r'^(https?://|mailto:|#)', re.IGNORECASE)
+SPAN_VALUE = re.compile(r'^\d{1,3}$')
+# Ошибки разбора поврежденного DOCX
+CONVERT_ERRORS = (
+    zipfile.BadZipFile, KeyError, ValueError, ExpatError, LookupError,
+)
+
+
+def reading_path(digest, name=INDEX_NAME):
+    """Путь к файлу кеша HTML-версии документа в хранилище."""
+    return os.path.join(READING_DIR, digest[:2], digest, name)
+
+
+class Sanitizer(HTMLParser):
+    """Оставляет в HTML только разрешенные теги и атрибуты.
+
+    Текст и значения атрибутов экранируются заново, ссылки допускаются
+    только http, https, mailto и на якоря, изображения - только из кеша
+    документа.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts = []
+        self.dropped = 0
+
+    def allowed_value(self, name, value):
+        if value is None:
+            return False
+        if name == 'href':
+            return bool(SAFE_HREF.match(value.strip()))
+        if name == 'src':
+            return bool(IMAGE_NAME.match(value))
+        if name in ('colspan', 'rowspan'):
+            return bool(SPAN_VALUE.match(value))
+        return True
+
+    def handle_starttag(self, tag, attrs):
+        if tag in DROPPED_TAGS:
+            self.dropped += 1
+            return
+        if self.dropped or tag not in ALLOWED_TAGS:
+            return
+        attrs = [
+            (name, value) for name, value in attrs
+            if name in ALLOWED_TAGS[tag]
+            and self.allowed_value(name, value)
+        ]
+        if tag == 'img' and not any(name == 'src' for name, _ in attrs):
+            return
+        self.parts.append('<%s%s>' % (tag, ''.join(
+            f' {name}="{escape(value)}"' for name, value in attrs
+        )))
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_TAGS:
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag):
+        if tag in DROPPED_TAGS:
+            self.dropped = max(self.dropped - 1, 0)
+            return
+        if self.dropped or tag not in ALLOWED_TAGS or tag in VOID_TAGS:
+            return
+        self.parts.append(f'</{tag}>')
+
+    def handle_data(self, data):
+        if not self.dropped:
+            self.parts.append(escape(data, quote=False))
+
+
+def sanitize(html):
+    """Очищает HTML документа от сценариев и опасных ссылок."""
+    sanitizer = Sanitizer()
+    sanitizer.feed(html)
+    sanitizer.close()
+    return ''.join(sanitizer.parts)
+
+
+def docx_digest(check):
+    """Возвращает SHA-256 файла DOCX заявки, вычисляя его при надобности."""
+    if not check.docx_sha256:
+        check.docx_sha256 = file_sha256(check.docx_file)
+        CheckOut.objects.filter(pk=check.pk).update(
+            docx_sha256=check.docx_sha256
+        )
+    return check.docx_sha256
+
+
+def convert(check, digest):
+    """Преобразует DOCX в HTML и сохраняет результат в кеш.
+
+    Встроенные изображения сохраняются отдельными файлами рядом с HTML,
+    а в разметку попадают относительные ссылки на них. Файл HTML
+    очищается и записывается последним, поэтому его наличие означает
+    готовый кеш.
+    """
+    counter = iter(range(1, 10 ** 6))
+
+    def save_image(image):
+        extension = IMAGE_EXTENSIONS.get(image.content_type)
+        if extension is None:
+            # Изображение без src убирается при очистке
+            return {}
+        name = f'img-{next(counter)}.{extension}'
+        path = reading_path(digest, name)
+        if not default_storage.exists(path):
+            with image.open() as image_bytes:
+                default_storage.save(path, ContentFile(image_bytes.read()))
+        return {'src': name}
+
+    try:
+        with check.docx_file.open('rb') as docx:
+            result = mammoth.convert_to_html(
+                docx, convert_image=mammoth.images.img_element(save_image)
+            )
+    except CONVERT_ERRORS as exc:
+        raise DocxError(str(exc)) from exc
+    for message in result.messages:
+        logger.debug('%s: %s', check, message)
+    path = reading_path(digest)
+    if not default_storage.exists(path):
+        default_storage.save(
+            path, ContentFile(sanitize(result.value).encode())
+        )
+
+
+def get_reading(check):
+    """Возвращает открытый файл HTML-версии DOCX заявки.
+
+    Документ преобразуется только при первом обращении к каждому
+    содержимому DOCX.
+    """
+    digest = docx_digest(check)
+    path = reading_path(digest)
+    if not default_storage.exists(path):
+        convert(check, digest)
+    return default_storage.open(path, 'rb')
+
+
+def open_image(check, name):
+    """Открывает изображение из кеша HTML-версии документа."""
+    if not check.docx_sha256 or not IMAGE_NAME.match(name):
+        raise FileNotFoundError(name)
+    return default_storage.open(reading_path(check.docx_sha256, name), 'rb')
+
+
+def evict(digest):
+    """Удаляет кеш HTML-версии, если документ нужен только архиву.
+
+    Кеш общий для всех заявок с одинаковым DOCX, поэтому он остается,
+    пока есть активная заявка с этим файлом.
+    """
+    if not digest:
+        return
+    in_use = CheckOut.objects.filter(docx_sha256=digest, status=False)
+    if in_use.exists():
+        return
+    directory = os.path.join(READING_DIR, digest[:2], digest)
+    try:
+        _, files = default_storage.listdir(directory)
+    except FileNotFoundError:
+        return
+    # Сначала удаляется HTML, чтобы кеш не считался готовым без картинок
+    for name in sorted(files, key=lambda name: name != INDEX_NAME):
+        default_storage.delete(os.path.join(directory, name))
@@ -0,0 +1,178 @@
+import re
+
+from django.db import connection
+
+REMARK_INDEX = 'verify_remark_fts'
+DOCUMENT_INDEX = 'verify_document_fts'
+DOCUMENT_TABLE = 'verify_document_search'
+# Конфигурация полнотекстового поиска PostgreSQL
+SEARCH_CONFIG = 'russian'
+MAX_TERMS = 10
+WORD = re.compile(r'\w+')
+
+
+def search_terms(query):
+    """Разбивает строку запроса на слова."""
+    return WORD.findall(query.lower())[:MAX_TERMS]
+
+
+def fts5_query(terms):
+    """Запрос FTS5: все слова запроса, каждое как начало слова.
+
+    Префиксный поиск отчасти заменяет отсутствие стемминга в SQLite:
+    «ссылк» находит и «ссылки», и «ссылках».
+    """
+    return ' '.join(f'"{term}"*' for term in terms)
+
+
+def index_remarks(rows):
+    """Добавляет или обновляет замечания в индексе.
+
+    rows - пары (id, текст); для стандартных замечаний передается текст
+    из каталога. В PostgreSQL индекс по выражению обновляется самой
+    СУБД.
+    """
+    if connection.vendor != 'sqlite':
+        return
+    rows = list(rows)
+    if not rows:
+        return
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            f'DELETE FROM {REMARK_INDEX} WHERE rowid = %s',
+            [(remark_id,) for remark_id, _ in rows],
+        )
+        cursor.executemany(
+            f'INSERT INTO {REMARK_INDEX} (rowid, text) VALUES (%s, %s)',
+            rows,
+        )
+
+
+def unindex_remarks(remark_ids):
+    if connection.vendor != 'sqlite' or not remark_ids:
+        return
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            f'DELETE FROM {REMARK_INDEX} WHERE rowid = %s',
+            [(remark_id,) for remark_id in remark_ids],
+        )
+
+
+def index_document(check_id, text):
+    """Добавляет или обновляет текст документа заявки в индексе."""
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            cursor.execute(
+                f'DELETE FROM {DOCUMENT_INDEX} WHERE rowid = %s', [check_id]
+            )
+            cursor.execute(
+                f'INSERT INTO {DOCUMENT_INDEX} (rowid, body) VALUES (%s, %s)',
+                [check_id, text],
+            )
+        elif connection.vendor == 'postgresql':
+            cursor.execute(
+                f'INSERT INTO {DOCUMENT_TABLE} (check_id, body) '
+                f"VALUES (%s, to_tsvector('{SEARCH_CONFIG}', %s)) "
+                'ON CONFLICT (check_id) DO UPDATE SET body = EXCLUDED.body',
+                [check_id, text],
+            )
+
+
+def unindex_document(check_id):
+    table = {
+        'sqlite': (DOCUMENT_INDEX, 'rowid'),
+        'postgresql': (DOCUMENT_TABLE, 'check_id'),
+    }.get(connection.vendor)
+    if table is None:
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'DELETE FROM {table[0]} WHERE {table[1]} = %s', [check_id]
+        )
+
+
+def period_filter(column, period):
+    if period is None:
+        return '', []
+    return f' AND {column} >= %s AND {column} < %s', [
+        connection.ops.adapt_datetimefield_value(value) for value in period
+    ]
+
+
+def remark_search_sql(terms, period=None):
+    """Запрос поиска замечаний и его параметры без LIMIT и OFFSET.
+
+    Для СУБД без полнотекстового индекса возвращает None.
+    """
+    where, params = period_filter('r.check_date', period)
+    if connection.vendor == 'sqlite':
+        sql = (
+            f'SELECT r.id FROM {REMARK_INDEX} f '
+            'JOIN verify_remark r ON r.id = f.rowid '
+            f'WHERE {REMARK_INDEX} MATCH %s{where} '
+            'ORDER BY f.rank, r.id'
+        )
+        return sql, [fts5_query(terms)] + params
+    if connection.vendor == 'postgresql':
+        # Свободный текст ищется по GIN-индексу замечаний, стандартные
+        # замечания - по небольшому каталогу и индексу ссылки на него.
+        # Условие через OR с подзапросом не позволило бы использовать
+        # индексы, поэтому ветви объединяются и ранжируются после UNION
+        sql = (
+            f"WITH q AS (SELECT plainto_tsquery('{SEARCH_CONFIG}', %s) "
+            'AS query) '
+            'SELECT m.id FROM ('
+            'SELECT r.id, r.text AS body FROM verify_remark r, q '
+            f"WHERE to_tsvector('{SEARCH_CONFIG}', r.text) @@ q.query{where} "
+            'UNION ALL '
+            'SELECT r.id, t.text FROM verify_remarktype t '
+            'JOIN verify_remark r ON r.remark_type_id = t.code, q '
+            f"WHERE to_tsvector('{SEARCH_CONFIG}', t.text) @@ q.query{where}"
+            ') m, q '
+            f"ORDER BY ts_rank(to_tsvector('{SEARCH_CONFIG}', m.body), "
+            'q.query) DESC, m.id'
+        )
+        return sql, [' '.join(terms)] + params + params
+    return None
+
+
+def search_remarks(terms, period=None, limit=10, offset=0):
+    """Возвращает id замечаний, найденных по словам, в порядке релевантности.
+
+    period - пара границ даты замечания [начало, конец) или None.
+    Для СУБД без полнотекстового индекса возвращает None.
+    """
+    query = remark_search_sql(terms, period)
+    if query is None:
+        return None
+    sql, params = query
+    with connection.cursor() as cursor:
+        cursor.execute(f'{sql} LIMIT %s OFFSET %s', params + [limit, offset])
+        return [row[0] for row in cursor.fetchall()]
+
+
+def search_documents(terms, period=None, limit=10, offset=0):
+    """Возвращает id заявок, в документах которых найдены слова."""
+    where, params = period_filter('c.check_date', period)
+    if connection.vendor == 'sqlite':
+        sql = (
+            f'SELECT c.id FROM {DOCUMENT_INDEX} f '
+            'JOIN verify_checkout c ON c.id = f.rowid '
+            f'WHERE {DOCUMENT_INDEX} MATCH %s{where} '
+            'ORDER BY f.rank, c.id LIMIT %s OFFSET %s'
+        )
+        params = [fts5_query(terms)] + params
+    elif connection.vendor == 'postgresql':
+        sql = (
+            f'SELECT c.id FROM {DOCUMENT_TABLE} d '
+            'JOIN verify_checkout c ON c.id = d.check_id, '
+            f"plainto_tsquery('{SEARCH_CONFIG}', %s) q "
+            f'WHERE d.body @@ q{where} '
+            'ORDER BY ts_rank(d.body, q) DESC, c.id LIMIT %s OFFSET %s'
+        )
+        params = [' '.join(terms)] + params
+    else:
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params + [limit, offset])
+        return [row[0] for row in cursor.fetchall()]
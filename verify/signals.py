@@ -0,0 +1,167 @@
+import json
+
+from django.contrib.auth import get_user_model
+from django.db.models import F
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+
+from users.models import Group
+
+from . import caching, jobs, search
+from .models import (
+    CheckOut, Counter, Job, Remark, RemarkStat, RemarkType, month_of,
+    refresh_active_checks, remark_error_type, remarks_inserted,
+)
+
+User = get_user_model()
+
+
+def is_active(status):
+    return status is False
+
+
+@receiver(post_init, sender=CheckOut)
+def remember_status(sender, instance, **kwargs):
+    """Запоминает статус заявки для отслеживания его изменения."""
+    if 'status' not in instance.get_deferred_fields():
+        instance._loaded_status = instance.status
+
+
+@receiver(post_save, sender=CheckOut)
+def update_active_count_on_save(sender, instance, created, **kwargs):
+    if created:
+        delta = int(is_active(instance.status))
+    elif hasattr(instance, '_loaded_status'):
+        delta = (int(is_active(instance.status))
+                 - int(is_active(instance._loaded_status)))
+    else:
+        delta = None
+    if delta is None:
+        Counter.reset(Counter.ACTIVE_CHECKS)
+    elif delta:
+        Counter.add(Counter.ACTIVE_CHECKS, delta)
+    if created or delta != 0:
+        refresh_active_checks([instance.student_id])
+    instance._loaded_status = instance.status
+
+
+@receiver(post_delete, sender=CheckOut)
+def update_active_count_on_delete(sender, instance, **kwargs):
+    if is_active(instance.status):
+        Counter.add(Counter.ACTIVE_CHECKS, -1)
+        refresh_active_checks([instance.student_id])
+    search.unindex_document(instance.pk)
+
+
+@receiver(post_save, sender=Remark)
+def update_remark_count_on_save(sender, instance, created, **kwargs):
+    # Изменение замечания без изменения счетчика тоже обновляет время
+    # изменения заявки (см. CheckOutQuerySet.update)
+    changes = {'remark_count': F('remark_count') + 1} if created else {}
+    CheckOut.objects.filter(pk=instance.check_out_id).update(**changes)
+
+
+@receiver(post_delete, sender=Remark)
+def update_remark_count_on_delete(sender, instance, **kwargs):
+    CheckOut.objects.filter(
+        pk=instance.check_out_id, remark_count__gt=0
+    ).update(remark_count=F('remark_count') - 1)
+
+
+@receiver(post_save, sender=Remark)
+def index_remark_on_save(sender, instance, **kwargs):
+    search.index_remarks([(instance.pk, instance.message)])
+
+
+@receiver(post_delete, sender=Remark)
+def unindex_remark_on_delete(sender, instance, **kwargs):
+    search.unindex_remarks([instance.pk])
+
+
+@receiver(post_init, sender=Remark)
+def remember_error_type(sender, instance, **kwargs):
+    """Запоминает тип замечания для отслеживания его изменения."""
+    if 'remark_type' not in instance.get_deferred_fields():
+        instance._loaded_error_type = remark_error_type(
+            instance.remark_type_id
+        )
+
+
+def stat_position(remark):
+    """Группа студента и месяц замечания - координаты ячейки статистики."""
+    group_id = CheckOut.objects.filter(pk=remark.check_out_id).values_list(
+        'student__group_id', flat=True
+    ).first()
+    return group_id, month_of(remark.check_date)
+
+
+@receiver(post_save, sender=Remark)
+def update_remark_stats_on_save(sender, instance, created, **kwargs):
+    error_type = remark_error_type(instance.remark_type_id)
+    loaded_error_type = getattr(instance, '_loaded_error_type', error_type)
+    if created:
+        RemarkStat.add([((error_type, *stat_position(instance)), 1)])
+    elif loaded_error_type != error_type:
+        position = stat_position(instance)
+        RemarkStat.add([
+            ((loaded_error_type, *position), -1),
+            ((error_type, *position), 1),
+        ])
+    instance._loaded_error_type = error_type
+
+
+@receiver(post_delete, sender=Remark)
+def update_remark_stats_on_delete(sender, instance, **kwargs):
+    error_type = remark_error_type(instance.remark_type_id)
+    RemarkStat.add([((error_type, *stat_position(instance)), -1)])
+
+
+@receiver(remarks_inserted, sender=Remark)
+def schedule_remark_sync(sender, check_ids, **kwargs):
+    """Ставит обновление индекса и статистики после массовой вставки.
+
+    Задача, которая уже выполняется, могла не увидеть новые замечания,
+    поэтому достаточно только ожидающей задачи той же заявки.
+    """
+    for check_id in check_ids:
+        planned = Job.objects.filter(
+            name='sync_check_remarks',
+            payload=json.dumps({'check_id': check_id}),
+            status=Job.PENDING,
+        )
+        if not planned.exists():
+            jobs.enqueue('sync_check_remarks', check_id=check_id)
+
+
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+def bump_group_version(sender, **kwargs):
+    caching.bump_versions(caching.GROUPS)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def bump_student_version(sender, update_fields=None, **kwargs):
+    # Вход пользователя меняет только last_login, не показанный в списках
+    if update_fields is not None and set(update_fields) == {'last_login'}:
+        return
+    caching.bump_versions(caching.STUDENTS)
+
+
+@receiver(post_save, sender=CheckOut)
+@receiver(post_delete, sender=CheckOut)
+def bump_check_version(sender, **kwargs):
+    caching.bump_versions(caching.CHECKS)
+
+
+@receiver(post_save, sender=Remark)
+@receiver(post_delete, sender=Remark)
+def bump_remark_version(sender, **kwargs):
+    caching.bump_versions(caching.REMARKS)
+
+
+@receiver(post_save, sender=RemarkType)
+@receiver(post_delete, sender=RemarkType)
+def bump_remark_type_version(sender, **kwargs):
+    # Текст из каталога входит в замечания и в форму стандартных ошибок
+    caching.bump_versions(caching.REMARKS, caching.REMARK_TYPES)
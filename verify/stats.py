@@ -0,0 +1,147 @@
+import datetime
+from collections import Counter as Tally
+
+from django.db import models, transaction
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+
+from .models import (
+    CUSTOM_ERROR, CheckOut, Remark, RemarkStat, RemarkType, month_of,
+    remark_error_type,
+)
+
+CUSTOM_ERROR_LABEL = 'Другие замечания'
+
+
+def error_types():
+    """Тип замечания -> текст для отчетов."""
+    labels = {
+        remark_error_type(code): text
+        for code, text in RemarkType.objects.values_list('code', 'text')
+    }
+    labels[CUSTOM_ERROR] = CUSTOM_ERROR_LABEL
+    return labels
+
+
+def rebuild():
+    """Пересчитывает всю статистику по таблице замечаний.
+
+    Возвращает число заполненных ячеек.
+    """
+    tally = Tally()
+    rows = Remark.objects.annotate(
+        month=TruncMonth('check_date')
+    ).values_list(
+        'remark_type', 'check_out__student__group', 'month'
+    ).annotate(count=models.Count('id')).order_by()
+    for type_id, group_id, month, count in rows.iterator():
+        tally[(remark_error_type(type_id), group_id, month_of(month))] += count
+    with transaction.atomic():
+        RemarkStat.objects.all().delete()
+        RemarkStat.objects.bulk_create(
+            RemarkStat(
+                error_type=code, group_id=group_id, month=month, count=count,
+            )
+            for (code, group_id, month), count in tally.items()
+            if count
+        )
+    return len(tally)
+
+
+def month_period(month):
+    """Границы месяца в часовом поясе сайта."""
+    following = (month + datetime.timedelta(days=31)).replace(day=1)
+    return tuple(
+        timezone.make_aware(datetime.datetime.combine(day, datetime.time()))
+        for day in (month, following)
+    )
+
+
+def refresh_cells(group_id, month):
+    """Пересчитывает ячейки группы за месяц по таблице замечаний.
+
+    Строки ячеек блокируются до пересчета, поэтому прибавления из
+    параллельных запросов ложатся поверх нового значения.
+    """
+    start, end = month_period(month)
+    rows = Remark.objects.filter(
+        check_out__student__group_id=group_id,
+        check_date__gte=start,
+        check_date__lt=end,
+    ).values_list('remark_type').annotate(
+        count=models.Count('id')
+    ).order_by()
+    with transaction.atomic():
+        cells = list(RemarkStat.objects.select_for_update().filter(
+            group_id=group_id, month=month
+        ))
+        tally = Tally()
+        for type_id, count in rows:
+            tally[remark_error_type(type_id)] += count
+        for cell in cells:
+            # Ячейка без группы может повторяться (см. RemarkStat.add),
+            # счет достается первой, остальные обнуляются
+            count = tally.pop(cell.error_type, 0)
+            if cell.count != count:
+                RemarkStat.objects.filter(pk=cell.pk).update(count=count)
+        RemarkStat.objects.bulk_create(
+            RemarkStat(
+                error_type=code, group_id=group_id, month=month, count=count,
+            )
+            for code, count in tally.items()
+        )
+
+
+def refresh_check(check_id):
+    """Пересчитывает ячейки статистики, в которые входят замечания заявки.
+
+    Ячейки считаются заново, а не увеличиваются, поэтому повторный
+    пересчет ничего не меняет.
+    """
+    group_ids = list(CheckOut.objects.filter(pk=check_id).values_list(
+        'student__group_id', flat=True
+    ))
+    if not group_ids:
+        return
+    months = {
+        month_of(moment) for moment in Remark.objects.filter(
+            check_out_id=check_id
+        ).values_list('check_date', flat=True)
+    }
+    for month in sorted(months):
+        refresh_cells(group_ids[0], month)
+
+
+def summary(start=None, end=None, group=None):
+    """Число замечаний каждого типа по группам за период.
+
+    Возвращает список строк (тип, текст, {id группы: число}, всего),
+    упорядоченный по убыванию общего числа. Читает только сводную
+    таблицу.
+    """
+    cells = stat_cells(start, end, group).values(
+        'error_type', 'group'
+    ).annotate(total=models.Sum('count'))
+    rows = {}
+    for cell in cells:
+        counts = rows.setdefault(cell['error_type'], {})
+        counts[cell['group']] = counts.get(cell['group'], 0) + cell['total']
+    labels = error_types()
+    result = [
+        (code, labels.get(code, code), counts, sum(counts.values()))
+        for code, counts in rows.items()
+    ]
+    result.sort(key=lambda row: (-row[3], row[0]))
+    return result
+
+
+def stat_cells(start=None, end=None, group=None):
+    """Ячейки статистики за месяцы [start, end] и, при указании, группы."""
+    cells = RemarkStat.objects.filter(count__gt=0)
+    if start is not None:
+        cells = cells.filter(month__gte=start.replace(day=1))
+    if end is not None:
+        cells = cells.filter(month__lte=end.replace(day=1))
+    if group is not None:
+        cells = cells.filter(group=group)
+    return cells
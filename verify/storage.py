@@ -0,0 +1,128 @@
+import hashlib
+import os
+import re
+import tempfile
+import time
+
+from django.conf import settings
+from django.core.files.move import file_move_safe
+from django.core.files.storage import FileSystemStorage
+from django.utils.deconstruct import deconstructible
+
+BLOB_DIR = 'blobs'
+BLOB_TMP_DIR = os.path.join(BLOB_DIR, 'tmp')
+BLOB_NAME = re.compile(
+    r'^blobs/[0-9a-f]{2}/[0-9a-f]{2}/(?P<digest>[0-9a-f]{64})(\.\w+)?$'
+)
+# Свежие блобы не удаляются: их может использовать загрузка, еще не
+# записавшая заявку в БД
+BLOB_GRACE_PERIOD = 3600
+HASH_CHUNK_SIZE = 64 * 1024
+
+
+def blob_name(digest, extension=''):
+    """Имя блоба в хранилище: blobs/ab/cd/<sha256><расширение>."""
+    return os.path.join(
+        BLOB_DIR, digest[:2], digest[2:4], f'{digest}{extension}'
+    )
+
+
+def blob_digest(name):
+    """Возвращает SHA-256 из имени блоба или None для других файлов."""
+    match = BLOB_NAME.match(name or '')
+    return match.group('digest') if match else None
+
+
+def file_sha256(field_file):
+    """Возвращает SHA-256 файла.
+
+    Для блобов хеш берется из имени, остальные файлы читаются по частям.
+    """
+    digest = blob_digest(field_file.name)
+    if digest:
+        return digest
+    digest = hashlib.sha256()
+    with field_file.open('rb') as fileobj:
+        for chunk in iter(lambda: fileobj.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+@deconstructible
+class ContentAddressedStorage(FileSystemStorage):
+    """Файловое хранилище, сохраняющее каждое содержимое один раз.
+
+    При сохранении файл копируется во временный файл с одновременным
+    подсчетом SHA-256 и затем переименовывается в blobs/ab/cd/<sha256>.
+    Если такой блоб уже есть, копия удаляется, а заявка ссылается на
+    существующий блоб. Загрузка, уже посчитавшая хеш при приеме
+    (см. uploads.ValidatingUploadHandler), переносится без повторного
+    чтения. Файлы, загруженные до появления хранилища,
+    по-прежнему открываются по своим путям.
+    """
+    def get_available_name(self, name, max_length=None):
+        # Итоговое имя определяется содержимым в _save
+        return name
+
+    def _save(self, name, content):
+        extension = os.path.splitext(name)[1].lower()
+        digest = getattr(content, 'sha256', None)
+        if digest and hasattr(content, 'temporary_file_path'):
+            # Хеш уже посчитан при приеме загрузки, временный файл
+            # переносится без повторного чтения
+            tmp_path = content.temporary_file_path()
+            move = file_move_safe
+        else:
+            digest, tmp_path = self.copy_to_tmp(content)
+            move = os.replace
+        name = blob_name(digest, extension)
+        path = self.path(name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if os.path.exists(path):
+            if move is os.replace:
+                os.unlink(tmp_path)
+            # Продлеваем блобу защиту от удаления, см. is_fresh
+            os.utime(path)
+        else:
+            move(tmp_path, path)
+            if self.file_permissions_mode is not None:
+                os.chmod(path, self.file_permissions_mode)
+        return name
+
+    def copy_to_tmp(self, content):
+        """Копирует содержимое во временный файл, считая SHA-256."""
+        tmp_dir = self.path(BLOB_TMP_DIR)
+        os.makedirs(tmp_dir, exist_ok=True)
+        digest = hashlib.sha256()
+        with tempfile.NamedTemporaryFile(dir=tmp_dir, delete=False) as tmp:
+            try:
+                for chunk in content.chunks():
+                    digest.update(chunk)
+                    tmp.write(chunk)
+            except BaseException:
+                os.unlink(tmp.name)
+                raise
+        return digest.hexdigest(), tmp.name
+
+    def is_fresh(self, name):
+        """Проверяет, использовался ли блоб недавно при загрузке."""
+        grace = getattr(settings, 'BLOB_GRACE_PERIOD', BLOB_GRACE_PERIOD)
+        try:
+            return time.time() - os.path.getmtime(self.path(name)) < grace
+        except FileNotFoundError:
+            return False
+
+    def blob_names(self):
+        """Перебирает имена всех блобов хранилища."""
+        if not self.exists(BLOB_DIR):
+            return
+        for first in self.listdir(BLOB_DIR)[0]:
+            for second in self.listdir(os.path.join(BLOB_DIR, first))[0]:
+                directory = os.path.join(BLOB_DIR, first, second)
+                for name in self.listdir(directory)[1]:
+                    name = os.path.join(directory, name)
+                    if blob_digest(name):
+                        yield name
+
+
+blob_storage = ContentAddressedStorage()
@@ -0,0 +1,134 @@
+from django.db.models import Q
+
+from . import chunked, cold_archive, diff, reading, search, stats
+from .blobs import collect_blobs, release_blobs
+from .checker import check_layout
+from .docx import DocxError
+from .jobs import task
+from .mail import deliver_outbox
+from .models import CheckOut, Remark
+from .preview import delete_preview, render_preview
+
+
+@task('check_layout')
+def check_layout_task(check_id):
+    """Автоматическая проверка параметров страницы новой заявки."""
+    check = CheckOut.objects.filter(id=check_id).first()
+    if check is not None:
+        check_layout(check)
+
+
+@task('deliver_outbox')
+def deliver_outbox_task():
+    """Отправляет письма из очереди исходящей почты."""
+    deliver_outbox()
+
+
+@task('collect_blobs')
+def collect_blobs_task():
+    """Удаляет блобы, защита которых истекла после освобождения."""
+    collect_blobs()
+
+
+@task('collect_uploads')
+def collect_uploads_task():
+    """Удаляет брошенные докачиваемые загрузки."""
+    chunked.collect_sessions()
+
+
+@task('archive_check_files')
+# Задачи, поставленные до появления холодного архива
+@task('delete_check_files')
+def archive_check_files(check_id):
+    """Переносит файлы работы, отправленной в архив, в холодный архив.
+
+    Файлы сжимаются в каталог учебного года, после чего освобождаются
+    блобы, превью и HTML-версия. Заявка, вернувшаяся в работу до
+    или во время выполнения задачи, не трогается.
+    """
+    check = CheckOut.objects.select_related('student').filter(
+        id=check_id, status=True
+    ).first()
+    if check is None or not (check.pdf_file or check.docx_file):
+        return
+    # Абзацы нужны для сравнения со следующей попыткой студента
+    try:
+        diff.get_paragraphs(check)
+    except DocxError:
+        pass
+    manifest = cold_archive.freeze(check)
+    # Пока файлы сжимались, заявку могли вернуть в работу
+    archived = CheckOut.objects.filter(id=check_id, status=True).update(
+        pdf_file=None, docx_file=None, cold_manifest=manifest
+    )
+    if not archived:
+        # Прежний архив заявки, если он был, только перезаписан
+        if not check.cold_manifest:
+            cold_archive.discard(manifest)
+        return
+    release_blobs([check.pdf_file.name, check.docx_file.name])
+    delete_preview(check.pdf_sha256)
+    reading.evict(check.docx_sha256)
+
+
+@task('restore_check_files')
+def restore_check_files(check_id):
+    """Возвращает файлы работы из холодного архива.
+
+    Файлы записываются, только если у заявки их по-прежнему нет:
+    распакованные повторной задачей блобы освобождаются.
+    """
+    check = CheckOut.objects.filter(id=check_id).first()
+    if check is None or not check.cold_manifest:
+        return
+    if check.pdf_file or check.docx_file:
+        return
+    restored = cold_archive.thaw(check.cold_manifest)
+    # Изображения страниц удалены при архивации и строятся заново
+    updated = CheckOut.objects.filter(
+        Q(pdf_file__isnull=True) | Q(pdf_file=''),
+        Q(docx_file__isnull=True) | Q(docx_file=''),
+        id=check_id,
+    ).update(preview_pages=None, **restored)
+    if not updated:
+        release_blobs(restored.values())
+
+
+@task('render_preview')
+def render_preview_task(check_id):
+    """Строит изображения страниц PDF для просмотра в браузере."""
+    check = CheckOut.objects.filter(id=check_id).first()
+    if check is not None:
+        render_preview(check)
+
+
+@task('index_document')
+def index_document_task(check_id):
+    """Добавляет текст DOCX новой заявки в полнотекстовый индекс."""
+    check = CheckOut.objects.filter(id=check_id).first()
+    if check is None:
+        return
+    try:
+        paragraphs = diff.get_paragraphs(check)
+    except DocxError:
+        return
+    if paragraphs is not None:
+        search.index_document(
+            check.id, '\n'.join(text for _, text in paragraphs)
+        )
+
+
+@task('sync_check_remarks')
+def sync_check_remarks(check_id):
+    """Обновляет индекс и статистику после массовой вставки замечаний.
+
+    Замечания заявки индексируются заново, а ячейки статистики
+    пересчитываются, поэтому повтор задачи безопасен.
+    """
+    search.index_remarks(
+        (remark_id, type_text or text)
+        for remark_id, text, type_text in Remark.objects.filter(
+            check_out_id=check_id
+        ).values_list('id', 'text', 'remark_type__text')
+    )
+    stats.refresh_check(check_id)
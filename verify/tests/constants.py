@@ -1,3 +1,5 @@
+from verify.tests.utils import make_docx, make_pdf
+
 INFO = 'Сопроводительная информация'
 LONG_INFO = 'G' * 1100
 
@@ -32,20 +34,16 @@ GROUP_2_TITLE = 'test-group-title-2'
 
 PDF_FILE_NAME = 'test-pdf.pdf'
 PDF_FILE_TYPE = 'application/pdf'
-PDF_FILE_CONTENT = (
-    b'\x47\x49\x46\x38\x39\x61\x02\x00'
-    b'\x01\x00\x80\x00\x00\x00\x00\x00'
-    b'\xFF\xFF\xFF\x21\xF9\x04\x00\x00'
-    b'\x00\x00\x00\x2C\x00\x00\x00\x00'
-    b'\x02\x00\x01\x00\x00\x02\x02\x0C'
-    b'\x0A\x00\x3B'
-)
+PDF_FILE_CONTENT = make_pdf()
 
 
 DOCX_FILE_NAME = 'test-docx.docx'
 DOCX_FILE_TYPE = ('application/vnd.openxmlformats-officedocument.'
                   'wordprocessingml.document')
-DOCX_FILE_CONTENT = (
+DOCX_FILE_CONTENT = make_docx()
+
+# Файл, не являющийся ни DOCX, ни PDF
+BROKEN_FILE_CONTENT = (
     b'\x47\x49\x46\x38\x39\x61\x02\x00'
     b'\x01\x00\x80\x00\x00\x00\x00\x00'
     b'\xFF\xFF\xFF\x21\xF9\x04\x00\x00'
@@ -0,0 +1,149 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from users.models import Group
+from verify.models import CheckOut, Remark, remark_content
+from verify.tests import constants as cts
+
+User = get_user_model()
+
+
+class ApiTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.group = Group.objects.create(
+            title=cts.GROUP_1_TITLE,
+            slug=cts.GROUP_1_SLUG,
+        )
+        cls.student = User.objects.create(
+            username=cts.USERNAME_1,
+            group=cls.group,
+        )
+        cls.student_2 = User.objects.create(
+            username=cts.USERNAME_2,
+            group=cls.group,
+        )
+        cls.controller = User.objects.create(
+            username=cts.USERNAME_3,
+            allow_manage=True,
+        )
+        cls.controller_2 = User.objects.create(
+            username=f'{cts.USERNAME_3}-2',
+            allow_manage=True,
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.check = CheckOut.objects.create(student=ApiTests.student)
+        self.other_check = CheckOut.objects.create(student=ApiTests.student_2)
+        self.student_client = Client()
+        self.student_client.force_login(ApiTests.student)
+        self.controller_client = Client()
+        self.controller_client.force_login(ApiTests.controller)
+
+    def checks_url(self, user):
+        return reverse('verify:api_checks', args=[user.username])
+
+    def remarks_url(self, user, check):
+        return reverse('verify:api_remarks', args=[user.username, check.id])
+
+    def test_permissions(self):
+        """API повторяет права доступа страниц."""
+        student, controller = ApiTests.student, ApiTests.controller
+        cases = [
+            (self.student_client, self.checks_url(controller), 403),
+            (self.student_client, reverse('verify:api_students'), 403),
+            (self.student_client, reverse('verify:api_groups'), 403),
+            (self.student_client, self.remarks_url(
+                student, self.other_check), 404),
+            (self.student_client, reverse(
+                'verify:api_check', args=[student.username,
+                                          self.other_check.id]), 404),
+            (self.controller_client, reverse('verify:api_students'), 200),
+            (self.controller_client, self.remarks_url(
+                controller, self.check), 200),
+        ]
+        for client, url, status in cases:
+            with self.subTest(url=url):
+                self.assertEqual(client.get(url).status_code, status)
+
+    def test_student_sees_own_checks(self):
+        response = self.student_client.get(
+            self.checks_url(ApiTests.student), {'fields': 'id,student'}
+        )
+        self.assertEqual(response.json()['results'], [
+            {'id': self.check.id, 'student': cts.USERNAME_1},
+        ])
+        response = self.controller_client.get(
+            self.checks_url(ApiTests.controller), {'fields': 'id'}
+        )
+        self.assertEqual(
+            [item['id'] for item in response.json()['results']],
+            [self.check.id, self.other_check.id],
+        )
+
+    def test_unknown_field(self):
+        response = self.controller_client.get(
+            reverse('verify:api_groups'), {'fields': 'title,password'}
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('fields', response.json()['errors'])
+
+    def test_cursor_pagination(self):
+        """Страницы по ссылке next проходят весь список без повторов."""
+        Remark.objects.bulk_create(
+            Remark(check_out=self.check, section=cts.REMARK_SECTION,
+                   **remark_content(f'{cts.REMARK_TEXT} {number}'))
+            for number in range(5)
+        )
+        url = self.remarks_url(ApiTests.student, self.check)
+        data = self.student_client.get(url, {'limit': 2}).json()
+        texts = [item['text'] for item in data['results']]
+        while data['next']:
+            data = self.student_client.get(data['next']).json()
+            self.assertLessEqual(len(data['results']), 2)
+            texts += [item['text'] for item in data['results']]
+        self.assertEqual(
+            texts, [f'{cts.REMARK_TEXT} {number}' for number in range(5)]
+        )
+        response = self.student_client.get(url, {'cursor': 'forged'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_group_progress(self):
+        data = self.controller_client.get(reverse('verify:api_groups')).json()
+        group = data['results'][0]
+        self.assertEqual(group['slug'], cts.GROUP_1_SLUG)
+        self.assertEqual(group['student_count'], 2)
+        self.assertEqual(group['active_checks'], 2)
+
+    def test_not_modified(self):
+        """Повторный опрос без изменений отвечает 304 без запросов данных."""
+        url = self.remarks_url(ApiTests.student, self.check)
+        response = self.student_client.get(url)
+        etag = response['ETag']
+        with self.assertNumQueries(2):
+            response = self.student_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        Remark.objects.create(
+            check_out=self.check, section=cts.REMARK_SECTION,
+            text=cts.REMARK_TEXT,
+        )
+        response = self.student_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()['results']), 1)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_etag_depends_on_user(self):
+        """ETag одного пользователя не подходит другому."""
+        url = reverse('verify:api_groups')
+        etag = self.controller_client.get(url)['ETag']
+        self.assertEqual(self.controller_client.get(
+            url, HTTP_IF_NONE_MATCH=etag
+        ).status_code, 304)
+        client = Client()
+        client.force_login(ApiTests.controller_2)
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
@@ -0,0 +1,138 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.http import HttpResponse
+from django.test import Client, RequestFactory, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from users.models import Group
+from verify.caching import GROUPS
+from verify.decorators import cache_versioned
+from verify.models import CheckOut, Remark
+from verify.tests import constants as cts
+
+User = get_user_model()
+
+
+class RosterCacheTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.group = Group.objects.create(
+            title=cts.GROUP_1_TITLE,
+            slug=cts.GROUP_1_SLUG,
+        )
+        cls.student = User.objects.create(
+            username=cts.USERNAME_1,
+            group=cls.group,
+        )
+        cls.controller = User.objects.create(
+            username=cts.USERNAME_3,
+            allow_manage=True,
+        )
+        cls.controller_2 = User.objects.create(
+            username=cts.USERNAME_2,
+            allow_manage=True,
+        )
+        cls.urls = [
+            reverse('verify:group_list'),
+            reverse('verify:student_list'),
+            reverse('verify:group_students', args=[cts.GROUP_1_SLUG]),
+        ]
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        self.client.force_login(RosterCacheTests.controller)
+
+    def test_repeat_view_queries_only_auth(self):
+        """Повторный просмотр читает из БД только сессию и пользователя."""
+        for url in RosterCacheTests.urls:
+            with self.subTest(url=url):
+                first = self.client.get(url)
+                with self.assertNumQueries(2):
+                    second = self.client.get(url)
+                self.assertEqual(first.content, second.content)
+
+    def test_changes_invalidate_pages(self):
+        """Изменение групп, студентов и заявок обновляет страницы."""
+        for url in RosterCacheTests.urls:
+            self.client.get(url)
+        group = Group.objects.create(
+            title=cts.GROUP_2_TITLE, slug=cts.GROUP_2_SLUG
+        )
+        self.assertContains(
+            self.client.get(RosterCacheTests.urls[0]), cts.GROUP_2_TITLE
+        )
+        student = RosterCacheTests.student
+        student.email = cts.EMAIL_1
+        student.save()
+        self.assertContains(
+            self.client.get(RosterCacheTests.urls[1]), cts.EMAIL_1
+        )
+        active_check_url = reverse(
+            'verify:student_active_check', args=[student.username]
+        )
+        self.assertNotContains(
+            self.client.get(RosterCacheTests.urls[2]), active_check_url
+        )
+        CheckOut.objects.create(student=student)
+        self.assertContains(
+            self.client.get(RosterCacheTests.urls[2]), active_check_url
+        )
+        group.delete()
+        self.assertNotContains(
+            self.client.get(RosterCacheTests.urls[0]), cts.GROUP_2_TITLE
+        )
+
+    def test_remarks_invalidate_progress(self):
+        """Новые замечания меняют показатели групп и студентов."""
+        check = CheckOut.objects.create(student=RosterCacheTests.student)
+        url = RosterCacheTests.urls[1]
+        self.assertContains(self.client.get(url), 'замечаний: 0')
+        Remark.objects.bulk_create([Remark(
+            check_out=check, section=cts.REMARK_SECTION,
+            text=cts.REMARK_TEXT,
+        )])
+        self.assertContains(self.client.get(url), 'замечаний: 1')
+
+    def test_table_fragment_is_shared(self):
+        """Таблицу, построенную для одного пользователя, получает другой."""
+        self.client.get(RosterCacheTests.urls[0])
+        client = Client()
+        client.force_login(RosterCacheTests.controller_2)
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(RosterCacheTests.urls[0])
+        self.assertContains(response, cts.GROUP_1_TITLE)
+        for query in queries.captured_queries:
+            self.assertNotIn('FROM "users_group"', query['sql'])
+
+    def test_login_keeps_cache(self):
+        """Обновление времени входа не сбрасывает кэш списков."""
+        url = RosterCacheTests.urls[1]
+        self.client.get(url)
+        controller = RosterCacheTests.controller
+        controller.save(update_fields=['last_login'])
+        with self.assertNumQueries(2):
+            self.client.get(url)
+
+    def test_cached_page_keeps_headers(self):
+        """Страница из кэша отдается с заголовками представления."""
+        calls = []
+
+        @cache_versioned(GROUPS)
+        def view(request):
+            calls.append(request)
+            response = HttpResponse('{}', content_type='application/json')
+            response['Cache-Control'] = 'private, max-age=60'
+            response['Vary'] = 'Accept-Language'
+            return response
+
+        request = RequestFactory().get('/')
+        request.user = RosterCacheTests.controller
+        first = view(request)
+        second = view(request)
+        self.assertEqual(len(calls), 1)
+        for header in ('Content-Type', 'Cache-Control', 'Vary'):
+            self.assertEqual(second[header], first[header])
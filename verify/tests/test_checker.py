@@ -0,0 +1,96 @@
+import io
+import shutil
+import tempfile
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.files.base import ContentFile
+from django.test import TestCase, override_settings
+
+from normocontrol.settings.base import MEDIA_ROOT
+from verify import constants as cts
+from verify.checker import check_layout, find_layout_errors
+from verify.docx import DocxError
+from verify.models import CheckOut
+from verify.tests import constants as test_cts
+from verify.tests.utils import make_docx, make_section, make_section_break
+
+User = get_user_model()
+
+
+class LayoutCheckerTests(TestCase):
+    def test_correct_layout_has_no_errors(self):
+        """Документ с верными параметрами страницы не получает замечаний."""
+        docx = io.BytesIO(make_docx())
+        self.assertEqual(find_layout_errors(docx), [])
+
+    def test_wrong_margins_and_page_size(self):
+        """Неверные поля и формат листа дают замечания по каждому разделу."""
+        sections = [
+            make_section_break(left=567),
+            make_section(
+                width=16838, height=11906, orient=' w:orient="landscape"'
+            ),
+        ]
+        docx = io.BytesIO(make_docx(sections=sections))
+        self.assertEqual(
+            find_layout_errors(docx),
+            [(1, cts.ERROR_FRAME_1), (2, cts.ERROR_MAIN_9)],
+        )
+
+    def test_measures_with_units(self):
+        """Размеры с единицами измерения и дробные значения читаются."""
+        sections = [
+            make_section_break(left='2.7cm', width='11906.0'),
+            make_section(left='0.5in'),
+        ]
+        docx = io.BytesIO(make_docx(sections=sections))
+        self.assertEqual(find_layout_errors(docx), [(2, cts.ERROR_FRAME_1)])
+
+    def test_unreadable_measure(self):
+        """Неразборчивый размер вызывает DocxError, а не ValueError."""
+        docx = io.BytesIO(make_docx(sections=[make_section(top='auto')]))
+        with self.assertRaises(DocxError):
+            find_layout_errors(docx)
+
+    def test_not_a_docx_file(self):
+        """Файл, не являющийся DOCX, вызывает DocxError."""
+        with self.assertRaises(DocxError):
+            find_layout_errors(io.BytesIO(test_cts.BROKEN_FILE_CONTENT))
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class CheckLayoutRemarksTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        settings.MEDIA_ROOT = tempfile.mkdtemp(dir=settings.BASE_DIR)
+        cls.student = User.objects.create(username=test_cts.USERNAME_1)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(settings.MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def test_check_layout_creates_remarks(self):
+        """Проверка создает замечания со ссылкой на каталог."""
+        check = CheckOut(student=self.student)
+        check.docx_file.save(
+            test_cts.DOCX_FILE_NAME,
+            ContentFile(make_docx(sections=[make_section(top=283)])),
+        )
+        check_layout(check)
+        remark = check.remark.get()
+        self.assertEqual(remark.remark_type.text, cts.ERROR_FRAME_1)
+        self.assertEqual(remark.text, '')
+        self.assertIsNone(remark.author)
+
+    def test_check_layout_ignores_broken_file(self):
+        """Поврежденный файл не приводит к ошибке и не создает замечаний."""
+        check = CheckOut(student=self.student)
+        check.docx_file.save(
+            test_cts.DOCX_FILE_NAME,
+            ContentFile(test_cts.BROKEN_FILE_CONTENT),
+        )
+        self.assertEqual(check_layout(check), [])
+        self.assertFalse(check.remark.exists())
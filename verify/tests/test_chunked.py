@@ -0,0 +1,182 @@
+import hashlib
+import os
+import shutil
+import tempfile
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from normocontrol.settings.base import MEDIA_ROOT
+from verify import chunked, jobs
+from verify.models import CheckOut, Job, UploadSession
+from verify.tests import constants as cts
+
+User = get_user_model()
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class ChunkedUploadTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        settings.MEDIA_ROOT = tempfile.mkdtemp(dir=settings.BASE_DIR)
+        cls.student = User.objects.create(username=cts.USERNAME_1)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(settings.MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        self.client = Client()
+        self.client.force_login(ChunkedUploadTests.student)
+
+    def url(self, name, **kwargs):
+        return reverse(
+            f'verify:{name}', kwargs=dict(username=self.student, **kwargs)
+        )
+
+    def start(self, name, content, sha256=None):
+        response = self.client.post(self.url('upload_start'), {
+            'file_name': name,
+            'size': len(content),
+            'sha256': sha256 or hashlib.sha256(content).hexdigest(),
+        })
+        self.assertIn(response.status_code, (200, 201))
+        return response.json()
+
+    def put(self, state, chunk, offset):
+        return self.client.put(
+            f'{state["url"]}?offset={offset}', chunk,
+            content_type='application/octet-stream',
+        )
+
+    def upload(self, name, content, sha256=None):
+        state = self.start(name, content, sha256)
+        middle = len(content) // 2
+        self.put(state, content[:middle], 0)
+        self.put(state, content[middle:], middle)
+        return state['upload_id']
+
+    def finish(self, docx_upload, pdf_upload):
+        return self.client.post(self.url('upload_finish'), {
+            'docx_upload': docx_upload,
+            'pdf_upload': pdf_upload,
+            'info': cts.INFO,
+        })
+
+    def test_upload_creates_check(self):
+        """Загруженные по частям файлы становятся файлами новой заявки."""
+        docx_upload = self.upload(cts.DOCX_FILE_NAME, cts.DOCX_FILE_CONTENT)
+        pdf_upload = self.upload(cts.PDF_FILE_NAME, cts.PDF_FILE_CONTENT)
+        part = chunked.part_path(UploadSession.objects.get(pk=docx_upload))
+        response = self.finish(docx_upload, pdf_upload)
+        self.assertEqual(response.status_code, 201)
+        check = CheckOut.objects.get(pk=response.json()['check_id'])
+        self.assertEqual(check.student, self.student)
+        self.assertEqual(check.info, cts.INFO)
+        self.assertEqual(
+            check.docx_sha256,
+            hashlib.sha256(cts.DOCX_FILE_CONTENT).hexdigest(),
+        )
+        with check.pdf_file.open('rb') as pdf:
+            self.assertEqual(pdf.read(), cts.PDF_FILE_CONTENT)
+        self.assertFalse(UploadSession.objects.exists())
+        self.assertFalse(os.path.exists(part))
+
+        response = self.client.post(self.url('upload_start'), {
+            'file_name': cts.DOCX_FILE_NAME, 'size': 1, 'sha256': '0' * 64,
+        })
+        self.assertEqual(response.status_code, 409)
+
+    def test_interrupted_upload_resumes(self):
+        """Загрузка продолжается с последнего полученного байта."""
+        content = cts.DOCX_FILE_CONTENT
+        state = self.start(cts.DOCX_FILE_NAME, content)
+        self.put(state, content[:100], 0)
+        resumed = self.start(cts.DOCX_FILE_NAME, content)
+        self.assertEqual(resumed['upload_id'], state['upload_id'])
+        self.assertEqual(resumed['offset'], 100)
+
+        response = self.put(state, content[50:], 50)
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.json()['offset'], 100)
+
+        response = self.put(state, content[100:], 100)
+        self.assertEqual(response.json()['offset'], len(content))
+        with open(chunked.part_path(UploadSession.objects.get()), 'rb') as f:
+            self.assertEqual(f.read(), content)
+
+    def test_hash_mismatch_is_rejected(self):
+        """Файл, не совпадающий с заявленным хешем, не принимается."""
+        docx_upload = self.upload(
+            cts.DOCX_FILE_NAME, cts.DOCX_FILE_CONTENT, sha256='0' * 64
+        )
+        pdf_upload = self.upload(cts.PDF_FILE_NAME, cts.PDF_FILE_CONTENT)
+        response = self.finish(docx_upload, pdf_upload)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            response.json()['errors']['docx_file'], [chunked.ERROR_HASH]
+        )
+        self.assertFalse(CheckOut.objects.exists())
+        self.assertEqual(
+            list(UploadSession.objects.values_list('pk', flat=True)),
+            [UploadSession.objects.get(file_name=cts.PDF_FILE_NAME).pk],
+        )
+
+    def test_incomplete_upload_is_rejected(self):
+        """Заявку нельзя создать, пока файл не загружен полностью."""
+        state = self.start(cts.DOCX_FILE_NAME, cts.DOCX_FILE_CONTENT)
+        pdf_upload = self.upload(cts.PDF_FILE_NAME, cts.PDF_FILE_CONTENT)
+        response = self.finish(state['upload_id'], pdf_upload)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('docx_upload', response.json()['errors'])
+
+    def test_abandoned_sessions_are_collected(self):
+        """Брошенные загрузки удаляются вместе с временными файлами."""
+        state = self.start(cts.DOCX_FILE_NAME, cts.DOCX_FILE_CONTENT)
+        self.put(state, cts.DOCX_FILE_CONTENT[:100], 0)
+        fresh = self.start(cts.PDF_FILE_NAME, cts.PDF_FILE_CONTENT)
+        session = UploadSession.objects.get(pk=state['upload_id'])
+        UploadSession.objects.filter(pk=session.pk).update(
+            updated=session.updated - timedelta(
+                seconds=chunked.UPLOAD_SESSION_TTL + 1
+            )
+        )
+        self.assertEqual(chunked.collect_sessions(), 1)
+        self.assertFalse(os.path.exists(chunked.part_path(session)))
+        self.assertEqual(
+            str(UploadSession.objects.get().pk), fresh['upload_id']
+        )
+
+    @override_settings(MAX_UPLOAD_SESSIONS=2)
+    def test_oldest_sessions_are_expired(self):
+        """Новая загрузка вытесняет самые давние загрузки студента."""
+        states = [
+            self.start(f'{number}.pdf', cts.PDF_FILE_CONTENT)
+            for number in range(3)
+        ]
+        self.assertEqual(
+            sorted(str(pk) for pk in UploadSession.objects.values_list(
+                'pk', flat=True
+            )),
+            sorted(state['upload_id'] for state in states[1:]),
+        )
+
+    def test_collection_is_queued(self):
+        """Уборка брошенных загрузок ставится в очередь задач."""
+        self.start(cts.DOCX_FILE_NAME, cts.DOCX_FILE_CONTENT)
+        self.start(cts.PDF_FILE_NAME, cts.PDF_FILE_CONTENT)
+        job = Job.objects.get(name='collect_uploads')
+        self.assertGreater(job.run_after, UploadSession.objects.latest(
+            'updated'
+        ).updated)
+        UploadSession.objects.update(
+            updated=job.run_after - chunked.session_ttl() - timedelta(1)
+        )
+        Job.objects.filter(pk=job.pk).update(run_after=job.created)
+        jobs.run_pending()
+        self.assertFalse(UploadSession.objects.exists())
@@ -0,0 +1,183 @@
+import datetime
+import json
+import lzma
+import os
+import shutil
+import tempfile
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.files.base import ContentFile
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from normocontrol.settings.base import MEDIA_ROOT
+from verify import cold_archive, jobs
+from verify.counters import active_check_count
+from verify.models import CheckOut, Job
+from verify.storage import blob_storage
+from verify.tests import constants as cts
+from verify.tests.utils import make_docx, make_pdf
+
+User = get_user_model()
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT, BLOB_GRACE_PERIOD=0)
+class ColdArchiveTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        settings.MEDIA_ROOT = tempfile.mkdtemp(dir=settings.BASE_DIR)
+        cls.student = User.objects.create(username=cts.USERNAME_1)
+        cls.controller = User.objects.create(
+            username=cts.USERNAME_3,
+            allow_manage=True,
+        )
+        cls.pdf = make_pdf()
+        cls.docx = make_docx(['Текст работы'])
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(settings.MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        self.client = Client()
+        self.client.force_login(ColdArchiveTests.controller)
+        self.check = CheckOut(student=ColdArchiveTests.student)
+        self.check.pdf_file.save(
+            cts.PDF_FILE_NAME, ContentFile(self.pdf), save=False
+        )
+        self.check.docx_file.save(
+            cts.DOCX_FILE_NAME, ContentFile(self.docx), save=False
+        )
+        self.check.save()
+
+    def tearDown(self):
+        shutil.rmtree(
+            cold_archive.cold_storage().location, ignore_errors=True
+        )
+
+    def action(self, name):
+        self.client.get(reverse(
+            f'verify:{name}', args=[cts.USERNAME_3, self.check.id]
+        ))
+        jobs.run_pending()
+        self.check.refresh_from_db()
+
+    def test_archive_and_restore(self):
+        """Файлы архивной заявки сжимаются и восстанавливаются без потерь."""
+        pdf_name = self.check.pdf_file.name
+        self.action('check_archive')
+        self.assertFalse(self.check.pdf_file)
+        self.assertFalse(blob_storage.exists(pdf_name))
+        manifest = cold_archive.read_manifest(self.check.cold_manifest)
+        self.assertEqual(manifest['files']['pdf']['name'], pdf_name)
+        directory = os.path.dirname(
+            cold_archive.cold_storage().path(self.check.cold_manifest)
+        )
+        with lzma.open(os.path.join(directory, 'pdf.xz')) as source:
+            self.assertEqual(source.read(), self.pdf)
+        self.assertTrue(self.check.cold_manifest.startswith(
+            cold_archive.academic_year(self.check.check_date)
+        ))
+        self.action('check_restore')
+        self.assertEqual(self.check.pdf_file.name, pdf_name)
+        self.assertTrue(self.check.status)
+        self.assertIsNone(self.check.preview_pages)
+        with self.check.docx_file.open('rb') as source:
+            self.assertEqual(source.read(), self.docx)
+
+    def test_reactivation_restores_files(self):
+        self.action('check_archive')
+        self.action('check_active')
+        self.assertFalse(self.check.status)
+        self.assertTrue(self.check.pdf_file)
+
+    def test_repeated_restore_keeps_status_and_counter(self):
+        """Повторная задача восстановления не меняет статус и счетчик."""
+        self.action('check_archive')
+        for name in ('check_restore', 'check_active'):
+            self.client.get(reverse(
+                f'verify:{name}', args=[cts.USERNAME_3, self.check.id]
+            ))
+        jobs.run_pending()
+        self.check.refresh_from_db()
+        self.assertFalse(self.check.status)
+        self.assertTrue(self.check.pdf_file)
+        self.assertEqual(active_check_count(), 1)
+        self.assertEqual(len(list(blob_storage.blob_names())), 2)
+
+    def test_reactivated_before_job_keeps_files(self):
+        """Заявка, возвращенная в работу до задачи, не архивируется."""
+        self.client.get(reverse(
+            'verify:check_archive', args=[cts.USERNAME_3, self.check.id]
+        ))
+        CheckOut.objects.filter(id=self.check.id).update(status=False)
+        jobs.run_pending()
+        self.check.refresh_from_db()
+        self.assertTrue(self.check.pdf_file)
+        self.assertEqual(self.check.cold_manifest, '')
+        self.assertFalse(Job.objects.exclude(status=Job.DONE).exists())
+
+    def test_corrupted_file_is_not_restored(self):
+        """Файл с несовпадающим хешем не возвращается в хранилище."""
+        self.action('check_archive')
+        path = cold_archive.cold_storage().path(self.check.cold_manifest)
+        with open(path, encoding='utf-8') as source:
+            manifest = json.load(source)
+        manifest['files']['pdf']['sha256'] = '0' * 64
+        with open(path, 'w', encoding='utf-8') as target:
+            json.dump(manifest, target)
+        restored = cold_archive.thaw(self.check.cold_manifest)
+        self.assertNotIn('pdf_file', restored)
+        self.assertIn('docx_file', restored)
+        self.assertEqual(
+            list(blob_storage.blob_names()), [restored['docx_file']]
+        )
+
+    def test_delete_discards_archive(self):
+        self.action('check_archive')
+        path = cold_archive.cold_storage().path(self.check.cold_manifest)
+        self.client.get(reverse(
+            'verify:check_delete', args=[cts.USERNAME_3, self.check.id]
+        ))
+        self.assertFalse(os.path.exists(path))
+
+    def test_other_student_cannot_delete(self):
+        """Студент не может удалить чужую заявку и ее архив."""
+        self.action('check_archive')
+        other = User.objects.create(username=cts.USERNAME_2)
+        client = Client()
+        client.force_login(other)
+        response = client.get(reverse(
+            'verify:check_delete', args=[cts.USERNAME_2, self.check.id]
+        ))
+        self.assertEqual(response.status_code, 404)
+        self.assertTrue(CheckOut.objects.filter(id=self.check.id).exists())
+        self.assertTrue(
+            cold_archive.cold_storage().exists(self.check.cold_manifest)
+        )
+
+    @override_settings(COLD_ARCHIVE_RETENTION_YEARS=2,
+                       COLD_ARCHIVE_RETENTION={'2020-2021': None})
+    def test_retention(self):
+        """Срок хранения отсчитывается от конца учебного года."""
+        autumn = timezone.make_aware(datetime.datetime(2022, 10, 1))
+        CheckOut.objects.filter(id=self.check.id).update(check_date=autumn)
+        self.check.refresh_from_db()
+        self.action('check_archive')
+        storage = cold_archive.cold_storage()
+        os.makedirs(storage.path('2020-2021'))
+        self.assertEqual(cold_archive.academic_year(autumn), '2022-2023')
+        self.assertEqual(
+            cold_archive.purge(datetime.date(2025, 8, 31)), []
+        )
+        self.assertEqual(
+            cold_archive.purge(datetime.date(2025, 9, 1)), ['2022-2023']
+        )
+        self.check.refresh_from_db()
+        self.assertEqual(self.check.cold_manifest, '')
+        self.assertFalse(storage.exists('2022-2023'))
+        self.assertTrue(storage.exists('2020-2021'))
@@ -0,0 +1,201 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from core.context_processors import check_count
+from verify.counters import active_check_count
+from verify.models import CheckOut, Counter, Remark
+from verify.tests import constants as cts
+
+User = get_user_model()
+
+
+class ActiveCheckCounterTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.student = User.objects.create(username=cts.USERNAME_1)
+
+    def assertCounter(self, expected):
+        self.assertEqual(active_check_count(), expected)
+        self.assertEqual(
+            CheckOut.objects.filter(status=False).count(), expected
+        )
+
+    def test_counter_follows_create_status_change_and_delete(self):
+        """Счетчик меняется при создании, архивации и удалении заявок."""
+        self.assertCounter(0)
+        check = CheckOut.objects.create(student=self.student)
+        CheckOut.objects.create(student=self.student)
+        self.assertCounter(2)
+        check.status = True
+        check.save()
+        self.assertCounter(1)
+        check.status = False
+        check.save()
+        self.assertCounter(2)
+        check.delete()
+        self.assertCounter(1)
+
+    def test_counter_follows_queryset_operations(self):
+        """Счетчик учитывает bulk_create, update и delete наборов записей."""
+        self.assertCounter(0)
+        CheckOut.objects.bulk_create(
+            [CheckOut(student=self.student) for _ in range(3)]
+        )
+        self.assertCounter(3)
+        CheckOut.objects.filter(status=False).update(status=True)
+        self.assertCounter(0)
+        CheckOut.objects.update(status=False)
+        self.assertCounter(3)
+        CheckOut.objects.all().delete()
+        self.assertCounter(0)
+        existing = CheckOut.objects.create(student=self.student)
+        CheckOut.objects.bulk_create(
+            [CheckOut(pk=existing.pk, student=self.student)],
+            ignore_conflicts=True,
+        )
+        self.assertCounter(1)
+
+    def test_repeated_status_change_counts_once(self):
+        """Повторная архивация уже архивной заявки не меняет счетчик."""
+        check = CheckOut.objects.create(student=self.student)
+        CheckOut.objects.create(student=self.student)
+        self.assertCounter(2)
+        stale = CheckOut.objects.filter(pk=check.pk)
+        self.assertEqual(stale.set_status(True), 1)
+        self.assertEqual(stale.set_status(True), 0)
+        self.assertCounter(1)
+        self.assertEqual(stale.set_status(False), 1)
+        self.assertEqual(stale.set_status(False), 0)
+        self.assertCounter(2)
+
+    def test_counter_is_read_from_one_row(self):
+        """Значение счетчика читается одним запросом к таблице счетчиков."""
+        CheckOut.objects.create(student=self.student)
+        active_check_count()
+        with self.assertNumQueries(1):
+            self.assertEqual(active_check_count(), 1)
+        self.assertTrue(
+            Counter.objects.filter(name=Counter.ACTIVE_CHECKS).exists()
+        )
+
+    def test_context_processor_is_lazy(self):
+        """Контекстный процессор не обращается к БД, пока значение не нужно."""
+        with self.assertNumQueries(0):
+            context = check_count(None)
+        with self.assertNumQueries(0):
+            Client().get('/')
+        self.assertEqual(str(context['check_count']), '0')
+
+
+class DenormalizedFieldsTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.student = User.objects.create(username=cts.USERNAME_1)
+        cls.other_student = User.objects.create(username=cts.USERNAME_2)
+
+    def add_remark(self, check):
+        return Remark.objects.create(
+            section=cts.REMARK_SECTION,
+            page_number=cts.REMARK_PAGE_NUMBER,
+            paragraph=cts.REMARK_PARAGRAPH,
+            text=f'{cts.REMARK_TEXT} {check.remark.count()}',
+            check_out=check,
+        )
+
+    def assertRemarkCount(self, check, expected):
+        check.refresh_from_db()
+        self.assertEqual(check.remark_count, expected)
+        self.assertEqual(check.remark.count(), expected)
+
+    def assertActiveCheck(self, expected):
+        self.student.refresh_from_db()
+        self.assertEqual(self.student.active_check, expected)
+
+    def test_remark_count_follows_remarks(self):
+        """Число замечаний меняется при добавлении и удалении замечаний."""
+        check = CheckOut.objects.create(student=self.student)
+        remark = self.add_remark(check)
+        self.add_remark(check)
+        self.assertRemarkCount(check, 2)
+        remark.delete()
+        self.assertRemarkCount(check, 1)
+        Remark.objects.bulk_create([
+            Remark(section=cts.REMARK_SECTION, text=str(number),
+                   check_out=check)
+            for number in range(3)
+        ])
+        self.assertRemarkCount(check, 4)
+
+    def test_submission_number_is_per_student(self):
+        """Номер попытки считается отдельно для каждого студента."""
+        first = CheckOut.objects.create(student=self.student)
+        CheckOut.objects.create(student=self.other_student)
+        second = CheckOut.objects.create(student=self.student)
+        CheckOut.objects.bulk_create(
+            [CheckOut(student=self.student, status=True) for _ in range(2)]
+        )
+        self.assertEqual(first.submission_number, 1)
+        self.assertEqual(second.submission_number, 2)
+        self.assertEqual(
+            sorted(CheckOut.objects.filter(
+                student=self.student
+            ).values_list('submission_number', flat=True)),
+            [1, 2, 3, 4],
+        )
+
+    def test_active_check_pointer(self):
+        """Указатель на активную заявку следует за статусом заявок."""
+        self.assertActiveCheck(None)
+        check = CheckOut.objects.create(student=self.student)
+        self.assertActiveCheck(check)
+        check.status = True
+        check.save()
+        self.assertActiveCheck(None)
+        CheckOut.objects.filter(pk=check.pk).update(status=False)
+        self.assertActiveCheck(check)
+        check.delete()
+        self.assertActiveCheck(None)
+
+    def test_backfill_counters(self):
+        """Команда backfill_counters восстанавливает денормализованные поля."""
+        check = CheckOut.objects.create(student=self.student)
+        self.add_remark(check)
+        CheckOut.objects.filter(pk=check.pk).update(
+            remark_count=0, submission_number=0
+        )
+        User.objects.update(active_check=None)
+        call_command('backfill_counters', stdout=StringIO())
+        self.assertRemarkCount(check, 1)
+        self.assertEqual(check.submission_number, 1)
+        self.assertActiveCheck(check)
+
+    def test_check_view_reads_counters_from_check_row(self):
+        """Страница заявки не считает замечания и попытки отдельно."""
+        controller = User.objects.create(
+            username=cts.USERNAME_3, allow_manage=True
+        )
+        check = CheckOut.objects.create(student=self.student)
+        for _ in range(3):
+            self.add_remark(check)
+        client = Client()
+        client.force_login(controller)
+        url = reverse(
+            'verify:check_view',
+            kwargs={'username': controller, 'check_id': check.id},
+        )
+        client.get(url)
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(url)
+        self.assertContains(response, 'Проверка №1.')
+        self.assertContains(response, 'Показать замечания (3)')
+        self.assertFalse(any(
+            'COUNT(' in query['sql'] for query in queries.captured_queries
+        ))
@@ -0,0 +1,159 @@
+import io
+import random
+import shutil
+import tempfile
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from normocontrol.settings.base import MEDIA_ROOT
+from users.models import Group
+from verify import diff, jobs
+from verify.models import CheckOut
+from verify.tests import constants as cts
+from verify.tests.utils import make_docx, make_paragraph
+
+User = get_user_model()
+
+THESIS = [f'Абзац {number}' for number in range(1, 21)]
+
+
+class DiffKeysTests(TestCase):
+    def assertValidScript(self, old, new, edits):
+        self.assertEqual(
+            [old[i] for op, i, _ in edits if op != 'insert'], old
+        )
+        self.assertEqual(
+            [new[j] for op, _, j in edits if op != 'delete'], new
+        )
+        for op, i, j in edits:
+            if op == 'equal':
+                self.assertEqual(old[i], new[j])
+
+    def test_edit_script_is_minimal(self):
+        """Сравнение находит кратчайший список правок."""
+        old, new = list('abcabba'), list('cbabac')
+        edits = diff.diff_keys(old, new)
+        self.assertValidScript(old, new, edits)
+        self.assertEqual(sum(op != 'equal' for op, _, _ in edits), 5)
+
+    def test_random_sequences(self):
+        """Список правок переводит старую последовательность в новую."""
+        generator = random.Random(0)
+        for _ in range(200):
+            old = generator.choices('abc', k=generator.randint(0, 10))
+            new = generator.choices('abc', k=generator.randint(0, 10))
+            self.assertValidScript(old, new, diff.diff_keys(old, new))
+
+    def test_large_distance_falls_back_to_replacement(self):
+        """Слишком непохожие документы считаются замененными целиком."""
+        old = [str(number) for number in range(3000)]
+        new = [str(-number) for number in range(1, 3001)]
+        edits = diff.diff_keys(old, new)
+        self.assertValidScript(old, new, edits)
+        self.assertNotIn('equal', {op for op, _, _ in edits})
+
+    def test_format_change_changes_key(self):
+        """Ключ абзаца учитывает оформление, а не только текст."""
+        plain, bold = diff.extract_paragraphs(io.BytesIO(make_docx([
+            make_paragraph('Текст'), make_paragraph('Текст', bold=True),
+        ])))
+        self.assertEqual(plain[1], bold[1])
+        self.assertNotEqual(plain[0], bold[0])
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class ChangesViewTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        settings.MEDIA_ROOT = tempfile.mkdtemp(dir=settings.BASE_DIR)
+        cls.group = Group.objects.create(
+            title=cts.GROUP_1_TITLE,
+            slug=cts.GROUP_1_SLUG,
+        )
+        cls.student = User.objects.create(
+            username=cts.USERNAME_1,
+            group=cls.group,
+        )
+        cls.controller = User.objects.create(
+            username=cts.USERNAME_3,
+            allow_manage=True,
+        )
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(settings.MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        self.client = Client()
+        self.client.force_login(ChangesViewTests.controller)
+
+    def submit(self, paragraphs):
+        check = CheckOut(student=ChangesViewTests.student)
+        check.docx_file.save(
+            cts.DOCX_FILE_NAME, ContentFile(make_docx(paragraphs)), save=False
+        )
+        check.save()
+        return check
+
+    def changes(self, check):
+        response = self.client.get(reverse('verify:check_changes', kwargs={
+            'username': ChangesViewTests.controller, 'check_id': check.id,
+        }))
+        self.assertEqual(response.status_code, 200)
+        return response.context['changes']
+
+    def test_only_changed_paragraphs_are_shown(self):
+        """Показываются измененные абзацы и их ближайшее окружение."""
+        first = self.submit(THESIS)
+        self.assertIsNone(self.changes(first))
+        self.client.get(reverse('verify:check_archive', kwargs={
+            'username': ChangesViewTests.controller, 'check_id': first.id,
+        }))
+        jobs.run_pending()
+        first.refresh_from_db()
+        self.assertFalse(first.docx_file)
+
+        revised = list(THESIS)
+        revised[4] = 'Исправленный абзац 5'
+        revised[15] = make_paragraph(THESIS[15], bold=True)
+        second = self.submit(revised)
+        changes = self.changes(second)
+        self.assertEqual(changes['previous'], first)
+        hunks = changes['hunks']
+        self.assertEqual(len(hunks), 2)
+        self.assertEqual(
+            [(line['op'], line['number']) for line in hunks[0]],
+            [('equal', 4), ('delete', 5), ('insert', 5), ('equal', 6)],
+        )
+        self.assertFalse(hunks[0][1]['format_only'])
+        self.assertTrue(all(
+            line['format_only'] for line in hunks[1] if line['op'] != 'equal'
+        ))
+
+    def test_diff_is_cached(self):
+        """Сравнение пары документов выполняется один раз."""
+        first = self.submit(THESIS)
+        second = self.submit(THESIS[:-1])
+        self.assertEqual(len(self.changes(second)['hunks']), 1)
+        path = diff.diff_path(first.docx_sha256, second.docx_sha256)
+        default_storage.delete(path)
+        default_storage.save(path, ContentFile(b'[]'))
+        self.assertEqual(self.changes(second)['hunks'], [])
+
+    def test_other_student_has_no_access(self):
+        """Студент не видит изменения в чужой работе."""
+        check = self.submit(THESIS)
+        other = User.objects.create(username=cts.USERNAME_2)
+        client = Client()
+        client.force_login(other)
+        response = client.get(reverse('verify:check_changes', kwargs={
+            'username': other, 'check_id': check.id,
+        }))
+        self.assertEqual(response.status_code, 404)
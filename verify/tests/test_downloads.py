@@ -0,0 +1,124 @@
+import shutil
+import tempfile
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.files.base import ContentFile
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from normocontrol.settings.base import MEDIA_ROOT
+from verify.models import CheckOut
+from verify.tests import constants as cts
+from verify.tests.utils import make_pdf
+
+User = get_user_model()
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class DownloadTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        settings.MEDIA_ROOT = tempfile.mkdtemp(dir=settings.BASE_DIR)
+        cls.student = User.objects.create(username=cts.USERNAME_1)
+        cls.student_2 = User.objects.create(username=cts.USERNAME_2)
+        cls.controller = User.objects.create(
+            username=cts.USERNAME_3,
+            allow_manage=True,
+        )
+        cls.pdf = make_pdf()
+        cls.check = CheckOut(student=cls.student)
+        cls.check.pdf_file.save(
+            cts.PDF_FILE_NAME, ContentFile(cls.pdf), save=False
+        )
+        cls.check.save()
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(settings.MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def download(self, user, kind='pdf', **headers):
+        client = Client()
+        client.force_login(user)
+        url = reverse(
+            'verify:check_download',
+            args=[user.username, DownloadTests.check.id, kind],
+        )
+        return client.get(url, **headers)
+
+    def test_access(self):
+        """Файл получают владелец и нормоконтроллер."""
+        cases = [
+            (DownloadTests.student, 'pdf', 200),
+            (DownloadTests.controller, 'pdf', 200),
+            (DownloadTests.student_2, 'pdf', 404),
+            (DownloadTests.student, 'docx', 404),
+            (DownloadTests.student, 'exe', 404),
+        ]
+        for user, kind, status in cases:
+            with self.subTest(user=user, kind=kind):
+                response = self.download(user, kind)
+                self.assertEqual(response.status_code, status)
+        response = self.download(DownloadTests.student)
+        self.assertEqual(b''.join(response.streaming_content), self.pdf)
+        self.assertEqual(response['Content-Type'], 'application/pdf')
+
+    def test_range(self):
+        """Запрос части файла отдает только запрошенные байты."""
+        size = len(self.pdf)
+        cases = [
+            ('bytes=0-9', 0, 9),
+            ('bytes=10-', 10, size - 1),
+            ('bytes=-5', size - 5, size - 1),
+            (f'bytes=5-{size + 100}', 5, size - 1),
+        ]
+        for header, start, end in cases:
+            with self.subTest(header=header):
+                response = self.download(
+                    DownloadTests.student, HTTP_RANGE=header
+                )
+                self.assertEqual(response.status_code, 206)
+                self.assertEqual(
+                    response['Content-Range'], f'bytes {start}-{end}/{size}'
+                )
+                self.assertEqual(
+                    b''.join(response.streaming_content),
+                    self.pdf[start:end + 1],
+                )
+        response = self.download(
+            DownloadTests.student, HTTP_RANGE=f'bytes={size}-'
+        )
+        self.assertEqual(response.status_code, 416)
+        response = self.download(
+            DownloadTests.student, HTTP_RANGE='bytes=0-9',
+            HTTP_IF_RANGE='"stale"',
+        )
+        self.assertEqual(response.status_code, 200)
+
+    def test_not_modified(self):
+        etag = self.download(DownloadTests.student)['ETag']
+        self.assertIn(DownloadTests.check.pdf_sha256, etag)
+        response = self.download(
+            DownloadTests.student, HTTP_IF_NONE_MATCH=etag
+        )
+        self.assertEqual(response.status_code, 304)
+
+    @override_settings(PROTECTED_MEDIA_SERVER='nginx',
+                       PROTECTED_MEDIA_URL='/protected-media/')
+    def test_accel_redirect(self):
+        """За nginx представление только разрешает передачу файла."""
+        response = self.download(DownloadTests.controller)
+        self.assertEqual(
+            response['X-Accel-Redirect'],
+            f'/protected-media/{DownloadTests.check.pdf_file.name}',
+        )
+        self.assertEqual(response.content, b'')
+
+    @override_settings(PROTECTED_MEDIA_SERVER='sendfile')
+    def test_sendfile(self):
+        response = self.download(DownloadTests.controller)
+        self.assertEqual(
+            response['X-Sendfile'], DownloadTests.check.pdf_file.path
+        )
@@ -10,6 +10,7 @@ from django.urls import reverse
 
 from normocontrol.settings.base import MEDIA_ROOT
 from users.models import Group
+from verify.constants import REMARK_DUPLICATE_ERROR
 from verify.models import CheckOut, Remark
 from verify.tests import constants as cts
 
@@ -353,7 +354,7 @@ class VerifyFormTests(TestCase):
             'paragraph': cts.REMARK_PARAGRAPH,
             'check_all': True,
             'custom_error': cts.REMARK_TEXT,
-            'err_main_1': True,
+            'err_101': True,
         }
         response = self.controller_client.post(
             VerifyFormTests.urls_need_access['add_remark'],
@@ -400,3 +401,51 @@ class VerifyFormTests(TestCase):
                 }
             )
         )
+
+    def test_new_remark_repeated_submit_does_not_duplicate(self):
+        """Повторная отправка формы не создает одинаковых замечаний."""
+        remark_count = Remark.objects.count()
+        form_data = {
+            'section': cts.REMARK_SECTION,
+            'page_number': cts.REMARK_PAGE_NUMBER,
+            'paragraph': cts.REMARK_PARAGRAPH,
+            'custom_error': cts.REMARK_TEXT,
+            'err_101': True,
+            'err_102': True,
+        }
+        for _ in range(2):
+            self.controller_client.post(
+                VerifyFormTests.urls_need_access['add_remark'],
+                data=form_data,
+            )
+        self.assertEqual(remark_count + 3, Remark.objects.count())
+        VerifyFormTests.checkout.refresh_from_db()
+        self.assertEqual(
+            VerifyFormTests.checkout.remark_count,
+            remark_count + 3
+        )
+
+    def test_edit_remark_duplicate_shows_error(self):
+        """Редактирование в копию другого замечания выводит ошибку формы."""
+        Remark.objects.create(
+            section=cts.REMARK_SECTION_2,
+            page_number=cts.REMARK_PAGE_NUMBER_2,
+            paragraph=cts.REMARK_PARAGRAPH_2,
+            text=cts.REMARK_TEXT_2,
+            check_out=VerifyFormTests.checkout
+        )
+        form_data = {
+            'section': cts.REMARK_SECTION_2,
+            'page_number': cts.REMARK_PAGE_NUMBER_2,
+            'paragraph': cts.REMARK_PARAGRAPH_2,
+            'text': cts.REMARK_TEXT_2,
+        }
+        response = self.controller_client.post(
+            VerifyFormTests.urls_need_access['edit_remark'],
+            data=form_data,
+        )
+        self.assertFormError(
+            response, 'form', None, REMARK_DUPLICATE_ERROR
+        )
+        VerifyFormTests.remark.refresh_from_db()
+        self.assertEqual(VerifyFormTests.remark.text, cts.REMARK_TEXT)
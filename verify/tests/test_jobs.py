@@ -0,0 +1,143 @@
+import shutil
+import tempfile
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from normocontrol.settings.base import MEDIA_ROOT
+from verify import jobs
+from verify.models import CheckOut, Job
+from verify.tests import constants as cts
+
+User = get_user_model()
+
+CALLS = []
+
+
+@jobs.task('test_append')
+def append_task(value):
+    CALLS.append(value)
+
+
+@jobs.task('test_fail')
+def fail_task():
+    raise RuntimeError('test failure')
+
+
+@override_settings(JOB_RETRY_DELAY=10)
+class JobQueueTests(TestCase):
+    def setUp(self):
+        CALLS.clear()
+
+    def test_pending_job_is_executed(self):
+        """Готовая задача выполняется и помечается выполненной."""
+        job = jobs.enqueue('test_append', value=1)
+        self.assertEqual(jobs.run_pending(), 1)
+        job.refresh_from_db()
+        self.assertEqual(CALLS, [1])
+        self.assertEqual(job.status, Job.DONE)
+        self.assertEqual(job.attempts, 1)
+
+    def test_delayed_job_is_not_claimed(self):
+        """Задача с отложенным запуском не захватывается раньше времени."""
+        jobs.enqueue(
+            'test_append',
+            run_after=timezone.now() + timedelta(minutes=5),
+            value=1,
+        )
+        self.assertEqual(jobs.claim('test-worker'), [])
+
+    def test_failed_job_is_retried_with_backoff(self):
+        """Упавшая задача возвращается в очередь с растущей задержкой."""
+        job = jobs.enqueue('test_fail')
+        jobs.run_pending()
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.PENDING)
+        self.assertIn('test failure', job.last_error)
+        first_delay = job.run_after - timezone.now()
+        self.assertTrue(timedelta(seconds=5) < first_delay)
+        Job.objects.filter(pk=job.pk).update(run_after=timezone.now())
+        jobs.run_pending()
+        job.refresh_from_db()
+        second_delay = job.run_after - timezone.now()
+        self.assertTrue(second_delay > first_delay)
+
+    def test_job_fails_after_max_attempts(self):
+        """После исчерпания попыток задача помечается упавшей."""
+        job = jobs.enqueue('test_fail')
+        Job.objects.filter(pk=job.pk).update(max_attempts=1)
+        jobs.run_pending()
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.FAILED)
+
+    def test_expired_lease_is_reclaimed(self):
+        """Задачу с истекшей арендой может захватить другой обработчик."""
+        job = jobs.enqueue('test_append', value=1)
+        self.assertEqual(len(jobs.claim('worker-1')), 1)
+        self.assertEqual(jobs.claim('worker-2'), [])
+        Job.objects.filter(pk=job.pk).update(
+            locked_until=timezone.now() - timedelta(seconds=1)
+        )
+        claimed = jobs.claim('worker-2')
+        self.assertEqual([j.locked_by for j in claimed], ['worker-2'])
+        jobs.finish(job)
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.RUNNING)
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class EnqueueViewsTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        settings.MEDIA_ROOT = tempfile.mkdtemp(dir=settings.BASE_DIR)
+        cls.student = User.objects.create(username=cts.USERNAME_1)
+        cls.controller = User.objects.create(
+            username=cts.USERNAME_3,
+            allow_manage=True,
+        )
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(settings.MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def test_new_check_enqueues_jobs(self):
+        """Новая заявка ставит в очередь проверку, превью и индексацию."""
+        client = Client()
+        client.force_login(EnqueueViewsTests.student)
+        client.post(
+            reverse('verify:new_check', kwargs={'username': self.student}),
+            data={
+                'docx_file': SimpleUploadedFile(
+                    cts.DOCX_FILE_NAME, cts.DOCX_FILE_CONTENT
+                ),
+                'pdf_file': SimpleUploadedFile(
+                    cts.PDF_FILE_NAME, cts.PDF_FILE_CONTENT
+                ),
+            },
+        )
+        names = set(Job.objects.values_list('name', flat=True))
+        self.assertEqual(
+            names, {'check_layout', 'render_preview', 'index_document'}
+        )
+
+    def test_check_archive_enqueues_file_removal(self):
+        """Архивация заявки не удаляет файлы в запросе, а ставит задачу."""
+        check = CheckOut.objects.create(student=EnqueueViewsTests.student)
+        client = Client()
+        client.force_login(EnqueueViewsTests.controller)
+        client.get(reverse(
+            'verify:check_archive',
+            kwargs={'username': self.controller, 'check_id': check.id},
+        ))
+        job = Job.objects.get()
+        self.assertEqual(job.name, 'archive_check_files')
+        check.refresh_from_db()
+        self.assertTrue(check.status)
@@ -0,0 +1,70 @@
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.core.mail.backends.base import BaseEmailBackend
+from django.test import TestCase, override_settings
+
+from verify import jobs
+from verify.mail import deliver_outbox, notify_new_check, queue_mail
+from verify.models import Job, OutgoingEmail
+from verify.tests import constants as cts
+
+User = get_user_model()
+
+
+class FailingBackend(BaseEmailBackend):
+    def send_messages(self, email_messages):
+        raise ConnectionError('SMTP недоступен')
+
+
+class OutboxTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.student = User.objects.create(username=cts.USERNAME_1)
+        User.objects.create(
+            username=cts.USERNAME_2,
+            email='admin1@email.ru',
+            is_superuser=True,
+        )
+        User.objects.create(
+            username=cts.USERNAME_3,
+            email='admin2@email.ru',
+            is_superuser=True,
+        )
+
+    def test_notify_new_check_writes_outbox(self):
+        """Уведомление записывается в очередь, а не отправляется сразу."""
+        notify_new_check(OutboxTests.student)
+        self.assertEqual(OutgoingEmail.objects.count(), 2)
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(
+            Job.objects.filter(name='deliver_outbox').count(), 1
+        )
+
+    def test_worker_delivers_all_pending_messages(self):
+        """Обработчик очереди отправляет все ожидающие письма."""
+        notify_new_check(OutboxTests.student)
+        jobs.run_pending()
+        self.assertEqual(len(mail.outbox), 2)
+        self.assertEqual(
+            set(m.to[0] for m in mail.outbox),
+            {'admin1@email.ru', 'admin2@email.ru'},
+        )
+        self.assertFalse(
+            OutgoingEmail.objects.exclude(status=OutgoingEmail.SENT).exists()
+        )
+
+    @override_settings(
+        EMAIL_BACKEND='verify.tests.test_mail.FailingBackend'
+    )
+    def test_failed_delivery_is_rescheduled(self):
+        """При недоступном SMTP письма остаются в очереди для повтора."""
+        queue_mail('Тема', 'Текст', ['user@email.ru'])
+        Job.objects.all().delete()
+        self.assertEqual(deliver_outbox(), 0)
+        email = OutgoingEmail.objects.get()
+        self.assertEqual(email.status, OutgoingEmail.PENDING)
+        self.assertEqual(email.attempts, 1)
+        self.assertIn('SMTP', email.last_error)
+        retry_job = Job.objects.get(name='deliver_outbox')
+        self.assertEqual(retry_job.run_after, email.next_attempt)
@@ -2,7 +2,11 @@ from django.contrib.auth import get_user_model
 from django.test import TestCase
 
 from users.models import CustomUser, Group
-from verify.models import CheckOut, Remark
+from verify import constants as verify_cts
+from verify.forms import RemarkEditForm, RemarkStandartErrorForm
+from verify.models import (
+    STANDARD_REMARK_CODES, CheckOut, Remark, RemarkType, standard_remarks,
+)
 from verify.tests import constants as cts
 
 User = get_user_model()
@@ -114,3 +118,65 @@ class VerifyModelTest(TestCase):
             with self.subTest(value=value):
                 field = VerifyModelTest.remark._meta.get_field(value)
                 self.assertEqual(field.help_text, expected)
+
+
+class RemarkTypeTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.student = CustomUser.objects.create(username=cts.USERNAME_1)
+        cls.checkout = CheckOut.objects.create(student=cls.student)
+
+    def test_catalogue_matches_constants(self):
+        """Каталог, заполненный миграцией, совпадает с constants.py."""
+        self.assertEqual(
+            list(RemarkType.objects.values_list('code', 'category', 'text')),
+            list(standard_remarks()),
+        )
+        self.assertEqual(
+            STANDARD_REMARK_CODES[verify_cts.ERROR_TABLE_3], 503
+        )
+
+    def test_standard_form_is_built_from_catalogue(self):
+        """Форма содержит по флажку на каждое показываемое замечание."""
+        RemarkType.objects.filter(code=101).update(is_active=False)
+        form = RemarkStandartErrorForm({'err_102': True, 'err_101': True})
+        self.assertTrue(form.is_valid())
+        self.assertNotIn('err_101', form.fields)
+        self.assertEqual(
+            [remark_type.code for remark_type in form.selected_types()],
+            [102],
+        )
+        self.assertEqual(
+            len(form.fields), RemarkType.objects.filter(is_active=True).count()
+        )
+
+    def test_standard_remark_text_comes_from_catalogue(self):
+        """Стандартное замечание не хранит копию текста."""
+        remark = Remark.objects.create(
+            check_out=RemarkTypeTests.checkout,
+            section=cts.REMARK_SECTION,
+            remark_type_id=STANDARD_REMARK_CODES[verify_cts.ERROR_LINK_2],
+        )
+        remark.refresh_from_db()
+        self.assertEqual(remark.text, '')
+        self.assertEqual(remark.message, verify_cts.ERROR_LINK_2)
+
+    def test_edit_form_requires_type_or_text(self):
+        """При правке нужно выбрать замечание из каталога или ввести текст."""
+        remark = Remark.objects.create(
+            check_out=RemarkTypeTests.checkout,
+            section=cts.REMARK_SECTION,
+            text=cts.REMARK_TEXT,
+        )
+        data = {'section': cts.REMARK_SECTION}
+        self.assertFalse(RemarkEditForm(data, instance=remark).is_valid())
+        form = RemarkEditForm(
+            dict(data, remark_type=202, text=cts.REMARK_TEXT),
+            instance=remark,
+        )
+        self.assertTrue(form.is_valid())
+        form.save()
+        remark.refresh_from_db()
+        self.assertEqual(remark.remark_type_id, 202)
+        self.assertEqual(remark.text, '')
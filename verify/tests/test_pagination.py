@@ -0,0 +1,82 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from users.models import Group
+from verify.models import CheckOut
+from verify.pagination import NUMBERED_PAGES, PER_PAGE
+from verify.tests import constants as cts
+
+User = get_user_model()
+
+CHECKS_COUNT = PER_PAGE * NUMBERED_PAGES + 25
+
+
+class KeysetPaginationTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.group = Group.objects.create(
+            title=cts.GROUP_1_TITLE,
+            slug=cts.GROUP_1_SLUG,
+        )
+        cls.student = User.objects.create(
+            username=cts.USERNAME_1,
+            group=cls.group,
+        )
+        CheckOut.objects.bulk_create(
+            [CheckOut(student=cls.student, status=True, info=str(i))
+             for i in range(CHECKS_COUNT)]
+        )
+        cls.url = reverse('verify:archive', kwargs={'username': cls.student})
+        cls.expected = list(
+            CheckOut.objects.order_by('check_date', 'id')
+            .values_list('id', flat=True)
+        )
+
+    def setUp(self):
+        self.client = Client()
+        self.client.force_login(KeysetPaginationTests.student)
+
+    def get_page(self, query=None):
+        response = self.client.get(self.url, query or {})
+        return response.context['page']
+
+    def test_last_numbered_page_links_to_cursor(self):
+        """Последняя нумерованная страница ведет дальше по токену."""
+        page = self.get_page({'page': NUMBERED_PAGES})
+        self.assertEqual(page.paginator.num_pages, NUMBERED_PAGES)
+        self.assertFalse(page.has_next())
+        self.assertIsNotNone(page.next_cursor)
+
+    def test_cursor_walk_covers_all_checks(self):
+        """Переход по токенам вперед и назад проходит все заявки по порядку."""
+        page = self.get_page({'page': NUMBERED_PAGES})
+        seen = [item.id for item in page]
+        cursor_pages = []
+        while page.next_cursor:
+            page = self.get_page({'cursor': page.next_cursor})
+            cursor_pages.append([item.id for item in page])
+            seen += cursor_pages[-1]
+        self.assertEqual(seen, self.expected[-len(seen):])
+        self.assertEqual(seen[-1], self.expected[-1])
+        previous = self.get_page({'cursor': page.previous_cursor})
+        self.assertEqual([item.id for item in previous], cursor_pages[-2])
+
+    def test_cursor_page_has_no_count_or_offset(self):
+        """Страница по токену читается без COUNT(*) и OFFSET."""
+        page = self.get_page({'page': NUMBERED_PAGES})
+        with CaptureQueriesContext(connection) as queries:
+            self.get_page({'cursor': page.next_cursor})
+        sql = ' '.join(
+            query['sql'] for query in queries.captured_queries
+        ).upper()
+        self.assertNotIn('COUNT(', sql)
+        self.assertNotIn('OFFSET', sql)
+
+    def test_forged_cursor_shows_first_page(self):
+        """Поддельный токен приводит к первой странице."""
+        page = self.get_page({'cursor': 'forged'})
+        self.assertEqual(page.number, 1)
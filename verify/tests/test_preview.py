@@ -0,0 +1,179 @@
+import io
+import shutil
+import tempfile
+import unittest
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+from PIL import Image
+
+from normocontrol.settings.base import MEDIA_ROOT
+from users.models import Group
+from verify import preview
+from verify.models import CheckOut, Job
+from verify.tests import constants as cts
+from verify.tests.utils import make_pdf
+
+User = get_user_model()
+
+MISSING_BINARY = '/nonexistent/pdftoppm'
+
+
+def make_png():
+    image = io.BytesIO()
+    Image.new('RGB', (20, 30), 'white').save(image, 'PNG')
+    return image.getvalue()
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class PdfPreviewTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        settings.MEDIA_ROOT = tempfile.mkdtemp(dir=settings.BASE_DIR)
+        cls.group = Group.objects.create(
+            title=cts.GROUP_1_TITLE,
+            slug=cts.GROUP_1_SLUG,
+        )
+        cls.student = User.objects.create(
+            username=cts.USERNAME_1,
+            group=cls.group,
+        )
+        cls.controller = User.objects.create(
+            username=cts.USERNAME_3,
+            allow_manage=True,
+        )
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(settings.MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        self.client = Client()
+        self.client.force_login(PdfPreviewTests.controller)
+
+    def make_check(self, content=None):
+        check = CheckOut(student=PdfPreviewTests.student)
+        check.pdf_file.save(
+            cts.PDF_FILE_NAME, ContentFile(content or make_pdf()), save=False
+        )
+        check.save()
+        return check
+
+    def store_rendered(self, check, pages):
+        digest = preview.file_sha256(check.pdf_file)
+        for page_number in range(1, pages + 1):
+            for thumb in (False, True):
+                default_storage.save(
+                    preview.page_path(digest, page_number, thumb),
+                    ContentFile(make_png()),
+                )
+        CheckOut.objects.filter(pk=check.pk).update(
+            pdf_sha256=digest, preview_pages=pages
+        )
+        check.refresh_from_db()
+
+    def preview_url(self, check, page_number, name='check_preview'):
+        return reverse(f'verify:{name}', kwargs={
+            'username': PdfPreviewTests.controller,
+            'check_id': check.id,
+            'digest': check.pdf_sha256,
+            'page_number': page_number,
+        })
+
+    def test_page_is_served_with_long_cache_lifetime(self):
+        """Изображение страницы отдается с долгим сроком кеширования."""
+        check = self.make_check()
+        self.store_rendered(check, pages=2)
+        for name in ('check_preview', 'check_preview_thumb'):
+            response = self.client.get(self.preview_url(check, 2, name))
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response['Content-Type'], 'image/png')
+            self.assertIn('immutable', response['Cache-Control'])
+            self.assertIn(
+                f'max-age={365 * 24 * 60 * 60}', response['Cache-Control']
+            )
+            response.close()
+        response = self.client.get(self.preview_url(check, 3))
+        self.assertEqual(response.status_code, 404)
+
+    def test_other_student_has_no_access(self):
+        """Студент не видит чужую заявку и изображения ее страниц."""
+        check = self.make_check()
+        self.store_rendered(check, pages=1)
+        other = User.objects.create(username=cts.USERNAME_2)
+        client = Client()
+        client.force_login(other)
+        urls = [
+            reverse('verify:check_preview', kwargs={
+                'username': other, 'check_id': check.id,
+                'digest': check.pdf_sha256, 'page_number': 1,
+            }),
+            reverse('verify:check_view', kwargs={
+                'username': other, 'check_id': check.id,
+            }),
+        ]
+        for url in urls:
+            with self.subTest(url=url):
+                self.assertEqual(client.get(url).status_code, 404)
+
+    def test_check_view_shows_pages_instead_of_external_viewer(self):
+        """Страница заявки показывает свои изображения страниц."""
+        check = self.make_check()
+        self.store_rendered(check, pages=1)
+        response = self.client.get(reverse('verify:check_view', kwargs={
+            'username': PdfPreviewTests.controller, 'check_id': check.id,
+        }))
+        self.assertContains(response, self.preview_url(check, 1))
+        self.assertNotContains(response, 'docs.google.com')
+
+    def test_check_view_schedules_missing_preview_once(self):
+        """Заявка без превью ставит его построение в очередь один раз."""
+        check = self.make_check()
+        url = reverse('verify:check_view', kwargs={
+            'username': PdfPreviewTests.controller, 'check_id': check.id,
+        })
+        self.client.get(url)
+        self.client.get(url)
+        self.assertEqual(
+            Job.objects.filter(name='render_preview').count(), 1
+        )
+
+    @override_settings(PDFTOPPM_BINARY=MISSING_BINARY)
+    def test_same_pdf_reuses_rendered_pages(self):
+        """Для уже растеризованного PDF страницы не строятся заново."""
+        self.store_rendered(self.make_check(), pages=3)
+        check = self.make_check()
+        preview.render_preview(check)
+        check.refresh_from_db()
+        self.assertEqual(check.preview_pages, 3)
+
+    @override_settings(PDFTOPPM_BINARY=MISSING_BINARY)
+    def test_render_failure_falls_back_to_download_link(self):
+        """Без растеризатора превью помечается пустым."""
+        check = self.make_check()
+        preview.render_preview(check)
+        check.refresh_from_db()
+        self.assertEqual(check.preview_pages, 0)
+        self.assertEqual(check.pdf_sha256, preview.file_sha256(check.pdf_file))
+
+    @unittest.skipUnless(
+        shutil.which(preview.PDFTOPPM_BINARY), 'pdftoppm не установлен'
+    )
+    def test_render_preview(self):
+        """PDF растеризуется в полноразмерные страницы и миниатюры."""
+        check = self.make_check(make_pdf(pages=2))
+        preview.render_preview(check)
+        check.refresh_from_db()
+        self.assertEqual(check.preview_pages, 2)
+        thumb = preview.page_path(check.pdf_sha256, 2, thumb=True)
+        with default_storage.open(thumb) as image_file:
+            with Image.open(image_file) as image:
+                self.assertLessEqual(
+                    image.width, preview.PREVIEW_THUMB_WIDTH
+                )
@@ -0,0 +1,152 @@
+import re
+
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import Client, TestCase, tag
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from users.models import Group
+from verify import search
+from verify.models import CheckOut, Remark
+from verify.tests import constants as cts
+
+User = get_user_model()
+
+STUDENTS_COUNT = 200
+CHECKS_PER_STUDENT = 20
+REMARKS_PER_CHECK = 5
+# Таблицы, полный просмотр которых считается регрессией
+TABLES = ('verify_checkout', 'verify_remark')
+SQLITE_SCAN = re.compile(
+    r'\bSCAN (?:TABLE )?"?({})"?(?! USING)'.format('|'.join(TABLES))
+)
+
+
+@tag('benchmark')
+class QueryPlanTests(TestCase):
+    """Проверяет, что запросы страниц заявок используют индексы.
+
+    Тест заполняет БД синтетическими данными, выполняет страницы списка
+    заявок, архива и проверки и смотрит план каждого запроса к таблицам
+    заявок и замечаний через EXPLAIN.
+    """
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.group = Group.objects.create(
+            title=cts.GROUP_1_TITLE,
+            slug=cts.GROUP_1_SLUG,
+        )
+        cls.controller = User.objects.create(
+            username=cts.USERNAME_3,
+            allow_manage=True,
+        )
+        User.objects.bulk_create(
+            User(username=f'student-{number}', group=cls.group)
+            for number in range(STUDENTS_COUNT)
+        )
+        students = list(User.objects.filter(allow_manage=False))
+        CheckOut.objects.bulk_create(
+            CheckOut(
+                student=student,
+                status=number != CHECKS_PER_STUDENT - 1,
+                info=str(number),
+            )
+            for student in students
+            for number in range(CHECKS_PER_STUDENT)
+        )
+        Remark.objects.bulk_create(
+            Remark(
+                section=cts.REMARK_SECTION,
+                text=f'{cts.REMARK_TEXT} {number}',
+                check_out_id=check_id,
+            )
+            for check_id in CheckOut.objects.values_list('id', flat=True)
+            for number in range(REMARKS_PER_CHECK)
+        )
+        # Массовая вставка оставляет индексацию задачам, здесь индекс
+        # строится сразу
+        call_command('rebuild_search_index', stdout=StringIO())
+        cls.student = students[0]
+        cls.check = CheckOut.objects.filter(student=cls.student).last()
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+
+    def explain(self, sql):
+        if connection.vendor == 'sqlite':
+            sql = f'EXPLAIN QUERY PLAN {sql}'
+        else:
+            sql = f'EXPLAIN {sql}'
+        with connection.cursor() as cursor:
+            cursor.execute(sql)
+            return '\n'.join(' '.join(map(str, row)) for row in cursor)
+
+    def assertIndexScans(self, user, url):
+        client = Client()
+        client.force_login(user)
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(url)
+        self.assertEqual(response.status_code, 200)
+        checked = 0
+        for query in queries.captured_queries:
+            sql = query['sql']
+            if not sql.startswith('SELECT') or not any(
+                f'"{table}"' in sql for table in TABLES
+            ):
+                continue
+            plan = self.explain(sql)
+            checked += 1
+            with self.subTest(sql=sql):
+                if connection.vendor == 'sqlite':
+                    self.assertIsNone(SQLITE_SCAN.search(plan), plan)
+                else:
+                    for table in TABLES:
+                        self.assertNotIn(f'Seq Scan on {table}', plan)
+        self.assertTrue(checked)
+
+    def test_check_list_uses_indexes(self):
+        """Список активных заявок читается по индексу."""
+        self.assertIndexScans(self.controller, reverse(
+            'verify:check_list', kwargs={'username': self.controller}
+        ))
+
+    def test_archive_uses_indexes(self):
+        """Архив заявок читается по индексу, в том числе архив студента."""
+        self.assertIndexScans(self.controller, reverse(
+            'verify:archive', kwargs={'username': self.controller}
+        ))
+        self.assertIndexScans(self.student, reverse(
+            'verify:archive', kwargs={'username': self.student}
+        ))
+
+    def test_check_view_uses_indexes(self):
+        """Страница проверки читает заявку и замечания по индексам."""
+        self.assertIndexScans(self.controller, reverse(
+            'verify:check_view',
+            kwargs={'username': self.controller, 'check_id': self.check.id},
+        ))
+
+    def test_remark_search_uses_fulltext_index(self):
+        """Поиск по замечаниям читает полнотекстовый индекс."""
+        client = Client()
+        client.force_login(self.controller)
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(
+                reverse('verify:search_api'), {'q': cts.REMARK_TEXT}
+            )
+        self.assertEqual(len(response.json()['results']), 10)
+        sql = next(
+            query['sql'] for query in queries.captured_queries
+            if search.REMARK_INDEX in query['sql']
+            or 'to_tsvector' in query['sql']
+        )
+        plan = self.explain(sql)
+        if connection.vendor == 'sqlite':
+            self.assertIn('VIRTUAL TABLE', plan)
+            self.assertNotRegex(plan, r'\bSCAN r\b')
+        else:
+            self.assertNotIn('Seq Scan on verify_remark', plan)
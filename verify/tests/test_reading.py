@@ -0,0 +1,162 @@
+import os
+import shutil
+import tempfile
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from normocontrol.settings.base import MEDIA_ROOT
+from users.models import Group
+from verify import jobs, reading
+from verify.models import CheckOut
+from verify.tests import constants as cts
+from verify.tests.test_preview import make_png
+from verify.tests.utils import make_docx, make_image_paragraph
+
+User = get_user_model()
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class ReadingViewTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        settings.MEDIA_ROOT = tempfile.mkdtemp(dir=settings.BASE_DIR)
+        cls.group = Group.objects.create(
+            title=cts.GROUP_1_TITLE,
+            slug=cts.GROUP_1_SLUG,
+        )
+        cls.student = User.objects.create(
+            username=cts.USERNAME_1,
+            group=cls.group,
+        )
+        cls.controller = User.objects.create(
+            username=cts.USERNAME_3,
+            allow_manage=True,
+        )
+        cls.image = make_png()
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(settings.MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        shutil.rmtree(
+            os.path.join(settings.MEDIA_ROOT, reading.READING_DIR),
+            ignore_errors=True,
+        )
+        self.client = Client()
+        self.client.force_login(ReadingViewTests.controller)
+        self.check = CheckOut(student=ReadingViewTests.student)
+        self.check.docx_file.save(cts.DOCX_FILE_NAME, ContentFile(make_docx(
+            ['Пояснительная записка', make_image_paragraph('rId5')],
+            images={'rId5': ReadingViewTests.image},
+        )), save=False)
+        self.check.save()
+
+    def url(self, view='check_reading', user=None, **kwargs):
+        return reverse(f'verify:{view}', kwargs=dict(
+            username=user or ReadingViewTests.controller,
+            check_id=self.check.id,
+            **kwargs,
+        ))
+
+    def read(self):
+        response = self.client.get(self.url())
+        self.assertEqual(response.status_code, 200)
+        return b''.join(response.streaming_content).decode()
+
+    def test_docx_is_converted_once(self):
+        """DOCX преобразуется при первом просмотре, затем читается из кеша."""
+        self.assertIn('Пояснительная записка', self.read())
+        self.check.refresh_from_db()
+        path = reading.reading_path(self.check.docx_sha256)
+        default_storage.delete(path)
+        default_storage.save(path, ContentFile(b'<p>cached</p>'))
+        self.assertIn('<p>cached</p>', self.read())
+
+    def test_images_are_extracted_to_files(self):
+        """Изображения сохраняются файлами, а не data URI."""
+        page = self.read()
+        self.assertNotIn('data:image', page)
+        self.assertIn('src="img-1.png"', page)
+        response = self.client.get(
+            self.url('check_reading_image', name='img-1.png')
+        )
+        self.assertEqual(response['Content-Type'], 'image/png')
+        self.assertEqual(b''.join(response.streaming_content), self.image)
+        self.assertIn('immutable', response['Cache-Control'])
+        self.assertEqual(response['X-Content-Type-Options'], 'nosniff')
+        response = self.client.get(
+            self.url('check_reading_image', name='..%2Findex.html')
+        )
+        self.assertEqual(response.status_code, 404)
+
+    def test_markup_is_sanitized(self):
+        """Из HTML документа удаляются сценарии и опасные ссылки."""
+        html = reading.sanitize(
+            '<p onclick="x()">Текст &lt;b&gt;<script>alert(1)</script></p>'
+            '<a href="javascript:alert(1)">a</a>'
+            '<a href="https://example.com/?a=1&amp;b=2">b</a>'
+            '<a href="#footnote-1" id="ref">c</a>'
+            '<img src="https://example.com/x.png"><img src="img-2.jpg">'
+            '<iframe src="x"></iframe><table><tr><td colspan="2">d'
+            '</td></tr></table>'
+        )
+        self.assertEqual(
+            html,
+            '<p>Текст &lt;b&gt;</p><a>a</a>'
+            '<a href="https://example.com/?a=1&amp;b=2">b</a>'
+            '<a href="#footnote-1" id="ref">c</a><img src="img-2.jpg">'
+            '<table><tr><td colspan="2">d</td></tr></table>'
+        )
+
+    def test_other_student_has_no_access(self):
+        """Студент не может читать чужую работу."""
+        other = User.objects.create(username=cts.USERNAME_2)
+        client = Client()
+        client.force_login(other)
+        for view, kwargs in (('check_reading', {}),
+                             ('check_reading_image', {'name': 'img-1.png'})):
+            with self.subTest(view=view):
+                response = client.get(self.url(view, user=other, **kwargs))
+                self.assertEqual(response.status_code, 404)
+
+    def test_cache_is_evicted_on_archive_and_delete(self):
+        """Кеш удаляется при архивации заявки и при ее удалении."""
+        self.read()
+        self.check.refresh_from_db()
+        path = reading.reading_path(self.check.docx_sha256)
+        self.client.get(self.url('check_archive'))
+        jobs.run_pending()
+        self.assertFalse(default_storage.exists(path))
+
+        self.setUp()
+        self.read()
+        self.check.refresh_from_db()
+        student_client = Client()
+        student_client.force_login(ReadingViewTests.student)
+        student_client.get(reverse('verify:check_delete', kwargs={
+            'username': ReadingViewTests.student, 'check_id': self.check.id,
+        }))
+        self.assertFalse(default_storage.exists(path))
+
+    def test_broken_docx_is_not_found(self):
+        """Поврежденный DOCX не открывается для чтения."""
+        broken_xml = make_docx(['<w:p>'])
+        for content in (cts.BROKEN_FILE_CONTENT, broken_xml):
+            with self.subTest(content=content[:10]):
+                self.check.docx_file.save(
+                    cts.DOCX_FILE_NAME, ContentFile(content)
+                )
+                CheckOut.objects.filter(id=self.check.id).update(
+                    docx_sha256=''
+                )
+                self.check.docx_sha256 = ''
+                response = self.client.get(self.url())
+                self.assertEqual(response.status_code, 404)
@@ -0,0 +1,178 @@
+import datetime
+import shutil
+import tempfile
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.files.base import ContentFile
+from django.db import connection
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from normocontrol.settings.base import MEDIA_ROOT
+from users.models import Group
+from verify import constants as verify_cts
+from verify import jobs, search
+from verify.models import CheckOut, Remark, remark_content
+from verify.pagination import PER_PAGE
+from verify.tests import constants as cts
+from verify.tests.utils import make_docx
+
+User = get_user_model()
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class SearchTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        settings.MEDIA_ROOT = tempfile.mkdtemp(dir=settings.BASE_DIR)
+        cls.group = Group.objects.create(
+            title=cts.GROUP_1_TITLE,
+            slug=cts.GROUP_1_SLUG,
+        )
+        cls.student = User.objects.create(
+            username=cts.USERNAME_1,
+            group=cls.group,
+        )
+        cls.controller = User.objects.create(
+            username=cts.USERNAME_3,
+            allow_manage=True,
+        )
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(settings.MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        self.client = Client()
+        self.client.force_login(SearchTests.controller)
+        self.check = CheckOut.objects.create(student=SearchTests.student)
+
+    def add_remark(self, text, section=cts.REMARK_SECTION):
+        return Remark.objects.create(
+            check_out=self.check, section=section, **remark_content(text)
+        )
+
+    def search(self, **params):
+        response = self.client.get(reverse('verify:search_api'), params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def found_ids(self, **params):
+        return [item['id'] for item in self.search(**params)['results']]
+
+    def test_index_follows_remark_changes(self):
+        """Индекс обновляется при создании, изменении и удалении замечания."""
+        remark = self.add_remark(verify_cts.ERROR_LINK_2)
+        self.add_remark(verify_cts.ERROR_TABLE_1)
+        Remark.objects.bulk_create([Remark(
+            check_out=self.check,
+            section=cts.REMARK_SECTION_2,
+            **remark_content(verify_cts.ERROR_LINK_1),
+        )])
+        jobs.run_pending()
+        self.assertEqual(len(self.found_ids(q='ссылки источники')), 2)
+        self.assertEqual(self.found_ids(q='оформлены неверно ссылки'),
+                         [remark.id])
+
+        remark.remark_type = None
+        remark.text = cts.REMARK_TEXT
+        remark.save()
+        self.assertEqual(len(self.found_ids(q='ссылки')), 1)
+        self.assertEqual(self.found_ids(q='замечания'), [remark.id])
+        remark.delete()
+        self.assertEqual(self.found_ids(q='замечания'), [])
+
+    def test_results_are_paginated(self):
+        """Результаты выдаются страницами со ссылкой на следующую."""
+        for number in range(PER_PAGE + 2):
+            self.add_remark(f'{cts.REMARK_TEXT} {number}')
+        first = self.search(q='текст')
+        self.assertEqual(len(first['results']), PER_PAGE)
+        self.assertIn('page=2', first['next'])
+        second = self.search(q='текст', page=2)
+        self.assertEqual(len(second['results']), 2)
+        self.assertIsNone(second['next'])
+        self.assertFalse(
+            {item['id'] for item in first['results']}
+            & {item['id'] for item in second['results']}
+        )
+
+    def test_year_filter(self):
+        """Поиск ограничивается годом публикации замечания."""
+        remark = self.add_remark(verify_cts.ERROR_LINK_2)
+        year = timezone.now().year
+        Remark.objects.filter(pk=remark.pk).update(
+            check_date=datetime.datetime(year - 1, 6, 1, tzinfo=timezone.utc)
+        )
+        self.assertEqual(self.found_ids(q='ссылки', year=year), [])
+        self.assertEqual(
+            self.found_ids(q='ссылки', year=year - 1), [remark.id]
+        )
+        # Первые часы года по местному времени - еще прошлый год по UTC
+        Remark.objects.filter(pk=remark.pk).update(
+            check_date=timezone.make_aware(datetime.datetime(year, 1, 1, 1))
+        )
+        self.assertEqual(self.found_ids(q='ссылки', year=year), [remark.id])
+
+    def test_remark_search_uses_fulltext_index(self):
+        """Поиск замечаний не просматривает таблицу замечаний целиком."""
+        period = (timezone.now(), timezone.now())
+        sql, params = search.remark_search_sql(['ссылки'], period)
+        explain = {
+            'sqlite': 'EXPLAIN QUERY PLAN ',
+            'postgresql': 'EXPLAIN ',
+        }[connection.vendor]
+        with connection.cursor() as cursor:
+            if connection.vendor == 'postgresql':
+                # В пустой таблице просмотр дешевле любого индекса
+                cursor.execute('SET LOCAL enable_seqscan = off')
+            cursor.execute(explain + sql, params)
+            plan = '\n'.join(
+                ' '.join(str(part) for part in row)
+                for row in cursor.fetchall()
+            )
+        if connection.vendor == 'sqlite':
+            self.assertIn('VIRTUAL TABLE INDEX', plan)
+            self.assertNotIn('SCAN r', plan)
+        else:
+            self.assertNotIn('Seq Scan on verify_remark r', plan)
+
+    def test_document_search(self):
+        """Текст DOCX индексируется фоновой задачей новой заявки."""
+        self.client.force_login(SearchTests.student)
+        self.check.delete()
+        response = self.client.post(
+            reverse('verify:new_check', kwargs={'username': self.student}),
+            data={
+                'docx_file': ContentFile(
+                    make_docx(['Нейросетевой анализ изображений']),
+                    name=cts.DOCX_FILE_NAME,
+                ),
+                'pdf_file': ContentFile(
+                    cts.PDF_FILE_CONTENT, name=cts.PDF_FILE_NAME
+                ),
+            },
+        )
+        self.assertEqual(response.status_code, 302)
+        jobs.run_pending()
+        check = CheckOut.objects.get()
+        self.client.force_login(SearchTests.controller)
+        self.assertEqual(
+            self.found_ids(q='нейросетевой', kind='documents'), [check.id]
+        )
+        check.delete()
+        self.assertEqual(self.found_ids(q='нейросетевой', kind='documents'),
+                         [])
+
+    def test_search_page(self):
+        """Страница поиска доступна только нормоконтролеру."""
+        self.add_remark(verify_cts.ERROR_LINK_2)
+        response = self.client.get(reverse('verify:search'), {'q': 'ссылки'})
+        self.assertEqual(len(response.context['results']), 1)
+        self.client.force_login(SearchTests.student)
+        response = self.client.get(reverse('verify:search'), {'q': 'ссылки'})
+        self.assertEqual(response.status_code, 403)
@@ -0,0 +1,158 @@
+import datetime
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from users.models import Group
+from verify import constants as verify_cts
+from verify import jobs, stats, tasks
+from verify.counters import active_check_count
+from verify.models import (
+    STANDARD_REMARK_CODES, CheckOut, Remark, RemarkStat, month_of,
+    remark_content, remark_error_type,
+)
+from verify.tests import constants as cts
+
+User = get_user_model()
+
+
+def error_type(text):
+    return remark_error_type(STANDARD_REMARK_CODES[text])
+
+
+class RemarkStatsTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.group = Group.objects.create(
+            title=cts.GROUP_1_TITLE,
+            slug=cts.GROUP_1_SLUG,
+        )
+        cls.student = User.objects.create(
+            username=cts.USERNAME_1,
+            group=cls.group,
+        )
+        cls.controller = User.objects.create(
+            username=cts.USERNAME_3,
+            allow_manage=True,
+        )
+
+    def setUp(self):
+        self.check = CheckOut.objects.create(student=RemarkStatsTests.student)
+        self.month = month_of(timezone.now())
+
+    def add_remark(self, text, section=cts.REMARK_SECTION):
+        return Remark.objects.create(
+            check_out=self.check, section=section, **remark_content(text)
+        )
+
+    def cells(self):
+        return dict(
+            ((cell.error_type, cell.group_id, cell.month), cell.count)
+            for cell in RemarkStat.objects.filter(count__gt=0)
+        )
+
+    def test_stats_follow_remark_changes(self):
+        """Статистика меняется при создании, правке и удалении замечания."""
+        remark = self.add_remark(verify_cts.ERROR_LINK_2)
+        self.add_remark(verify_cts.ERROR_LINK_2, cts.REMARK_SECTION_2)
+        self.add_remark(cts.REMARK_TEXT)
+        group_id = self.group.id
+        self.assertEqual(self.cells(), {
+            (error_type(verify_cts.ERROR_LINK_2), group_id, self.month): 2,
+            ('CUSTOM', group_id, self.month): 1,
+        })
+        remark.remark_type_id = STANDARD_REMARK_CODES[verify_cts.ERROR_TABLE_1]
+        remark.save()
+        remark.delete()
+        self.assertEqual(self.cells(), {
+            (error_type(verify_cts.ERROR_LINK_2), group_id, self.month): 1,
+            ('CUSTOM', group_id, self.month): 1,
+        })
+
+    def test_bulk_create_counts_only_new_remarks(self):
+        """Повторы, отброшенные при массовой вставке, не учитываются."""
+        self.add_remark(verify_cts.ERROR_TEXT_1)
+        group_id = self.group.id
+        Remark.objects.bulk_create([
+            Remark(check_out=self.check, section=cts.REMARK_SECTION,
+                   **remark_content(text))
+            for text in (verify_cts.ERROR_TEXT_1, verify_cts.ERROR_TEXT_2)
+        ], ignore_conflicts=True)
+        jobs.run_pending()
+        self.assertEqual(self.cells(), {
+            (error_type(verify_cts.ERROR_TEXT_1), group_id, self.month): 1,
+            (error_type(verify_cts.ERROR_TEXT_2), group_id, self.month): 1,
+        })
+
+    def test_bulk_create_adds_to_existing_cells(self):
+        """Массовая вставка прибавляет замечания к имеющимся ячейкам."""
+        self.add_remark(verify_cts.ERROR_TEXT_1)
+        student = User.objects.create(username=cts.USERNAME_2)
+        other_check = CheckOut.objects.create(student=student)
+        Remark.objects.bulk_create([
+            Remark(check_out=check, section=section,
+                   **remark_content(verify_cts.ERROR_TEXT_1))
+            for check in (self.check, other_check)
+            for section in (cts.REMARK_SECTION, cts.REMARK_SECTION_2)
+        ], ignore_conflicts=True)
+        Remark.objects.bulk_create([Remark(
+            check_out=other_check, section=cts.REMARK_SECTION,
+            **remark_content(verify_cts.ERROR_TEXT_1),
+        )], ignore_conflicts=True)
+        jobs.run_pending()
+        error = error_type(verify_cts.ERROR_TEXT_1)
+        expected = {
+            (error, self.group.id, self.month): 2,
+            (error, None, self.month): 2,
+        }
+        self.assertEqual(self.cells(), expected)
+        # Повтор задачи не меняет пересчитанные ячейки
+        tasks.sync_check_remarks(other_check.id)
+        self.assertEqual(self.cells(), expected)
+
+    def test_rebuild_matches_incremental_updates(self):
+        """Пересчет дает те же ячейки, что и обновление на лету."""
+        self.add_remark(verify_cts.ERROR_LINK_2)
+        old = self.add_remark(verify_cts.ERROR_LINK_1)
+        Remark.objects.filter(pk=old.pk).update(
+            check_date=timezone.now() - datetime.timedelta(days=62)
+        )
+        RemarkStat.objects.all().delete()
+        stats.rebuild()
+        group_id = self.group.id
+        self.assertEqual(self.cells(), {
+            (error_type(verify_cts.ERROR_LINK_2), group_id, self.month): 1,
+            (error_type(verify_cts.ERROR_LINK_1), group_id,
+             month_of(timezone.now() - datetime.timedelta(days=62))): 1,
+        })
+
+    def test_dashboard_reads_only_summary_table(self):
+        """Отчет и выгрузка не обращаются к таблицам замечаний."""
+        self.add_remark(verify_cts.ERROR_LINK_2)
+        self.add_remark(cts.REMARK_TEXT)
+        client = Client()
+        client.force_login(RemarkStatsTests.controller)
+        # Счетчик в шапке страницы заполняется заранее
+        active_check_count()
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(reverse('verify:remark_stats'))
+            export = client.get(reverse('verify:remark_stats_csv'), {
+                'start': self.month.strftime('%Y-%m'),
+            })
+        for query in queries.captured_queries:
+            self.assertNotIn('"verify_remark"', query['sql'])
+            self.assertNotIn('"verify_checkout"', query['sql'])
+        self.assertEqual(response.context['columns'], [cts.GROUP_1_TITLE])
+        self.assertEqual(
+            [(row['error_type'], row['counts']) for row in
+             response.context['rows']],
+            [(error_type(verify_cts.ERROR_LINK_2), [1]), ('CUSTOM', [1])],
+        )
+        lines = export.content.decode('utf-8-sig').splitlines()
+        self.assertEqual(len(lines), 3)
+        self.assertIn(verify_cts.ERROR_LINK_2, lines[1])
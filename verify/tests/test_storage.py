@@ -0,0 +1,103 @@
+import hashlib
+import os
+import shutil
+import tempfile
+
+from io import StringIO
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from normocontrol.settings.base import MEDIA_ROOT
+from verify import jobs, tasks
+from verify.blobs import release_blobs
+from verify.models import CheckOut, Job
+from verify.storage import blob_name, blob_storage
+from verify.tests import constants as cts
+from verify.tests.utils import make_docx, make_pdf
+
+User = get_user_model()
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT, BLOB_GRACE_PERIOD=0)
+class ContentAddressedStorageTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        settings.MEDIA_ROOT = tempfile.mkdtemp(dir=settings.BASE_DIR)
+        cls.student = User.objects.create(username=cts.USERNAME_1)
+        cls.pdf = make_pdf()
+        cls.pdf_name = blob_name(hashlib.sha256(cls.pdf).hexdigest(), '.pdf')
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(settings.MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def make_check(self, docx_text='Текст'):
+        check = CheckOut(student=self.student)
+        check.pdf_file.save(
+            cts.PDF_FILE_NAME, ContentFile(self.pdf), save=False
+        )
+        check.docx_file.save(
+            cts.DOCX_FILE_NAME, ContentFile(make_docx([docx_text])),
+            save=False,
+        )
+        check.save()
+        return check
+
+    def test_identical_uploads_share_one_blob(self):
+        """Одинаковые файлы хранятся одним блобом с именем по хешу."""
+        first = self.make_check('Первая версия')
+        second = self.make_check('Вторая версия')
+        self.assertEqual(first.pdf_file.name, self.pdf_name)
+        self.assertEqual(second.pdf_file.name, self.pdf_name)
+        self.assertNotEqual(first.docx_file.name, second.docx_file.name)
+        self.assertEqual(first.pdf_sha256, self.pdf_name[12:-4])
+        first.refresh_from_db()
+        self.assertEqual(first.pdf_sha256, self.pdf_name[12:-4])
+        with blob_storage.open(self.pdf_name) as blob:
+            self.assertEqual(blob.read(), self.pdf)
+
+    def test_blob_is_removed_with_last_reference(self):
+        """Блоб удаляется только вместе с последней ссылкой на него."""
+        first = self.make_check()
+        second = self.make_check()
+        CheckOut.objects.filter(id=first.id).update(status=True)
+        tasks.archive_check_files(first.id)
+        self.assertTrue(blob_storage.exists(self.pdf_name))
+        second.delete()
+        release_blobs([second.pdf_file.name, second.docx_file.name])
+        self.assertFalse(blob_storage.exists(self.pdf_name))
+        self.assertFalse(blob_storage.exists(second.docx_file.name))
+
+    @override_settings(BLOB_GRACE_PERIOD=3600)
+    def test_fresh_blob_is_kept(self):
+        """Свежий блоб без ссылок удаляется отложенной задачей."""
+        check = self.make_check()
+        check.delete()
+        release_blobs([check.pdf_file.name])
+        self.assertTrue(blob_storage.exists(self.pdf_name))
+        job = Job.objects.get(name='collect_blobs', status=Job.PENDING)
+        self.assertGreater(job.run_after, timezone.now())
+        release_blobs([check.pdf_file.name])
+        self.assertEqual(Job.objects.filter(name='collect_blobs').count(), 1)
+        with override_settings(BLOB_GRACE_PERIOD=0):
+            Job.objects.filter(pk=job.pk).update(run_after=timezone.now())
+            jobs.run_pending()
+        self.assertFalse(blob_storage.exists(self.pdf_name))
+
+    def test_collect_blobs_removes_orphans(self):
+        """Команда collect_blobs удаляет блобы без ссылок."""
+        check = self.make_check()
+        orphan = blob_storage.save('orphan.txt', ContentFile(b'orphan'))
+        call_command('collect_blobs', stdout=StringIO())
+        self.assertFalse(blob_storage.exists(orphan))
+        self.assertTrue(blob_storage.exists(check.pdf_file.name))
+        self.assertEqual(
+            os.listdir(blob_storage.path('blobs/tmp')), []
+        )
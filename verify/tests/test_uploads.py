@@ -0,0 +1,108 @@
+import io
+import shutil
+import tempfile
+import zipfile
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from normocontrol.settings.base import MEDIA_ROOT
+from verify import uploads
+from verify.models import CheckOut
+from verify.storage import blob_digest
+from verify.tests import constants as cts
+from verify.tests.utils import make_pdf
+
+User = get_user_model()
+
+
+def strip_docx_part(content, part):
+    """Возвращает копию DOCX без указанной части архива."""
+    source = zipfile.ZipFile(io.BytesIO(content))
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w') as archive:
+        for item in source.infolist():
+            if item.filename != part:
+                archive.writestr(item, source.read(item))
+    return buffer.getvalue()
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class UploadValidationTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        settings.MEDIA_ROOT = tempfile.mkdtemp(dir=settings.BASE_DIR)
+        cls.student = User.objects.create(username=cts.USERNAME_1)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(settings.MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        self.client = Client(enforce_csrf_checks=True)
+        self.client.force_login(UploadValidationTests.student)
+        self.url = reverse(
+            'verify:new_check', kwargs={'username': self.student}
+        )
+
+    def post(self, docx=cts.DOCX_FILE_CONTENT, pdf=cts.PDF_FILE_CONTENT):
+        self.client.get(self.url)
+        # Токен идет перед файлами, как в форме: после прерванной
+        # загрузки остальные поля уже не читаются
+        return self.client.post(self.url, data={
+            'csrfmiddlewaretoken': self.client.cookies['csrftoken'].value,
+            'docx_file': SimpleUploadedFile(cts.DOCX_FILE_NAME, docx),
+            'pdf_file': SimpleUploadedFile(cts.PDF_FILE_NAME, pdf),
+        })
+
+    def assertRejected(self, response, field, error):
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(error, response.context['form'].errors[field])
+        self.assertFalse(CheckOut.objects.exists())
+
+    def test_valid_upload_is_stored_by_digest(self):
+        """Хеш, посчитанный при приеме файла, становится именем блоба."""
+        response = self.post()
+        self.assertEqual(response.status_code, 302)
+        check = CheckOut.objects.get()
+        self.assertEqual(blob_digest(check.docx_file.name), check.docx_sha256)
+        with check.docx_file.open('rb') as docx:
+            self.assertEqual(docx.read(), cts.DOCX_FILE_CONTENT)
+
+    def test_renamed_file_is_rejected(self):
+        """Файл другого формата с расширением .docx или .pdf отклоняется."""
+        self.assertRejected(
+            self.post(docx=cts.BROKEN_FILE_CONTENT),
+            'docx_file', uploads.ERROR_DOCX,
+        )
+        self.assertRejected(
+            self.post(pdf=cts.DOCX_FILE_CONTENT),
+            'pdf_file', uploads.ERROR_PDF,
+        )
+
+    def test_docx_without_content_types_is_rejected(self):
+        """ZIP-архив без [Content_Types].xml не считается документом."""
+        docx = strip_docx_part(cts.DOCX_FILE_CONTENT, '[Content_Types].xml')
+        self.assertRejected(
+            self.post(docx=docx), 'docx_file', uploads.ERROR_DOCX
+        )
+
+    def test_truncated_pdf_is_rejected(self):
+        """PDF без маркера %%EOF считается оборванным."""
+        pdf = make_pdf().rsplit(uploads.PDF_EOF, 1)[0]
+        self.assertRejected(self.post(pdf=pdf), 'pdf_file', uploads.ERROR_PDF)
+
+    @override_settings(MAX_UPLOAD_SIZE=1024)
+    def test_oversize_upload_is_aborted(self):
+        """Слишком большой файл прерывает загрузку."""
+        response = self.post(docx=b'PK\x03\x04' + b'0' * 100000)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(
+            uploads.ERROR_TOO_LARGE, response.context['form'].non_field_errors()
+        )
+        self.assertFalse(CheckOut.objects.exists())
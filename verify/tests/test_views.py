@@ -5,12 +5,15 @@ from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.core.cache import cache
 from django.core.paginator import Page
+from django.db import connection
 from django.test import Client, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
 from normocontrol.settings.base import MEDIA_ROOT
 from users.models import Group
-from verify.models import CheckOut, Remark
+from verify.counters import active_check_count
+from verify.models import CheckOut, Remark, with_group_progress
 from verify.tests import constants as cts
 
 User = get_user_model()
@@ -436,7 +439,7 @@ class VerifyViewsTests(TestCase):
     def test_remark_delete_working(self):
         """Замечание удаляется."""
         new_remark = Remark.objects.create(
-            section=cts.REMARK_SECTION,
+            section=cts.REMARK_SECTION_2,
             page_number=cts.REMARK_PAGE_NUMBER,
             paragraph=cts.REMARK_PARAGRAPH,
             text=cts.REMARK_TEXT,
@@ -456,3 +459,248 @@ class VerifyViewsTests(TestCase):
             follow=True
         )
         self.assertEqual(remarks_count - 1, Remark.objects.count())
+
+
+class ViewsQueryCountTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.group = Group.objects.create(
+            title=cts.GROUP_1_TITLE,
+            slug=cts.GROUP_1_SLUG,
+        )
+        cls.student = User.objects.create(
+            username=cts.USERNAME_1,
+            group=cls.group,
+        )
+        cls.controller = User.objects.create(
+            username=cts.USERNAME_3,
+            allow_manage=True,
+        )
+        for status in (False, True):
+            for number in range(3):
+                check = CheckOut.objects.create(
+                    student=cls.student, status=status
+                )
+                Remark.objects.create(
+                    section=cts.REMARK_SECTION,
+                    text=f'{cts.REMARK_TEXT} {number}',
+                    check_out=check,
+                )
+        # Строка счетчика создается при первом чтении
+        active_check_count()
+
+    def assertPageQueries(self, user, name, num):
+        client = Client()
+        client.force_login(user)
+        url = reverse(f'verify:{name}', kwargs={'username': user})
+        with self.assertNumQueries(num):
+            response = client.get(url)
+        self.assertEqual(response.status_code, 200)
+
+    def test_student_list_pages_query_budget(self):
+        """Списки студента не ищут владельца страницы по имени."""
+        # Сессия, пользователь, состояние для ETag, заявки и замечания
+        self.assertPageQueries(self.student, 'check_list', 5)
+        self.assertPageQueries(self.student, 'archive', 5)
+
+    def test_controller_list_pages_query_budget(self):
+        """Страницы нормоконтроллера добавляют только счетчик заявок."""
+        self.assertPageQueries(self.controller, 'check_list', 6)
+        self.assertPageQueries(self.controller, 'archive', 6)
+
+    def roster_queries(self, url):
+        client = Client()
+        client.force_login(self.controller)
+        # Страницы списков кэшируются, считаются запросы без кэша
+        cache.clear()
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+    def test_roster_query_count_does_not_depend_on_size(self):
+        """Число запросов списка студентов не зависит от его длины."""
+        urls = [
+            reverse('verify:student_list'),
+            reverse('verify:group_students', args=[cts.GROUP_1_SLUG]),
+        ]
+        before = [self.roster_queries(url) for url in urls]
+        for number in range(5):
+            student = User.objects.create(
+                username=f'{cts.USERNAME_2}-{number}', group=self.group
+            )
+            check = CheckOut.objects.create(student=student)
+            Remark.objects.create(
+                section=cts.REMARK_SECTION,
+                text=cts.REMARK_TEXT,
+                check_out=check,
+            )
+        after = [self.roster_queries(url) for url in urls]
+        self.assertEqual(before, after)
+
+    def test_roster_links_active_check(self):
+        """Ссылка на проверку есть, даже если последняя попытка в архиве."""
+        client = Client()
+        client.force_login(self.controller)
+        response = client.get(reverse('verify:student_list'))
+        self.assertContains(response, 'проверена')
+        self.assertContains(response, reverse(
+            'verify:student_active_check', args=[self.student.username]
+        ))
+
+    def test_group_list_query_count_does_not_depend_on_size(self):
+        """Число запросов списка групп не зависит от числа групп."""
+        url = reverse('verify:group_list')
+        before = self.roster_queries(url)
+        for number in range(5):
+            group = Group.objects.create(
+                title=f'{cts.GROUP_2_TITLE}-{number}',
+                slug=f'{cts.GROUP_2_SLUG}-{number}',
+            )
+            student = User.objects.create(
+                username=f'{cts.USERNAME_2}-{number}', group=group
+            )
+            CheckOut.objects.create(student=student)
+        self.assertEqual(self.roster_queries(url), before)
+
+    def test_group_progress(self):
+        """Показатели группы считаются по заявкам и замечаниям студентов."""
+        User.objects.create(username=cts.USERNAME_2, group=self.group)
+        Group.objects.create(title=cts.GROUP_2_TITLE, slug=cts.GROUP_2_SLUG)
+        oldest = CheckOut.objects.filter(
+            student=self.student, status=False
+        ).order_by('check_date').first().check_date
+        progress = {
+            group.slug: group
+            for group in with_group_progress(Group.objects.all())
+        }
+        group = progress[cts.GROUP_1_SLUG]
+        self.assertEqual(
+            (group.student_count, group.active_checks, group.archived_checks,
+             group.outstanding_remarks, group.oldest_waiting),
+            (2, 3, 3, 3, oldest),
+        )
+        empty = progress[cts.GROUP_2_SLUG]
+        self.assertEqual(
+            (empty.student_count, empty.active_checks,
+             empty.outstanding_remarks, empty.oldest_waiting),
+            (0, 0, 0, None),
+        )
+
+    def test_foreign_page_is_forbidden(self):
+        """Чужая страница недоступна, несуществующая - не найдена."""
+        client = Client()
+        client.force_login(self.student)
+        response = client.get(reverse(
+            'verify:check_list', kwargs={'username': self.controller}
+        ))
+        self.assertEqual(response.status_code, 403)
+        response = client.get(reverse(
+            'verify:check_list', kwargs={'username': 'nobody'}
+        ))
+        self.assertEqual(response.status_code, 404)
+
+
+class ConditionalViewsTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.group = Group.objects.create(
+            title=cts.GROUP_1_TITLE,
+            slug=cts.GROUP_1_SLUG,
+        )
+        cls.student = User.objects.create(
+            username=cts.USERNAME_1,
+            group=cls.group,
+        )
+        cls.controller = User.objects.create(
+            username=cts.USERNAME_3,
+            allow_manage=True,
+        )
+        active_check_count()
+
+    def setUp(self):
+        cache.clear()
+        self.check = CheckOut.objects.create(
+            student=ConditionalViewsTests.student
+        )
+        self.client = Client()
+        self.client.force_login(ConditionalViewsTests.controller)
+        self.student_client = Client()
+        self.student_client.force_login(ConditionalViewsTests.student)
+        self.check_url = reverse(
+            'verify:check_view', args=[cts.USERNAME_3, self.check.id]
+        )
+        self.list_url = reverse('verify:check_list', args=[cts.USERNAME_1])
+
+    def add_remark(self):
+        return Remark.objects.create(
+            section=cts.REMARK_SECTION,
+            text=cts.REMARK_TEXT,
+            check_out=self.check,
+        )
+
+    def assertNotModified(self, client, url, etag, modified=False):
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200 if modified else 304)
+        return response
+
+    def test_check_view_not_modified(self):
+        """Повторный просмотр заявки без изменений отвечает 304."""
+        # Первый ответ выдает cookie CSRF, от которого зависит ETag
+        self.client.get(self.check_url)
+        etag = self.client.get(self.check_url)['ETag']
+        # Сессия, пользователь, время изменения заявки и счетчик в шапке
+        with self.assertNumQueries(4):
+            self.assertNotModified(self.client, self.check_url, etag)
+        remark = self.add_remark()
+        response = self.assertNotModified(
+            self.client, self.check_url, etag, modified=True
+        )
+        self.assertContains(response, cts.REMARK_TEXT)
+        etag = response['ETag']
+        remark.page_number = cts.REMARK_PAGE_NUMBER_2
+        remark.save()
+        response = self.assertNotModified(
+            self.client, self.check_url, etag, modified=True
+        )
+        self.assertContains(response, cts.REMARK_PAGE_NUMBER_2)
+        etag = response['ETag']
+        student = ConditionalViewsTests.student
+        student.email = cts.EMAIL_1
+        student.save()
+        self.assertNotModified(self.client, self.check_url, etag, True)
+
+    def test_check_list_not_modified(self):
+        """Студент, ожидающий замечаний, получает 304 до их появления."""
+        etag = self.student_client.get(self.list_url)['ETag']
+        self.assertNotModified(self.student_client, self.list_url, etag)
+        Remark.objects.bulk_create([Remark(
+            section=cts.REMARK_SECTION,
+            text=cts.REMARK_TEXT,
+            check_out=self.check,
+        )])
+        response = self.assertNotModified(
+            self.student_client, self.list_url, etag, modified=True
+        )
+        etag = response['ETag']
+        self.assertNotModified(self.student_client, self.list_url, etag)
+        CheckOut.objects.create(student=ConditionalViewsTests.student)
+        response = self.assertNotModified(
+            self.student_client, self.list_url, etag, modified=True
+        )
+        self.check.delete()
+        self.assertNotModified(
+            self.student_client, self.list_url, response['ETag'], True
+        )
+
+    def test_etag_depends_on_csrf_token(self):
+        """После повторного входа страница с формами отдается заново."""
+        self.client.get(self.check_url)
+        etag = self.client.get(self.check_url)['ETag']
+        self.client.force_login(ConditionalViewsTests.controller)
+        # Новая сессия получает новый токен CSRF
+        self.client.cookies.pop(settings.CSRF_COOKIE_NAME)
+        self.client.get(self.check_url)
+        self.assertNotModified(self.client, self.check_url, etag, True)
@@ -0,0 +1,146 @@
+import io
+import zipfile
+
+CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/'
+    'content-types">'
+    '<Default Extension="rels" ContentType="application/'
+    'vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Default Extension="png" ContentType="image/png"/>'
+    '<Override PartName="/word/document.xml" ContentType="application/'
+    'vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+    '</Types>'
+)
+
+RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/'
+    'relationships">'
+    '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/'
+    'officeDocument/2006/relationships/officeDocument" '
+    'Target="word/document.xml"/>'
+    '</Relationships>'
+)
+
+DOCUMENT = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<w:document xmlns:w="http://schemas.openxmlformats.org/'
+    'wordprocessingml/2006/main" xmlns:r="http://schemas.openxmlformats.org/'
+    'officeDocument/2006/relationships" xmlns:wp="http://schemas.'
+    'openxmlformats.org/drawingml/2006/wordprocessingDrawing" xmlns:a="http:'
+    '//schemas.openxmlformats.org/drawingml/2006/main" xmlns:pic="http://'
+    'schemas.openxmlformats.org/drawingml/2006/picture">'
+    '<w:body>{}</w:body></w:document>'
+)
+
+DOCUMENT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/'
+    'relationships">{}</Relationships>'
+)
+
+IMAGE_REL = (
+    '<Relationship Id="{rel_id}" Type="http://schemas.openxmlformats.org/'
+    'officeDocument/2006/relationships/image" Target="media/{rel_id}.png"/>'
+)
+
+IMAGE_PARAGRAPH = (
+    '<w:p><w:r><w:drawing><wp:inline><wp:docPr id="1" name="image"/>'
+    '<a:graphic><a:graphicData uri="http://schemas.openxmlformats.org/'
+    'drawingml/2006/picture"><pic:pic><pic:blipFill>'
+    '<a:blip r:embed="{rel_id}"/></pic:blipFill></pic:pic></a:graphicData>'
+    '</a:graphic></wp:inline></w:drawing></w:r></w:p>'
+)
+
+# Лист A4 с полями 30/15/20/20 мм и колонтитулами 10 мм
+SECTION = (
+    '<w:sectPr>'
+    '<w:pgSz w:w="{width}" w:h="{height}"{orient}/>'
+    '<w:pgMar w:top="{top}" w:right="{right}" w:bottom="{bottom}" '
+    'w:left="{left}" w:header="{header}" w:footer="{footer}" w:gutter="0"/>'
+    '</w:sectPr>'
+)
+
+SECTION_DEFAULTS = {
+    'width': 11906,
+    'height': 16838,
+    'orient': '',
+    'top': 1134,
+    'right': 850,
+    'bottom': 1134,
+    'left': 1701,
+    'header': 567,
+    'footer': 567,
+}
+
+
+def make_section(**kwargs):
+    values = dict(SECTION_DEFAULTS, **kwargs)
+    return SECTION.format(**values)
+
+
+def make_section_break(**kwargs):
+    """Абзац, завершающий раздел документа."""
+    return f'<w:p><w:pPr>{make_section(**kwargs)}</w:pPr></w:p>'
+
+
+def make_paragraph(text, bold=False):
+    run_properties = '<w:rPr><w:b/></w:rPr>' if bold else ''
+    return f'<w:p><w:r>{run_properties}<w:t>{text}</w:t></w:r></w:p>'
+
+
+def make_image_paragraph(rel_id):
+    """Абзац со встроенным изображением, заданным связью rel_id."""
+    return IMAGE_PARAGRAPH.format(rel_id=rel_id)
+
+
+def make_docx(paragraphs=('Текст',), sections=None, images=None):
+    """Собирает минимальный документ DOCX в памяти.
+
+    images - словарь {идентификатор связи: содержимое PNG}.
+    """
+    body = ''.join(
+        p if p.startswith('<') else make_paragraph(p) for p in paragraphs
+    )
+    body += ''.join(sections if sections is not None else [make_section()])
+    images = images or {}
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr('[Content_Types].xml', CONTENT_TYPES)
+        archive.writestr('_rels/.rels', RELS)
+        archive.writestr('word/document.xml', DOCUMENT.format(body))
+        if images:
+            archive.writestr('word/_rels/document.xml.rels', DOCUMENT_RELS.format(
+                ''.join(IMAGE_REL.format(rel_id=rel_id) for rel_id in images)
+            ))
+        for rel_id, content in images.items():
+            archive.writestr(f'word/media/{rel_id}.png', content)
+    return buffer.getvalue()
+
+
+def make_pdf(pages=1):
+    """Собирает минимальный корректный PDF с пустыми страницами."""
+    kids = ' '.join(f'{3 + number} 0 R' for number in range(pages))
+    objects = [
+        '<< /Type /Catalog /Pages 2 0 R >>',
+        f'<< /Type /Pages /Kids [{kids}] /Count {pages} >>',
+    ]
+    objects += [
+        '<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] >>'
+    ] * pages
+    content = b'%PDF-1.4\n'
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(content))
+        content += f'{number} 0 obj\n{body}\nendobj\n'.encode()
+    xref = len(content)
+    content += f'xref\n0 {len(objects) + 1}\n0000000000 65535 f \n'.encode()
+    for offset in offsets:
+        content += f'{offset:010d} 00000 n \n'.encode()
+    content += (
+        f'trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\n'
+        f'startxref\n{xref}\n%%EOF\n'
+    ).encode()
+    return content
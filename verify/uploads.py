@@ -0,0 +1,117 @@
+import hashlib
+import os
+import zipfile
+
+from django.conf import settings
+from django.core.files.uploadhandler import (
+    StopUpload, TemporaryFileUploadHandler,
+)
+
+# Предельный размер одного файла работы, байт
+MAX_UPLOAD_SIZE = 8000000
+ZIP_MAGIC = b'PK\x03\x04'
+PDF_MAGIC = b'%PDF-'
+PDF_EOF = b'%%EOF'
+# Сколько последних байт PDF просматривается в поисках %%EOF
+PDF_TAIL_SIZE = 1024
+DOCX_REQUIRED_PARTS = ('[Content_Types].xml', 'word/document.xml')
+
+ERROR_TOO_LARGE = 'Файл должен иметь размер не более 8 Мб'
+ERROR_DOCX = 'Файл не является документом Word (.docx)'
+ERROR_PDF = 'Файл не является документом PDF'
+
+
+def max_upload_size():
+    return getattr(settings, 'MAX_UPLOAD_SIZE', MAX_UPLOAD_SIZE)
+
+
+def upload_kind(name):
+    """Тип файла работы по расширению: 'docx', 'pdf' или None."""
+    extension = os.path.splitext(name or '')[1].lower().lstrip('.')
+    return extension if extension in ('docx', 'pdf') else None
+
+
+def structure_error(fileobj, kind, head, tail):
+    """Проверяет структуру файла работы и возвращает текст ошибки.
+
+    head и tail - первые и последние байты файла. Для DOCX читается
+    только центральный каталог ZIP в конце файла.
+    """
+    if kind == 'pdf':
+        if not head.startswith(PDF_MAGIC) or PDF_EOF not in tail:
+            return ERROR_PDF
+        return None
+    if not head.startswith(ZIP_MAGIC):
+        return ERROR_DOCX
+    fileobj.seek(0)
+    try:
+        with zipfile.ZipFile(fileobj) as archive:
+            names = set(archive.namelist())
+    except (zipfile.BadZipFile, OSError):
+        return ERROR_DOCX
+    finally:
+        fileobj.seek(0)
+    if not names.issuperset(DOCX_REQUIRED_PARTS):
+        return ERROR_DOCX
+    return None
+
+
+def inspect_upload(uploaded_file, kind):
+    """Проверяет файл, полученный не через ValidatingUploadHandler.
+
+    Возвращает пару (текст ошибки или None, SHA-256 содержимого).
+    """
+    if hasattr(uploaded_file, 'upload_error'):
+        return uploaded_file.upload_error, uploaded_file.sha256
+    if uploaded_file.size > max_upload_size():
+        return ERROR_TOO_LARGE, None
+    digest = hashlib.sha256()
+    head = tail = b''
+    for chunk in uploaded_file.chunks():
+        digest.update(chunk)
+        head = (head + chunk)[:len(PDF_MAGIC)]
+        tail = (tail + chunk)[-PDF_TAIL_SIZE:]
+    error = structure_error(uploaded_file, kind, head, tail)
+    return error, digest.hexdigest()
+
+
+class ValidatingUploadHandler(TemporaryFileUploadHandler):
+    """Обработчик загрузки файлов работы.
+
+    Пока файл принимается, считает его размер и SHA-256 и запоминает
+    первые и последние байты. Файл больше MAX_UPLOAD_SIZE прерывает
+    загрузку с разрывом соединения, не дочитывая тело запроса. После
+    получения файла проверяется его структура; результат сохраняется
+    в атрибутах upload_error и sha256 загруженного файла и проверяется
+    формой.
+    """
+    def new_file(self, field_name, file_name, *args, **kwargs):
+        super().new_file(field_name, file_name, *args, **kwargs)
+        self.kind = upload_kind(file_name)
+        self.size = 0
+        self.max_size = max_upload_size()
+        self.digest = hashlib.sha256()
+        self.head = b''
+        self.tail = b''
+
+    def receive_data_chunk(self, raw_data, start):
+        self.size += len(raw_data)
+        if self.size > self.max_size:
+            self.file.close()
+            self.request.upload_too_large = True
+            raise StopUpload(connection_reset=True)
+        self.digest.update(raw_data)
+        if len(self.head) < len(PDF_MAGIC):
+            self.head = (self.head + raw_data)[:len(PDF_MAGIC)]
+        self.tail = (self.tail + raw_data)[-PDF_TAIL_SIZE:]
+        return super().receive_data_chunk(raw_data, start)
+
+    def file_complete(self, file_size):
+        uploaded_file = super().file_complete(file_size)
+        uploaded_file.sha256 = self.digest.hexdigest()
+        uploaded_file.upload_error = None
+        if self.kind is not None:
+            uploaded_file.upload_error = structure_error(
+                uploaded_file, self.kind, self.head, self.tail
+            )
+        return uploaded_file
@@ -56,9 +56,88 @@ urlpatterns += [
      path('user/<str:username>/<int:check_id>/check_active/',
           views.check_active,
           name='check_active'),
+     path('user/<str:username>/<int:check_id>/check_restore/',
+          views.check_restore,
+          name='check_restore'),
+     path('user/<str:username>/<int:check_id>/preview/<str:digest>/'
+          '<int:page_number>/',
+          views.check_preview,
+          name='check_preview'),
+     path('user/<str:username>/<int:check_id>/preview/<str:digest>/'
+          '<int:page_number>/thumb/',
+          views.check_preview,
+          {'thumb': True},
+          name='check_preview_thumb'),
+     path('user/<str:username>/<int:check_id>/download/<str:kind>/',
+          views.check_download,
+          name='check_download'),
+     path('user/<str:username>/<int:check_id>/changes/',
+          views.check_changes,
+          name='check_changes'),
+     path('user/<str:username>/<int:check_id>/reading/',
+          views.check_reading,
+          name='check_reading'),
+     path('user/<str:username>/<int:check_id>/reading/<str:name>',
+          views.check_reading_image,
+          name='check_reading_image'),
 ]
 
 
+# Статистика
+urlpatterns += [
+     path('stats/',
+          views.remark_stats,
+          name='remark_stats'),
+     path('stats/remarks.csv',
+          views.remark_stats_csv,
+          name='remark_stats_csv'),
+]
+
+# Поиск
+urlpatterns += [
+     path('search/',
+          views.search,
+          name='search'),
+     path('api/search/',
+          views.search_api,
+          name='search_api'),
+]
+
+# JSON API
+urlpatterns += [
+     path('api/user/<str:username>/checks/',
+          views.api_checks,
+          name='api_checks'),
+     path('api/user/<str:username>/checks/<int:check_id>/',
+          views.api_check,
+          name='api_check'),
+     path('api/user/<str:username>/checks/<int:check_id>/remarks/',
+          views.api_remarks,
+          name='api_remarks'),
+     path('api/students/',
+          views.api_students,
+          name='api_students'),
+     path('api/groups/',
+          views.api_groups,
+          name='api_groups'),
+     path('api/groups/<slug:slug>/students/',
+          views.api_group_students,
+          name='api_group_students'),
+]
+
+# Докачиваемая загрузка файлов работы
+urlpatterns += [
+     path('user/<str:username>/uploads/',
+          views.upload_start,
+          name='upload_start'),
+     path('user/<str:username>/uploads/finish/',
+          views.upload_finish,
+          name='upload_finish'),
+     path('user/<str:username>/uploads/<uuid:upload_id>/',
+          views.upload_chunk,
+          name='upload_chunk'),
+]
+
 # Замечания
 urlpatterns += [
      path('user/<str:username>/<int:check_id>/add_remark/',
@@ -1,8 +1,20 @@
+from .api_views import api_check  # noqa
+from .api_views import api_checks  # noqa
+from .api_views import api_group_students  # noqa
+from .api_views import api_groups  # noqa
+from .api_views import api_remarks  # noqa
+from .api_views import api_students  # noqa
 from .check_views import archive  # noqa
 from .check_views import check_active  # noqa
 from .check_views import check_archive  # noqa
+from .check_views import check_changes  # noqa
 from .check_views import check_delete  # noqa
+from .check_views import check_download  # noqa
 from .check_views import check_list  # noqa
+from .check_views import check_preview  # noqa
+from .check_views import check_reading  # noqa
+from .check_views import check_reading_image  # noqa
+from .check_views import check_restore  # noqa
 from .check_views import check_view  # noqa
 from .check_views import new_check  # noqa
 from .exceptions import bad_request  # noqa
@@ -15,6 +27,13 @@ from .group_views import new_group  # noqa
 from .remark_views import add_remark  # noqa
 from .remark_views import delete_remark  # noqa
 from .remark_views import edit_remark  # noqa
+from .search_views import search  # noqa
+from .search_views import search_api  # noqa
 from .static_pages import index  # noqa
+from .stats_views import remark_stats  # noqa
+from .stats_views import remark_stats_csv  # noqa
 from .student_views import student_active_check  # noqa
 from .student_views import student_list  # noqa
+from .upload_views import upload_chunk  # noqa
+from .upload_views import upload_finish  # noqa
+from .upload_views import upload_start  # noqa
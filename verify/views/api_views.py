@@ -0,0 +1,132 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.decorators import login_required
+from django.http import Http404, JsonResponse
+from django.shortcuts import get_object_or_404
+from django.views.decorators.http import require_safe
+
+from users.models import Group
+from verify import api
+from verify.caching import CHECKS, REMARKS, ROSTER_DATA
+from verify.decorators import etag_versioned, user_access, user_check
+from verify.forms import ApiListForm
+from verify.models import Remark, with_group_progress, with_last_check
+from verify.pagination import seek_after
+
+from .check_views import user_checks
+
+User = get_user_model()
+
+# Версии данных, от которых зависит выдача. Заявки показывают имена
+# студентов и названия групп, поэтому зависят от всех данных списков
+CHECK_DATA = ROSTER_DATA
+REMARK_DATA = (CHECKS, REMARKS)
+
+
+def api_form(request, field_map):
+    return ApiListForm(request.GET, available=tuple(field_map))
+
+
+def form_errors(form):
+    return JsonResponse({'errors': form.errors.get_json_data()}, status=400)
+
+
+def api_list(request, queryset, field_map):
+    """Страница записей queryset в формате JSON.
+
+    Записи отдаются по возрастанию id порциями по ?limit=, следующая
+    порция запрашивается по ссылке next с непрозрачным параметром
+    ?cursor=. Общее число записей не считается.
+    """
+    form = api_form(request, field_map)
+    if not form.is_valid():
+        return form_errors(form)
+    items, cursor = seek_after(
+        queryset, form.cleaned_data['cursor'], form.cleaned_data['limit']
+    )
+    names = form.cleaned_data['fields']
+    data = {
+        'results': [api.serialize(item, field_map, names) for item in items],
+        'next': None,
+    }
+    if cursor is not None:
+        query = request.GET.copy()
+        query['cursor'] = cursor
+        data['next'] = f'{request.path}?{query.urlencode()}'
+    return JsonResponse(data)
+
+
+@require_safe
+@login_required
+@user_check
+@etag_versioned(*CHECK_DATA)
+def api_checks(request, username):
+    """Заявки в формате JSON; ?status= отбирает активные или архивные."""
+    checks = user_checks(request, username)
+    status = request.GET.get('status')
+    if status == ApiListForm.ACTIVE:
+        checks = checks.filter(status=False)
+    elif status == ApiListForm.ARCHIVED:
+        checks = checks.filter(status=True)
+    return api_list(request, checks, api.CHECK_FIELDS)
+
+
+@require_safe
+@login_required
+@user_check
+@etag_versioned(*CHECK_DATA)
+def api_check(request, username, check_id):
+    """Заявка в формате JSON."""
+    form = api_form(request, api.CHECK_FIELDS)
+    if not form.is_valid():
+        return form_errors(form)
+    check = get_object_or_404(user_checks(request, username), id=check_id)
+    return JsonResponse(
+        api.serialize(check, api.CHECK_FIELDS, form.cleaned_data['fields'])
+    )
+
+
+@require_safe
+@login_required
+@user_check
+@etag_versioned(*REMARK_DATA)
+def api_remarks(request, username, check_id):
+    """Замечания к заявке в формате JSON."""
+    if not user_checks(request, username).filter(id=check_id).exists():
+        raise Http404
+    remarks = Remark.objects.select_related('remark_type').filter(
+        check_out_id=check_id
+    )
+    return api_list(request, remarks, api.REMARK_FIELDS)
+
+
+@require_safe
+@login_required
+@user_access
+@etag_versioned(*ROSTER_DATA)
+def api_students(request):
+    """Студенты с последней заявкой в формате JSON."""
+    students = User.objects.select_related('group').exclude(username='admin')
+    students = with_last_check(students.exclude(allow_manage=True))
+    return api_list(request, students, api.STUDENT_FIELDS)
+
+
+@require_safe
+@login_required
+@user_access
+@etag_versioned(*ROSTER_DATA)
+def api_groups(request):
+    """Группы с показателями проверки работ в формате JSON."""
+    return api_list(
+        request, with_group_progress(Group.objects.all()), api.GROUP_FIELDS
+    )
+
+
+@require_safe
+@login_required
+@user_access
+@etag_versioned(*ROSTER_DATA)
+def api_group_students(request, slug):
+    """Студенты группы с последней заявкой в формате JSON."""
+    group = get_object_or_404(Group, slug=slug)
+    students = with_last_check(group.user.select_related('group'))
+    return api_list(request, students, api.STUDENT_FIELDS)
@@ -1,59 +1,130 @@
-from django.contrib.auth import get_user_model
+import mimetypes
+
 from django.contrib.auth.decorators import login_required
-from django.core.paginator import Paginator
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.db.models import Max, Prefetch
+from django.http import FileResponse, Http404, StreamingHttpResponse
 from django.shortcuts import get_object_or_404, redirect, render
-from django.core.mail import send_mail
+from django.template.loader import render_to_string
+from django.utils.cache import patch_cache_control
 
-from verify.decorators import user_access, user_check
+from verify import (
+    blobs, cold_archive, diff, downloads, jobs, mail, preview, reading,
+    uploads,
+)
+from verify.caching import (
+    CHECKS, GROUPS, REMARK_TYPES, STUDENTS, get_versions,
+)
+from verify.counters import active_check_count
+from verify.decorators import (
+    conditional, user_access, user_check, validating_uploads,
+)
+from verify.docx import DocxError
 from verify.forms import CheckForm, RemarkNavForm, RemarkStandartErrorForm
-from verify.models import CheckOut
-from django.contrib.auth.models import User
+from verify.models import CheckOut, Remark
+from verify.pagination import paginate
+
+
+def remarks_prefetch():
+    """Замечания заявок вместе с каталогом одним запросом."""
+    return Prefetch(
+        'remark', queryset=Remark.objects.select_related('remark_type')
+    )
+
+
+# Данные страниц заявок, которые меняются без изменения самих заявок:
+# имена студентов, названия групп и каталог замечаний
+PAGE_DATA = (GROUPS, STUDENTS, REMARK_TYPES)
+
+
+def page_state(*parts, names=PAGE_DATA):
+    """Состояние страницы заявок для ETag: parts и версии данных names."""
+    return ':'.join(str(part) for part in parts + (get_versions(*names),))
 
-User = get_user_model()
+
+def list_state(archived):
+    """Состояние списка заявок.
+
+    Время последнего изменения не меняется при удалении заявки, поэтому
+    к нему добавляется версия заявок: ее меняют создание, удаление и
+    смена статуса, а с ними и счетчик заявок в шапке страницы.
+    """
+    def state(request, username):
+        checks = CheckOut.objects.filter(status=archived)
+        if not request.target_user.allow_manage:
+            checks = checks.filter(student__username=username)
+        updated = checks.aggregate(updated=Max('updated_at'))['updated']
+        return page_state(updated, names=PAGE_DATA + (CHECKS,))
+    return state
+
+
+def check_state(request, username, check_id):
+    """Состояние страницы заявки: время ее изменения и счетчик в шапке.
+
+    Прочитанный счетчик сохраняется в запросе для шаблона (см.
+    core.context_processors).
+    """
+    updated = user_checks(request, username).filter(
+        id=check_id
+    ).values_list('updated_at', flat=True).first()
+    if not request.user.allow_manage:
+        return page_state(updated)
+    request.check_count = active_check_count()
+    return page_state(updated, request.check_count)
 
 
 @login_required
 @user_check
+@conditional(list_state(archived=False))
 def check_list(request, username):
     """Выводит список активных заявок для запрошенного пользователя."""
-    user = get_object_or_404(User, username=username)
-    check_list = CheckOut.objects.all().filter(status=False)
+    user = request.target_user
+    check_list = CheckOut.objects.select_related(
+        'student__group'
+    ).prefetch_related(remarks_prefetch()).filter(status=False)
     if not user.allow_manage:
         check_list = check_list.filter(student__username=username)
-    paginator = Paginator(check_list, 10)
-    page_number = request.GET.get('page')
-    page = paginator.get_page(page_number)
+    page = paginate(request, check_list)
     context = {'page': page, 'active': True, 'username': username}
     return render(request, 'verify/check_list.html', context)
 
 
 @login_required
 @user_check
+@conditional(list_state(archived=True))
 def archive(request, username):
     """Выводит список архивных заявок для запрошенного пользователя."""
-    user = get_object_or_404(User, username=username)
-    check_list = CheckOut.objects.all().filter(status=True)
+    user = request.target_user
+    check_list = CheckOut.objects.select_related(
+        'student__group'
+    ).prefetch_related(remarks_prefetch()).filter(status=True)
     if not user.allow_manage:
         check_list = check_list.filter(student__username=username)
-    paginator = Paginator(check_list, 10)
-    page_number = request.GET.get('page')
-    page = paginator.get_page(page_number)
+    page = paginate(request, check_list)
     context = {'page': page, 'active': False, 'username': username}
     return render(request, 'verify/check_list.html', context)
 
 
 @login_required
 @user_check
+@conditional(check_state)
 def check_view(request, username, check_id):
     """Выводит данные по конкретной заявке для запрошенного пользователя."""
     # Формы под вопросом
-    check_item = get_object_or_404(CheckOut, id=check_id)
+    check_item = get_object_or_404(
+        user_checks(request, username).prefetch_related(remarks_prefetch()),
+        id=check_id,
+    )
     form_1 = RemarkNavForm(request.POST or None)
     form_2 = RemarkStandartErrorForm(request.POST or None)
     remarks = check_item.remark.all()
+    if check_item.pdf_file and check_item.preview_pages is None:
+        preview.schedule_preview(check_item)
     context = {
         'username': username,
         'check_item': check_item,
+        'preview_pages': range(1, (check_item.preview_pages or 0) + 1),
         'remarks': remarks,
         'form_1': form_1,
         'form_2': form_2,
@@ -66,10 +137,9 @@ def check_view(request, username, check_id):
 def check_archive(request, username, check_id):
     """Отправляет определенную заявку в архив."""
     check_item = get_object_or_404(CheckOut, id=check_id)
-    check_item.status = True
-    check_item.pdf_file.delete()
-    check_item.docx_file.delete()
-    check_item.save()
+    with transaction.atomic():
+        if CheckOut.objects.filter(id=check_item.id).set_status(True):
+            jobs.enqueue('archive_check_files', check_id=check_item.id)
     return redirect('verify:check_list', username)
 
 
@@ -78,48 +148,212 @@ def check_archive(request, username, check_id):
 def check_active(request, username, check_id):
     """Делает определенную заявку активной."""
     check_item = get_object_or_404(CheckOut, id=check_id)
-    check_item.status = False
-    check_item.save()
+    with transaction.atomic():
+        changed = CheckOut.objects.filter(id=check_item.id).set_status(False)
+        if changed and check_item.cold_manifest:
+            jobs.enqueue('restore_check_files', check_id=check_item.id)
     return redirect('verify:check_list', username)
 
 
+@login_required
+@user_access
+def check_restore(request, username, check_id):
+    """Возвращает файлы архивной заявки из холодного архива."""
+    check_item = get_object_or_404(
+        CheckOut.objects.exclude(cold_manifest=''), id=check_id
+    )
+    jobs.enqueue('restore_check_files', check_id=check_item.id)
+    return redirect('verify:archive', username)
+
+
 @login_required
 @user_check
 def check_delete(request, username, check_id):
     """Удаляет определенную заявку из БД."""
-    get_object_or_404(CheckOut, id=check_id).delete()
+    check_item = get_object_or_404(
+        user_checks(request, username), id=check_id
+    )
+    check_item.delete()
+    blobs.release_blobs(
+        [check_item.pdf_file.name, check_item.docx_file.name]
+    )
+    cold_archive.discard(check_item.cold_manifest)
+    preview.delete_preview(check_item.pdf_sha256)
+    reading.evict(check_item.docx_sha256)
     return redirect('verify:check_list', username)
 
 
 @login_required
 @user_check
+@validating_uploads
 def new_check(request, username):
     """Создает новую заявку от лица текущего пользователя."""
-    student_check = request.user.checkout_student
-    if student_check.exists() and not student_check.last().status:
+    if request.user.active_check_id is not None:
         return redirect('verify:check_list', username)
     form = CheckForm(request.POST or None, files=request.FILES or None)
+    if getattr(request, 'upload_too_large', False):
+        form.add_error(None, uploads.ERROR_TOO_LARGE)
     if not form.is_valid():
         return render(request, 'verify/new_check.html', {'form': form})
-    check = form.save(commit=False)
-    check.student = request.user
-    check.save()
+    create_check(form, request.user)
+    return redirect('verify:check_list', username)
 
-    # sending msg to superuser mail
 
-    superusers = User.objects.filter(is_superuser=True)
+def create_check(form, student):
+    """Сохраняет заявку из проверенной формы и ставит задачи по ней."""
+    with transaction.atomic():
+        check = form.save(commit=False)
+        check.student = student
+        check.save()
+        jobs.enqueue('check_layout', check_id=check.id)
+        jobs.enqueue('index_document', check_id=check.id)
+        preview.schedule_preview(check)
+        mail.notify_new_check(student)
+    return check
 
-    if superusers.exists():
-        subject = 'Hовый запрос на проверку работы!'
-        message = f'Hовый запрос на проверку работы от {request.user.username}!'
-        from_email = 'pinkdumpyou@gmail.com'  # !!! REPLACE THIS EMAIL TO UR !!! ###########!!!!!!!!!!!!!!!!!
 
-    for superuser in superusers:
-        to_email = superuser.email
-        send_mail(subject, message, from_email, [to_email])
+def user_checks(request, username):
+    """Заявки, доступные пользователю: нормоконтроллеру - все."""
+    checks = CheckOut.objects.select_related('student__group')
+    if not request.target_user.allow_manage:
+        checks = checks.filter(student__username=username)
+    return checks
 
-        # DEBUG OUT HOW MANY MSGS WAS SESNDED TO SUPERUSERS EMAIL
-        # print("superuser email: ", to_email)
 
-    return redirect('verify:check_list', username)
+# Файлы работы: поле заявки, поле хеша и тип содержимого
+DOWNLOADS = {
+    'pdf': ('pdf_file', 'pdf_sha256', 'application/pdf'),
+    'docx': (
+        'docx_file', 'docx_sha256',
+        'application/vnd.openxmlformats-officedocument.'
+        'wordprocessingml.document',
+    ),
+}
+
+
+@login_required
+@user_check
+def check_download(request, username, check_id, kind):
+    """Отдает файл работы студенту-владельцу или нормоконтроллеру."""
+    if kind not in DOWNLOADS:
+        raise Http404
+    file_field, digest_field, content_type = DOWNLOADS[kind]
+    check_item = get_object_or_404(
+        user_checks(request, username), id=check_id
+    )
+    field_file = getattr(check_item, file_field)
+    if not field_file or not field_file.storage.exists(field_file.name):
+        raise Http404
+    return downloads.serve_file(
+        request, field_file,
+        filename=f'{check_item.student.username}-'
+                 f'{check_item.submission_number}.{kind}',
+        content_type=content_type,
+        digest=getattr(check_item, digest_field),
+        inline=kind == 'pdf',
+    )
+
+
+# Время кеширования изображений страниц: они не меняются для одного PDF
+PREVIEW_MAX_AGE = 365 * 24 * 60 * 60
 
+
+@login_required
+@user_check
+def check_preview(request, username, check_id, digest, page_number,
+                  thumb=False):
+    """Отдает изображение страницы PDF заявки."""
+    check_item = get_object_or_404(
+        user_checks(request, username), id=check_id, pdf_sha256=digest,
+        preview_pages__gte=page_number,
+    )
+    path = preview.page_path(check_item.pdf_sha256, page_number, thumb)
+    try:
+        image = default_storage.open(path)
+    except FileNotFoundError:
+        raise Http404
+    response = FileResponse(image, content_type='image/png')
+    patch_cache_control(
+        response, private=True, max_age=PREVIEW_MAX_AGE, immutable=True
+    )
+    return response
+
+
+@login_required
+@user_check
+def check_changes(request, username, check_id):
+    """Выводит абзацы DOCX, измененные с предыдущей попытки сдачи работы."""
+    check_item = get_object_or_404(
+        user_checks(request, username), id=check_id
+    )
+    try:
+        changes = diff.get_changes(check_item)
+    except DocxError:
+        raise Http404
+    context = {
+        'username': username,
+        'check_item': check_item,
+        'changes': changes,
+    }
+    return render(request, 'verify/check_changes.html', context)
+
+
+# Место в шаблоне, куда подставляется HTML-версия документа
+READING_MARKER = '<!-- reading -->'
+
+
+def stream_reading(head, document, tail):
+    yield head
+    with document:
+        yield from document.chunks()
+    yield tail
+
+
+@login_required
+@user_check
+def check_reading(request, username, check_id):
+    """Выводит DOCX заявки для чтения в браузере."""
+    check_item = get_object_or_404(
+        user_checks(request, username), id=check_id
+    )
+    if not check_item.docx_file:
+        raise Http404
+    try:
+        document = reading.get_reading(check_item)
+    except DocxError:
+        raise Http404
+    page = render_to_string('verify/check_reading.html', {
+        'username': username,
+        'check_item': check_item,
+        'reading_marker': READING_MARKER,
+    }, request=request)
+    head, tail = page.split(READING_MARKER, 1)
+    return StreamingHttpResponse(
+        stream_reading(head.encode(), document, tail.encode()),
+        content_type='text/html; charset=utf-8',
+    )
+
+
+@login_required
+@user_check
+def check_reading_image(request, username, check_id, name):
+    """Отдает изображение из HTML-версии DOCX заявки."""
+    check_item = get_object_or_404(
+        user_checks(request, username), id=check_id
+    )
+    try:
+        image = reading.open_image(check_item, name)
+    except FileNotFoundError:
+        raise Http404
+    content_type, _ = mimetypes.guess_type(name)
+    response = FileResponse(
+        image, content_type=content_type or 'application/octet-stream'
+    )
+    # Изображения из документа студента не должны исполняться как
+    # страница того же сайта при открытии напрямую
+    response['X-Content-Type-Options'] = 'nosniff'
+    response['Content-Security-Policy'] = "default-src 'none'; sandbox"
+    patch_cache_control(
+        response, private=True, max_age=PREVIEW_MAX_AGE, immutable=True
+    )
+    return response
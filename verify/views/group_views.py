@@ -2,26 +2,39 @@ from django.contrib.auth.decorators import login_required
 from django.shortcuts import get_object_or_404, redirect, render
 
 from users.models import Group
-from verify.decorators import user_access
+from verify.caching import ROSTER_DATA, get_versions, view_cache_timeout
+from verify.decorators import cache_versioned, user_access
 from verify.forms import GroupForm
+from verify.models import with_group_progress, with_last_check
 
 
 @login_required
 @user_access
+@cache_versioned(*ROSTER_DATA)
 def group_list(request):
-    """Выводит таблицу всех зарегистрированных групп."""
-    group_list = Group.objects.all()
-    context = {'group_list': group_list}
+    """Выводит таблицу групп с показателями проверки работ."""
+    group_list = with_group_progress(Group.objects.order_by('title'))
+    context = {
+        'group_list': group_list,
+        'cache_versions': get_versions(*ROSTER_DATA),
+        'cache_timeout': view_cache_timeout(),
+    }
     return render(request, 'verify/group_list.html', context)
 
 
 @login_required
 @user_access
+@cache_versioned(*ROSTER_DATA)
 def group_students(request, slug):
     """Выводит таблицу студентов заданной группы."""
     group = get_object_or_404(Group, slug=slug)
-    students = group.user.all()
-    context = {'students': students, 'group': group}
+    students = with_last_check(group.user.select_related('group'))
+    context = {
+        'students': students,
+        'group': group,
+        'cache_versions': get_versions(*ROSTER_DATA),
+        'cache_timeout': view_cache_timeout(),
+    }
     return render(request, 'verify/student_list.html', context)
 
 
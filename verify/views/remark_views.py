@@ -1,6 +1,8 @@
 from django.contrib.auth.decorators import login_required
+from django.db import IntegrityError, transaction
 from django.shortcuts import get_object_or_404, redirect, render
 
+from verify import constants as cts
 from verify.decorators import user_access
 from verify.forms import RemarkEditForm, RemarkNavForm, RemarkStandartErrorForm
 from verify.models import CheckOut, Remark
@@ -20,36 +22,31 @@ def add_remark(request, username, check_id):
         paragraph = form_1.cleaned_data.get('paragraph')
         check_all = form_1.cleaned_data.get('check_all')
         custom_error = form_1.cleaned_data.get('custom_error')
-        # Создаем кастомную ошибку, если это требуется
-        if custom_error != '':
-            check_all_status = None
-            if check_all:
-                check_all_status = form_1.fields.get('check_all').label,
-            Remark.objects.get_or_create(
-                section=section,
-                page_number=page_number,
-                paragraph=paragraph,
-                check_all=check_all_status,
-                text=custom_error,
-                author=request.user,
-                check_out=check_item
-            )
-        # Проверяем поля формы и создаем ошибки
-        for field in form_2.fields:
-            checkbox_result = form_2.cleaned_data.get(field)
-            if checkbox_result:
-                check_all_status = None
-                if check_all:
-                    check_all_status = form_1.fields.get('check_all').label,
-                Remark.objects.get_or_create(
+        check_all_status = None
+        if check_all:
+            check_all_status = form_1.fields.get('check_all').label,
+        # Собираем кастомную ошибку и отмеченные стандартные ошибки
+        contents = [{'text': custom_error}] if custom_error != '' else []
+        contents += [
+            {'remark_type': remark_type}
+            for remark_type in form_2.selected_types()
+        ]
+        # Повторы отбрасываются уникальным ограничением в БД
+        Remark.objects.bulk_create(
+            [
+                Remark(
                     section=section,
                     page_number=page_number,
                     paragraph=paragraph,
                     check_all=check_all_status,
-                    text=form_2.fields.get(field).label,
                     author=request.user,
-                    check_out=check_item
+                    check_out=check_item,
+                    **content,
                 )
+                for content in contents
+            ],
+            ignore_conflicts=True,
+        )
     return redirect('verify:check_view', username, check_id)
 
 
@@ -59,11 +56,16 @@ def edit_remark(request, username, check_id, remark_id):
     """Редактирует замечание."""
     remark = get_object_or_404(Remark, id=remark_id)
     form = RemarkEditForm(request.POST or None, instance=remark)
-    if not form.is_valid():
-        context = {'form': form}
-        return render(request, 'verify/edit_remark.html', context)
-    remark.save()
-    return redirect('verify:check_view', username, check_id)
+    if form.is_valid():
+        try:
+            with transaction.atomic():
+                remark.save()
+        except IntegrityError:
+            form.add_error(None, cts.REMARK_DUPLICATE_ERROR)
+        else:
+            return redirect('verify:check_view', username, check_id)
+    context = {'form': form}
+    return render(request, 'verify/edit_remark.html', context)
 
 
 @login_required
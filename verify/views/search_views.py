@@ -0,0 +1,165 @@
+import datetime
+from functools import reduce
+
+from django.contrib.auth.decorators import login_required
+from django.db.models import Q
+from django.http import JsonResponse
+from django.shortcuts import render
+from django.urls import reverse
+from django.utils import timezone
+
+from verify import search as fts
+from verify.decorators import user_access
+from verify.forms import SearchForm
+from verify.models import CheckOut, Remark
+from verify.pagination import PER_PAGE
+
+# Глубокие страницы ранжированной выдачи не нужны, а OFFSET на них дорог
+MAX_SEARCH_PAGE = 50
+
+
+def year_period(year):
+    """Границы календарного года в часовом поясе сайта."""
+    if year is None:
+        return None
+    return tuple(
+        timezone.make_aware(datetime.datetime(start, 1, 1))
+        for start in (year, year + 1)
+    )
+
+
+def fallback_ids(queryset, fields, terms, period, limit, offset):
+    """Поиск подстрок для СУБД без полнотекстового индекса.
+
+    Каждое слово должно найтись хотя бы в одном из полей fields.
+    """
+    condition = reduce(
+        lambda left, right: left & right,
+        (
+            reduce(
+                lambda left, right: left | right,
+                (Q(**{f'{field}__icontains': term}) for field in fields),
+            )
+            for term in terms
+        ),
+    )
+    if period is not None:
+        queryset = queryset.filter(
+            check_date__gte=period[0], check_date__lt=period[1]
+        )
+    return list(queryset.filter(condition).order_by(
+        '-check_date', 'id'
+    ).values_list('id', flat=True)[offset:offset + limit])
+
+
+def run_search(form):
+    """Выполняет поиск по проверенной форме.
+
+    Возвращает найденные замечания или заявки в порядке релевантности
+    и признак наличия следующей страницы. Общее число результатов не
+    считается: для частых слов это дороже самой выборки.
+    """
+    terms = fts.search_terms(form.cleaned_data['q'])
+    if not terms:
+        return [], False
+    kind = form.cleaned_data['kind']
+    period = year_period(form.cleaned_data['year'])
+    offset = (form.cleaned_data['page'] - 1) * PER_PAGE
+    # Одна лишняя запись показывает, есть ли следующая страница
+    limit = PER_PAGE + 1
+    if kind == SearchForm.REMARKS:
+        ids = fts.search_remarks(terms, period, limit, offset)
+        if ids is None:
+            ids = fallback_ids(
+                Remark.objects, ('text', 'remark_type__text'), terms, period,
+                limit, offset,
+            )
+        found = Remark.objects.select_related(
+            'check_out__student__group', 'remark_type'
+        ).in_bulk(ids)
+    else:
+        ids = fts.search_documents(terms, period, limit, offset)
+        if ids is None:
+            ids = []
+        found = CheckOut.objects.select_related(
+            'student__group'
+        ).in_bulk(ids)
+    results = [found[pk] for pk in ids[:PER_PAGE] if pk in found]
+    return results, len(ids) > PER_PAGE
+
+
+def search_form(request):
+    form = SearchForm(request.GET or None)
+    if form.is_valid() and form.cleaned_data['page'] > MAX_SEARCH_PAGE:
+        form.add_error('page', f'Доступны первые {MAX_SEARCH_PAGE} страниц')
+    return form
+
+
+@login_required
+@user_access
+def search(request):
+    """Выводит результаты полнотекстового поиска."""
+    form = search_form(request)
+    results, has_next = [], False
+    if form.is_valid():
+        results, has_next = run_search(form)
+    context = {
+        'form': form,
+        'results': results,
+        'has_next': has_next,
+    }
+    if form.is_valid():
+        query = request.GET.copy()
+        page = form.cleaned_data['page']
+        query['page'] = page + 1
+        context['next_query'] = query.urlencode()
+        query['page'] = page - 1
+        context['previous_query'] = query.urlencode() if page > 1 else None
+    return render(request, 'verify/search.html', context)
+
+
+def remark_json(remark):
+    check = remark.check_out
+    return {
+        'id': remark.id,
+        'remark_type': remark.remark_type_id,
+        'text': remark.message,
+        'section': remark.section,
+        'date': remark.check_date.isoformat(),
+        'check_id': check.id,
+        'student': check.student.username,
+        'group': check.student.group.title if check.student.group else None,
+    }
+
+
+def check_json(check):
+    return {
+        'id': check.id,
+        'date': check.check_date.isoformat(),
+        'submission_number': check.submission_number,
+        'student': check.student.username,
+        'group': check.student.group.title if check.student.group else None,
+    }
+
+
+@login_required
+@user_access
+def search_api(request):
+    """Результаты полнотекстового поиска в формате JSON."""
+    form = search_form(request)
+    if not form.is_valid():
+        return JsonResponse({'errors': form.errors.get_json_data()},
+                            status=400)
+    results, has_next = run_search(form)
+    serialize = (remark_json if form.cleaned_data['kind'] == SearchForm.REMARKS
+                 else check_json)
+    data = {
+        'results': [serialize(item) for item in results],
+        'page': form.cleaned_data['page'],
+        'next': None,
+    }
+    if has_next:
+        query = request.GET.copy()
+        query['page'] = form.cleaned_data['page'] + 1
+        data['next'] = f"{reverse('verify:search_api')}?{query.urlencode()}"
+    return JsonResponse(data)
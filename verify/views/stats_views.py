@@ -0,0 +1,80 @@
+import csv
+
+from django.contrib.auth.decorators import login_required
+from django.db.models import Sum
+from django.http import HttpResponse
+from django.shortcuts import render
+
+from users.models import Group
+from verify import stats
+from verify.decorators import user_access
+from verify.forms import StatsFilterForm
+
+NO_GROUP_LABEL = 'Без группы'
+
+
+def stats_filters(request):
+    form = StatsFilterForm(request.GET or None)
+    if form.is_bound and form.is_valid():
+        return form, form.cleaned_data
+    return form, {}
+
+
+@login_required
+@user_access
+def remark_stats(request):
+    """Выводит число замечаний каждого типа по группам за период."""
+    form, filters = stats_filters(request)
+    summary = stats.summary(**filters)
+    group_ids = sorted(
+        {group_id for _, _, counts, _ in summary for group_id in counts},
+        key=lambda group_id: (group_id is None, group_id or 0),
+    )
+    titles = dict(Group.objects.filter(
+        pk__in=[group_id for group_id in group_ids if group_id is not None]
+    ).values_list('pk', 'title'))
+    columns = [titles.get(group_id, NO_GROUP_LABEL) for group_id in group_ids]
+    rows = [
+        {
+            'error_type': code,
+            'text': text,
+            'counts': [counts.get(group_id, 0) for group_id in group_ids],
+            'total': total,
+        }
+        for code, text, counts, total in summary
+    ]
+    context = {
+        'form': form,
+        'columns': columns,
+        'rows': rows,
+        'query': request.GET.urlencode(),
+    }
+    return render(request, 'verify/remark_stats.html', context)
+
+
+@login_required
+@user_access
+def remark_stats_csv(request):
+    """Выгружает статистику замечаний в CSV по месяцам."""
+    _, filters = stats_filters(request)
+    cells = stats.stat_cells(**filters).values(
+        'month', 'group__title', 'error_type'
+    ).annotate(total=Sum('count')).order_by(
+        'month', 'group__title', 'error_type'
+    )
+    response = HttpResponse(content_type='text/csv; charset=utf-8')
+    response['Content-Disposition'] = 'attachment; filename="remarks.csv"'
+    # Метка порядка байт нужна Excel, чтобы распознать UTF-8
+    response.write('\ufeff')
+    writer = csv.writer(response, delimiter=';')
+    writer.writerow(['Месяц', 'Группа', 'Тип', 'Замечание', 'Количество'])
+    labels = stats.error_types()
+    for cell in cells:
+        writer.writerow([
+            cell['month'].strftime('%Y-%m'),
+            cell['group__title'] or NO_GROUP_LABEL,
+            cell['error_type'],
+            labels.get(cell['error_type'], cell['error_type']),
+            cell['total'],
+        ])
+    return response
@@ -2,19 +2,25 @@ from django.contrib.auth import get_user_model
 from django.contrib.auth.decorators import login_required
 from django.shortcuts import render
 
-from verify.decorators import user_access
-from verify.models import CheckOut
+from verify.caching import ROSTER_DATA, get_versions, view_cache_timeout
+from verify.decorators import cache_versioned, user_access
+from verify.models import with_last_check
 
 User = get_user_model()
 
 
 @login_required
 @user_access
+@cache_versioned(*ROSTER_DATA)
 def student_list(request):
     """Выводит таблицу всех зарегистрированных студентов."""
-    students = User.objects.all().exclude(username='admin')
-    students = students.exclude(allow_manage=True)
-    context = {'students': students}
+    students = User.objects.select_related('group').exclude(username='admin')
+    students = with_last_check(students.exclude(allow_manage=True))
+    context = {
+        'students': students,
+        'cache_versions': get_versions(*ROSTER_DATA),
+        'cache_timeout': view_cache_timeout(),
+    }
     return render(request, 'verify/student_list.html', context)
 
 
@@ -22,7 +28,9 @@ def student_list(request):
 @user_access
 def student_active_check(request, username):
     """Выводит активную заявку определенного студента."""
-    student_check = CheckOut.objects.all().filter(status=False)
-    student_check = student_check.filter(student__username=username).first()
+    student = User.objects.select_related(
+        'active_check__student__group'
+    ).filter(username=username).first()
+    student_check = student.active_check if student else None
     context = {'student_check': student_check}
     return render(request, 'verify/student_active_check.html', context)
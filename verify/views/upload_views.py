@@ -0,0 +1,155 @@
+from django.contrib.auth.decorators import login_required
+from django.http import JsonResponse
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.utils import timezone
+from django.views.decorators.http import require_http_methods, require_POST
+
+from verify import chunked
+from verify import constants as cts
+from verify.decorators import user_check
+from verify.forms import CheckForm, UploadFinishForm, UploadStartForm
+from verify.models import UploadSession
+
+from .check_views import create_check
+
+
+def form_errors(form):
+    return {
+        field: [error['message'] for error in errors]
+        for field, errors in form.errors.get_json_data().items()
+    }
+
+
+def session_state(session, username):
+    return {
+        'upload_id': str(session.pk),
+        'offset': session.received,
+        'size': session.size,
+        'url': reverse('verify:upload_chunk', kwargs={
+            'username': username, 'upload_id': session.pk,
+        }),
+    }
+
+
+def active_check_exists():
+    return JsonResponse(
+        {'errors': {'__all__': [cts.ACTIVE_CHECK_EXISTS_ERROR]}}, status=409
+    )
+
+
+@login_required
+@user_check
+@require_POST
+def upload_start(request, username):
+    """Начинает докачиваемую загрузку файла работы.
+
+    Повторный запрос с тем же файлом возвращает уже начатую загрузку
+    вместе с числом полученных байт. Самые давние загрузки студента
+    сверх chunked.MAX_UPLOAD_SESSIONS удаляются.
+    """
+    if request.user.active_check_id is not None:
+        return active_check_exists()
+    form = UploadStartForm(request.POST)
+    if not form.is_valid():
+        return JsonResponse({'errors': form_errors(form)}, status=400)
+    session = request.user.upload_sessions.filter(
+        file_name=form.cleaned_data['file_name'],
+        size=form.cleaned_data['size'],
+        sha256=form.cleaned_data['sha256'],
+    ).first()
+    status = 200
+    if session is None:
+        chunked.make_room(request.user)
+        session = form.save(commit=False)
+        session.student = request.user
+        session.save()
+        chunked.schedule_collection(timezone.now() + chunked.session_ttl())
+        status = 201
+    return JsonResponse(session_state(session, username), status=status)
+
+
+@login_required
+@user_check
+@require_http_methods(['GET', 'PUT'])
+def upload_chunk(request, username, upload_id):
+    """Принимает часть файла (PUT ?offset=N) или сообщает, сколько получено.
+
+    Тело PUT-запроса дописывается к файлу, если offset совпадает с
+    числом уже полученных байт; иначе ответ 409 содержит это число.
+    """
+    session = get_object_or_404(
+        UploadSession, pk=upload_id, student=request.user
+    )
+    if request.method == 'PUT':
+        try:
+            offset = int(request.GET['offset'])
+            length = int(request.META.get('CONTENT_LENGTH') or 0)
+        except (KeyError, ValueError):
+            return JsonResponse({'errors': {'offset': ['Укажите offset']}},
+                                status=400)
+        if offset < 0 or offset + length > session.size:
+            return JsonResponse(
+                {'errors': {'offset': ['Часть выходит за пределы файла']}},
+                status=400,
+            )
+        try:
+            chunked.append_chunk(session, offset, request, length)
+        except chunked.OffsetMismatch as exc:
+            session.received = exc.received
+            return JsonResponse(session_state(session, username), status=409)
+    return JsonResponse(session_state(session, username))
+
+
+@login_required
+@user_check
+@require_POST
+def upload_finish(request, username):
+    """Создает заявку из полностью загруженных файлов DOCX и PDF.
+
+    Файлы проходят те же проверки, что и в форме новой заявки, и
+    дополнительно сверяются с SHA-256, заявленным в начале загрузки.
+    """
+    if request.user.active_check_id is not None:
+        return active_check_exists()
+    finish_form = UploadFinishForm(request.POST)
+    if not finish_form.is_valid():
+        return JsonResponse({'errors': form_errors(finish_form)}, status=400)
+    sessions = {}
+    for field, upload_field in (('docx_file', 'docx_upload'),
+                                ('pdf_file', 'pdf_upload')):
+        session = request.user.upload_sessions.filter(
+            pk=finish_form.cleaned_data[upload_field]
+        ).first()
+        if session is None or not session.complete:
+            finish_form.add_error(upload_field, chunked.ERROR_INCOMPLETE)
+        sessions[field] = session
+    if finish_form.errors:
+        return JsonResponse({'errors': form_errors(finish_form)}, status=400)
+    files = {
+        field: chunked.SessionFile(session)
+        for field, session in sessions.items()
+    }
+    try:
+        form = CheckForm(request.POST, files=files)
+        if form.is_valid():
+            for field, session in sessions.items():
+                if form.cleaned_data[field].sha256 != session.sha256:
+                    form.add_error(field, chunked.ERROR_HASH)
+        if form.is_valid():
+            check = create_check(form, request.user)
+    finally:
+        for uploaded_file in files.values():
+            uploaded_file.close()
+    # Файл с ошибкой загружен до конца, докачивать его бесполезно
+    for field, session in sessions.items():
+        if form.is_valid() or field in form.errors:
+            chunked.delete_session(session)
+    if not form.is_valid():
+        return JsonResponse({'errors': form_errors(form)}, status=400)
+    return JsonResponse({
+        'check_id': check.id,
+        'url': reverse('verify:check_view', kwargs={
+            'username': username, 'check_id': check.id,
+        }),
+    }, status=201)